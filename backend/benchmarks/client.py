@@ -0,0 +1,71 @@
+"""Minimal thread-safe HTTP client for driving a running API server."""
+import json
+import re
+import time
+import urllib.error
+import urllib.request
+
+QUERIES = re.compile(r'\bdb;[^,]*desc="(\d+) queries"')
+
+
+class Result:
+    __slots__ = ("status", "seconds", "queries", "data")
+
+    def __init__(self, status, seconds, queries, data):
+        self.status = status
+        self.seconds = seconds
+        self.queries = queries
+        self.data = data
+
+    @property
+    def ok(self):
+        return 200 <= self.status < 400
+
+
+class Client:
+    def __init__(self, base_url, timeout=30):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+    def request(self, method, path, body=None, token=None):
+        headers = {"Accept": "application/json"}
+        data = None
+        if body is not None:
+            data = json.dumps(body).encode()
+            headers["Content-Type"] = "application/json"
+        if token:
+            headers["Authorize"] = f"Bearer {token}"
+        request = urllib.request.Request(
+            self.base_url + path, data=data, headers=headers, method=method
+        )
+
+        started = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                status, raw, timing = (
+                    response.status,
+                    response.read(),
+                    response.headers.get("Server-Timing", ""),
+                )
+        except urllib.error.HTTPError as exc:
+            status, raw, timing = (
+                exc.code, exc.read(), exc.headers.get("Server-Timing", "")
+            )
+        except (urllib.error.URLError, OSError):
+            status, raw, timing = 0, b"", ""
+        seconds = time.perf_counter() - started
+
+        match = QUERIES.search(timing)
+        try:
+            payload = json.loads(raw) if raw else None
+        except ValueError:
+            payload = None
+        return Result(status, seconds, int(match.group(1)) if match else None, payload)
+
+    def obtain_tokens(self, email, password):
+        result = self.request(
+            "POST", "/api/users/token/", {"email": email, "password": password}
+        )
+        if not result.ok:
+            raise RuntimeError(f"Cannot log in as {email}: HTTP {result.status}")
+        return result.data["access"], result.data["refresh"]
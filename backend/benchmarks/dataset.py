@@ -0,0 +1,118 @@
+"""
+Benchmark dataset: books, readers and borrowings that are easy to tell
+apart from real data and to remove again.
+"""
+import datetime
+import random
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from borrowing.inventory import rebuild_availability
+from borrowing.models import Borrowing
+from catalog import cache
+from catalog.models import Book
+from user.models import User
+
+PASSWORD = "bench-password"
+ADMIN_EMAIL = "bench-admin@example.com"
+USER_EMAIL = "bench-user{}@example.com"
+USER_PREFIX = "bench-user"
+BOOK_TITLE = "Bench book"
+
+
+def bench_users():
+    return User.objects.filter(email__startswith=USER_PREFIX)
+
+
+def bench_books():
+    return Book.objects.filter(title__startswith=BOOK_TITLE)
+
+
+def bench_borrowings():
+    return Borrowing.objects.filter(user__in=bench_users())
+
+
+def reset():
+    with transaction.atomic():
+        bench_borrowings().delete()
+        Borrowing.objects.filter(book__in=bench_books()).delete()
+        bench_users().delete()
+        User.objects.filter(email=ADMIN_EMAIL).delete()
+        bench_books().delete()
+        transaction.on_commit(cache.bump_version)
+
+
+def seed(books, users, borrowings, seed=0, batch_size=5000, on_progress=None):
+    """
+    Insert the dataset with bulk inserts. Every reader shares one password
+    hash, so seeding does not spend minutes in the password hasher.
+    """
+    rng = random.Random(seed)
+    password = make_password(PASSWORD)
+    today = datetime.date.today()
+
+    with transaction.atomic():
+        User.objects.create_superuser(email=ADMIN_EMAIL, password=PASSWORD)
+        book_ids = _insert(Book, (
+            Book(
+                title=f"{BOOK_TITLE} {i}",
+                author=f"Bench author {i % 500}",
+                cover=rng.choice(["HARD", "SOFT"]),
+                inventory=100_000,
+                daily_fee=rng.choice(["0.50", "1.00", "1.50", "2.00"]),
+            )
+            for i in range(books)
+        ), batch_size, on_progress)
+        user_ids = _insert(User, (
+            User(
+                email=USER_EMAIL.format(i),
+                first_name="Bench",
+                last_name=f"Reader {i}",
+                password=password,
+            )
+            for i in range(users)
+        ), batch_size, on_progress)
+
+        def borrowing(i):
+            borrowed = today - datetime.timedelta(days=rng.randrange(1, 90))
+            returned = None
+            if rng.random() < 0.7:
+                returned = borrowed + datetime.timedelta(days=rng.randrange(0, 30))
+                returned = min(returned, today)
+            return Borrowing(
+                book_id=rng.choice(book_ids),
+                user_id=rng.choice(user_ids),
+                borrow_date=borrowed,
+                expected_return_date=borrowed + datetime.timedelta(days=14),
+                actual_return_date=returned,
+            )
+
+        _insert(
+            Borrowing,
+            (borrowing(i) for i in range(borrowings)) if book_ids and user_ids else (),
+            batch_size,
+            on_progress,
+        )
+        rebuild_availability(book_ids)
+        transaction.on_commit(cache.bump_version)
+
+
+def _insert(model, objects, batch_size, on_progress):
+    ids = []
+    batch = []
+    for obj in objects:
+        batch.append(obj)
+        if len(batch) == batch_size:
+            ids += _flush(model, batch, on_progress)
+            batch = []
+    if batch:
+        ids += _flush(model, batch, on_progress)
+    return ids
+
+
+def _flush(model, batch, on_progress):
+    created = model.objects.bulk_create(batch)
+    if on_progress:
+        on_progress(model, len(created))
+    return [obj.pk for obj in created]
@@ -0,0 +1,76 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+# (path in a scenario summary, True when a larger value is better)
+METRICS = (
+    (("throughput_rps",), True),
+    (("latency_ms", "p50"), False),
+    (("latency_ms", "p95"), False),
+    (("latency_ms", "p99"), False),
+    (("queries_per_request", "mean"), False),
+)
+
+
+class Command(BaseCommand):
+    help = "Compare two bench_run reports and flag regressions."
+
+    def add_arguments(self, parser):
+        parser.add_argument("base", help="Report of the reference commit.")
+        parser.add_argument("head", help="Report of the commit under test.")
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=10.0,
+            help="Percent change counted as a regression.",
+        )
+        parser.add_argument(
+            "--fail",
+            action="store_true",
+            help="Exit with an error when something regressed.",
+        )
+
+    def handle(self, *args, base, head, threshold, fail, **options):
+        base_report, head_report = self.load(base), self.load(head)
+        regressions = []
+        for label in sorted(set(base_report) & set(head_report)):
+            for path, higher_is_better in METRICS:
+                before = self.value(base_report[label], path)
+                after = self.value(head_report[label], path)
+                if before is None or after is None:
+                    continue
+                change = (after - before) / before * 100 if before else 0.0
+                worse = -change if higher_is_better else change
+                if path[0] == "queries_per_request":
+                    # Cache hits make the mean wobble; a real N+1 or an
+                    # extra query per request moves it by a whole query.
+                    regressed = after - before >= 0.5
+                else:
+                    regressed = worse > threshold
+                marker = "  REGRESSION" if regressed else ""
+                self.stdout.write(
+                    f"{label:>24} {'.'.join(path):<26} "
+                    f"{before:>10} -> {after:<10} {change:+7.1f}%{marker}"
+                )
+                if regressed:
+                    regressions.append(f"{label} {'.'.join(path)}")
+
+        for label in sorted(set(base_report) ^ set(head_report)):
+            self.stdout.write(f"{label:>24} only in one report")
+
+        if regressions and fail:
+            raise CommandError(f"Regressions: {', '.join(regressions)}")
+
+    @staticmethod
+    def load(path):
+        try:
+            with open(path) as source:
+                return json.load(source)["scenarios"]
+        except (OSError, ValueError, KeyError) as exc:
+            raise CommandError(f"Cannot read report {path}: {exc}")
+
+    @staticmethod
+    def value(summary, path):
+        for key in path:
+            summary = summary.get(key) if isinstance(summary, dict) else None
+        return summary
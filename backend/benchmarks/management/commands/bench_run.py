@@ -0,0 +1,129 @@
+import json
+import random
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks import dataset
+from benchmarks.client import Client
+from benchmarks.scenarios import SCENARIOS, Context, Worker
+from benchmarks.stats import summarize
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive a running server with the benchmark scenarios and report "
+        "latency percentiles, throughput and queries per request as JSON. "
+        "Start the server with DISABLE_THROTTLING=1."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", default="http://127.0.0.1:8000")
+        parser.add_argument(
+            "--scenario",
+            action="append",
+            choices=sorted(SCENARIOS),
+            help="Scenario to run; repeat for several. Default: all.",
+        )
+        parser.add_argument("--concurrency", type=int, default=8)
+        parser.add_argument("--duration", type=float, default=10.0)
+        parser.add_argument("--warmup", type=float, default=1.0)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--output", help="Write the JSON report here.")
+
+    def handle(self, *args, url, scenario, concurrency, duration, warmup, seed,
+               output, **options):
+        if concurrency <= 0 or duration <= 0 or warmup < 0:
+            raise CommandError("--concurrency and --duration must be positive.")
+        names = scenario or sorted(SCENARIOS)
+
+        client = Client(url)
+        book_ids = list(dataset.bench_books().values_list("id", flat=True))
+        readers = list(
+            dataset.bench_users().order_by("id").values_list("id", "email")
+        )
+        if not book_ids or len(readers) < concurrency:
+            raise CommandError(
+                f"Seed at least one book and {concurrency} readers with bench_seed."
+            )
+        borrowing_ids = list(
+            dataset.bench_borrowings().order_by("id").values_list("id", flat=True)
+        )
+        admin_access, _ = client.obtain_tokens(dataset.ADMIN_EMAIL, dataset.PASSWORD)
+        context = Context(
+            client, book_ids, [pk for pk, _ in readers], borrowing_ids,
+            admin_access, dataset.PASSWORD,
+        )
+        workers = [
+            Worker(context, i, random.Random(seed + i), email,
+                   *client.obtain_tokens(email, dataset.PASSWORD))
+            for i, (_, email) in enumerate(readers[:concurrency])
+        ]
+
+        report = {"meta": self.meta(url, concurrency, duration, context),
+                  "scenarios": {}}
+        for name in names:
+            if warmup:
+                self.drive(SCENARIOS[name], workers, warmup)
+            samples, elapsed = self.drive(SCENARIOS[name], workers, duration)
+            for label, results in samples.items():
+                summary = summarize(results, elapsed)
+                report["scenarios"][label] = summary
+                latency = summary["latency_ms"]
+                self.stderr.write(
+                    f"{label:>24}: {summary['throughput_rps']:>8.1f} req/s  "
+                    f"p50 {latency['p50']} ms  p95 {latency['p95']} ms  "
+                    f"p99 {latency['p99']} ms  "
+                    f"queries {summary['queries_per_request']['mean']}  "
+                    f"errors {summary['errors']}"
+                )
+
+        body = json.dumps(report, indent=2)
+        if output:
+            with open(output, "w") as out:
+                out.write(body + "\n")
+        else:
+            self.stdout.write(body)
+
+    @staticmethod
+    def drive(scenario, workers, duration):
+        samples = {}
+        lock = threading.Lock()
+        deadline = time.perf_counter() + duration
+
+        def loop(worker):
+            local = {}
+            while time.perf_counter() < deadline:
+                for label, result in scenario(worker):
+                    local.setdefault(label, []).append(result)
+            with lock:
+                for label, results in local.items():
+                    samples.setdefault(label, []).extend(results)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=len(workers)) as pool:
+            list(pool.map(loop, workers))
+        return samples, time.perf_counter() - started
+
+    @staticmethod
+    def meta(url, concurrency, duration, context):
+        try:
+            commit = subprocess.run(
+                ["git", "rev-parse", "HEAD"],
+                capture_output=True, text=True, check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            commit = None
+        return {
+            "commit": commit,
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "url": url,
+            "concurrency": concurrency,
+            "duration_s": duration,
+            "books": len(context.book_ids),
+            "users": len(context.user_ids),
+        }
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks import dataset
+
+
+class Command(BaseCommand):
+    help = "Seed the database with a benchmark dataset of books, readers and loans."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--books", type=int, default=10_000)
+        parser.add_argument("--users", type=int, default=1_000)
+        parser.add_argument("--borrowings", type=int, default=50_000)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Remove a previously seeded dataset first.",
+        )
+
+    def handle(self, *args, books, users, borrowings, seed, batch_size, reset,
+               **options):
+        if min(books, users, borrowings) < 0 or batch_size <= 0:
+            raise CommandError("Sizes cannot be negative.")
+        if reset:
+            dataset.reset()
+        elif dataset.bench_users().exists() or dataset.bench_books().exists():
+            raise CommandError("A benchmark dataset exists already, pass --reset.")
+
+        def on_progress(model, count):
+            self.stdout.write(f"{model._meta.verbose_name_plural}: +{count}")
+
+        dataset.seed(
+            books, users, borrowings,
+            seed=seed, batch_size=batch_size, on_progress=on_progress,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded {books} books, {users} readers and {borrowings} borrowings."
+        ))
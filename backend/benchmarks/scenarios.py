@@ -0,0 +1,137 @@
+"""
+Benchmark scenarios. Each one is a function performing one iteration
+for a worker and returning ``[(label, Result), ...]``; most iterations
+are a single request, checkout_return records both of its requests.
+"""
+import datetime
+
+BOOKS_URL = "/api/books/books/"
+BORROWINGS_URL = "/api/borrowings/borrowings/"
+
+
+class Worker:
+    """Per-thread state: its own random generator and bench user tokens."""
+
+    def __init__(self, context, index, rng, email, access, refresh):
+        self.context = context
+        self.index = index
+        self.rng = rng
+        self.email = email
+        self.access = access
+        self.refresh = refresh
+
+
+class Context:
+    def __init__(self, client, book_ids, user_ids, borrowing_ids, admin_access,
+                 password):
+        self.client = client
+        self.book_ids = book_ids
+        self.user_ids = user_ids
+        self.borrowing_ids = borrowing_ids
+        self.admin_access = admin_access
+        self.password = password
+
+
+def book_list(worker):
+    offset = worker.rng.randrange(min(len(worker.context.book_ids), 1000))
+    return [("book_list", worker.context.client.request(
+        "GET", f"{BOOKS_URL}?limit=20&offset={offset}"
+    ))]
+
+
+def book_detail(worker):
+    book_id = worker.rng.choice(worker.context.book_ids)
+    return [("book_detail", worker.context.client.request(
+        "GET", f"{BOOKS_URL}{book_id}/"
+    ))]
+
+
+def book_batch(worker):
+    ids = worker.rng.sample(
+        worker.context.book_ids, min(len(worker.context.book_ids), 20)
+    )
+    return [("book_batch", worker.context.client.request(
+        "GET", f"{BOOKS_URL}batch/?ids={','.join(map(str, ids))}"
+    ))]
+
+
+def borrowing_list_active(worker):
+    return [("borrowing_list_active", worker.context.client.request(
+        "GET", f"{BORROWINGS_URL}?is_active=true&limit=20", token=worker.access
+    ))]
+
+
+def borrowing_list_by_user(worker):
+    user_id = worker.rng.choice(worker.context.user_ids)
+    return [("borrowing_list_by_user", worker.context.client.request(
+        "GET",
+        f"{BORROWINGS_URL}?user_id={user_id}&limit=20",
+        token=worker.context.admin_access,
+    ))]
+
+
+def borrowing_detail(worker):
+    borrowing_id = worker.rng.choice(worker.context.borrowing_ids)
+    return [("borrowing_detail", worker.context.client.request(
+        "GET",
+        f"{BORROWINGS_URL}{borrowing_id}/",
+        token=worker.context.admin_access,
+    ))]
+
+
+def checkout_return(worker):
+    client = worker.context.client
+    today = datetime.date.today()
+    checkout = client.request(
+        "POST",
+        BORROWINGS_URL,
+        {
+            "book": worker.rng.choice(worker.context.book_ids),
+            "borrow_date": today.isoformat(),
+            "expected_return_date": (
+                today + datetime.timedelta(days=14)
+            ).isoformat(),
+        },
+        token=worker.access,
+    )
+    steps = [("checkout", checkout)]
+    if checkout.ok:
+        steps.append(("return", client.request(
+            "POST",
+            f"{BORROWINGS_URL}{checkout.data['id']}/return/",
+            token=worker.access,
+        )))
+    return steps
+
+
+def token_obtain(worker):
+    return [("token_obtain", worker.context.client.request(
+        "POST",
+        "/api/users/token/",
+        {"email": worker.email, "password": worker.context.password},
+    ))]
+
+
+def token_refresh(worker):
+    result = worker.context.client.request(
+        "POST", "/api/users/token/refresh/", {"refresh": worker.refresh}
+    )
+    if result.ok and result.data.get("refresh"):
+        worker.refresh = result.data["refresh"]
+    return [("token_refresh", result)]
+
+
+SCENARIOS = {
+    scenario.__name__: scenario
+    for scenario in (
+        book_list,
+        book_detail,
+        book_batch,
+        borrowing_list_active,
+        borrowing_list_by_user,
+        borrowing_detail,
+        checkout_return,
+        token_obtain,
+        token_refresh,
+    )
+}
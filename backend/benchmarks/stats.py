@@ -0,0 +1,37 @@
+import math
+import statistics
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(math.ceil(fraction * len(sorted_values)) - 1, 0)
+    return sorted_values[rank]
+
+
+def summarize(results, elapsed):
+    """Latency, throughput and query figures for one scenario step."""
+    latencies = sorted(result.seconds * 1000 for result in results)
+    queries = [result.queries for result in results if result.queries is not None]
+    errors = sum(1 for result in results if not result.ok)
+    return {
+        "requests": len(results),
+        "errors": errors,
+        "throughput_rps": round(len(results) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "mean": _round(statistics.fmean(latencies) if latencies else None),
+            "p50": _round(percentile(latencies, 0.50)),
+            "p95": _round(percentile(latencies, 0.95)),
+            "p99": _round(percentile(latencies, 0.99)),
+            "max": _round(latencies[-1] if latencies else None),
+        },
+        "queries_per_request": {
+            "mean": _round(statistics.fmean(queries) if queries else None),
+            "max": max(queries) if queries else None,
+        },
+    }
+
+
+def _round(value):
+    return None if value is None else round(value, 3)
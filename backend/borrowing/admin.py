@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Borrowing
+from .models import Borrowing, OverdueNotification
 
 
 @admin.register(Borrowing)
@@ -11,6 +11,9 @@ class BorrowingAdmin(admin.ModelAdmin):
         "actual_return_date",
         "book",
         "user_name",
+        "fee",
+        "fine",
+        "overdue_since",
     ]
     list_filter = [
         "borrow_date",
@@ -28,3 +31,10 @@ class BorrowingAdmin(admin.ModelAdmin):
         return f"{obj.user.first_name} {obj.user.last_name} {obj.user.email}"
 
     user_name.short_description = "User"
+
+
+@admin.register(OverdueNotification)
+class OverdueNotificationAdmin(admin.ModelAdmin):
+    list_display = ["borrowing", "created_at", "sent_at"]
+    list_filter = ["sent_at"]
+    raw_id_fields = ["borrowing"]
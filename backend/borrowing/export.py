@@ -0,0 +1,58 @@
+"""
+Streaming CSV / NDJSON export of borrowings.
+
+Rows come from a ``values_list()`` queryset read through a server-side
+cursor, so an export of any size holds only one chunk in memory.
+"""
+import csv
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+EXPORT_FIELDS = (
+    "id",
+    "borrow_date",
+    "expected_return_date",
+    "actual_return_date",
+    "book_id",
+    "book__title",
+    "book__author",
+    "user_id",
+    "user__email",
+)
+COLUMNS = tuple(field.replace("__", "_") for field in EXPORT_FIELDS)
+CONTENT_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+
+class Echo:
+    """File-like object whose write() hands the line back to the caller."""
+
+    def write(self, value):
+        return value
+
+
+def export_rows(queryset, chunk_size):
+    return queryset.order_by("id").values_list(*EXPORT_FIELDS).iterator(
+        chunk_size=chunk_size
+    )
+
+
+def csv_lines(rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(COLUMNS)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def ndjson_lines(rows):
+    encoder = DjangoJSONEncoder()
+    for row in rows:
+        yield encoder.encode(dict(zip(COLUMNS, row))) + "\n"
+
+
+RENDERERS = {
+    "csv": csv_lines,
+    "ndjson": ndjson_lines,
+}
@@ -0,0 +1,183 @@
+"""
+Set-based inventory updates shared by single and bulk checkout/return.
+
+Both helpers take a ``{book_id: copies}`` mapping and touch every book in
+one UPDATE, using F() expressions so concurrent requests never lose an
+update. They must run inside the caller's transaction.
+
+The same goes for ``loans_opened`` and ``loans_closed``, which keep each
+book's BookAvailability row in step once the borrowings are written. The
+book rows take_copies or restock_copies updated stay locked until commit,
+so availability changes of one book are applied one transaction at a
+time. A book without a row yet gets it rebuilt from Borrowing instead.
+"""
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import (
+    Case,
+    Count,
+    DateField,
+    F,
+    IntegerField,
+    Min,
+    OuterRef,
+    Q,
+    Subquery,
+    Value,
+    When,
+)
+from django.db.models.functions import Greatest, Least
+from django.utils import timezone
+
+from catalog import cache as catalog_cache
+from catalog.models import Book
+
+from .models import BookAvailability, Borrowing
+
+
+def _per_book(values, output_field):
+    distinct = set(values.values())
+    if len(distinct) == 1:
+        return Value(distinct.pop(), output_field=output_field)
+    return Case(
+        *[When(pk=book_id, then=Value(v)) for book_id, v in values.items()],
+        output_field=output_field,
+    )
+
+
+def _copies(counts):
+    return _per_book(counts, IntegerField())
+
+
+def take_copies(counts):
+    """
+    Decrement inventory only where enough copies are left.
+    Return False when any book fell short; nothing is rolled back here.
+    """
+    copies = _copies(counts)
+    updated = Book.objects.filter(
+        pk__in=counts, inventory__gte=copies
+    ).update(inventory=F("inventory") - copies, updated_at=timezone.now())
+    if updated:
+        transaction.on_commit(catalog_cache.bump_version)
+    return updated == len(counts)
+
+
+def restock_copies(counts):
+    copies = _copies(counts)
+    Book.objects.filter(pk__in=counts).update(
+        inventory=F("inventory") + copies, updated_at=timezone.now()
+    )
+    transaction.on_commit(catalog_cache.bump_version)
+
+
+def loans_opened(loans):
+    """
+    Count new loans, given as ``(book_id, expected_return_date)`` pairs,
+    as on loan. Call after take_copies and after inserting the borrowings.
+    """
+    counts = Counter(book_id for book_id, _ in loans)
+    earliest = {}
+    for book_id, due in loans:
+        earliest[book_id] = min(earliest.get(book_id, due), due)
+    # LEAST skips NULL in Postgres, so a first loan sets the date.
+    updated = BookAvailability.objects.filter(pk__in=counts).update(
+        on_loan=F("on_loan") + _copies(counts),
+        next_expected_return=Least(
+            F("next_expected_return"), _per_book(earliest, DateField())
+        ),
+        updated_at=timezone.now(),
+    )
+    if updated < len(counts):
+        _heal(counts)
+
+
+def loans_closed(counts):
+    """Count returned loans off; call after restock_copies."""
+    next_due = Borrowing.objects.filter(
+        book_id=OuterRef("pk"), actual_return_date__isnull=True
+    ).order_by("expected_return_date").values("expected_return_date")[:1]
+    updated = BookAvailability.objects.filter(pk__in=counts).update(
+        on_loan=Greatest(F("on_loan") - _copies(counts), Value(0)),
+        next_expected_return=Subquery(next_due),
+        updated_at=timezone.now(),
+    )
+    if updated < len(counts):
+        _heal(counts)
+
+
+def _heal(book_ids):
+    existing = BookAvailability.objects.filter(
+        pk__in=book_ids
+    ).values_list("pk", flat=True)
+    rebuild_availability(set(book_ids) - set(existing))
+
+
+def rebuild_availability(book_ids=None, batch_size=1000):
+    """
+    Recompute availability from active borrowings, for ``book_ids`` or
+    every book, ``batch_size`` books at a time. Each batch is its own
+    transaction that first locks the batch's book rows, the same lock
+    take_copies and restock_copies take, so no checkout or return of
+    those books lands between the grouped count and the write. Returns
+    ``(checked, fixed)``: the number of books read and of rows written
+    because they were wrong or missing.
+    """
+    books = Book.objects.order_by("pk")
+    if book_ids is not None:
+        books = books.filter(pk__in=book_ids)
+
+    checked = fixed = last = 0
+    while True:
+        with transaction.atomic():
+            ids = list(
+                books.filter(pk__gt=last).select_for_update()
+                .values_list("pk", flat=True)[:batch_size]
+            )
+            if ids:
+                fixed += _store(_count_loans(ids))
+        checked += len(ids)
+        if len(ids) < batch_size:
+            return checked, fixed
+        last = ids[-1]
+
+
+def _count_loans(book_ids):
+    active = Q(borrowing__actual_return_date__isnull=True)
+    rows = Book.objects.order_by().filter(pk__in=book_ids).annotate(
+        on_loan=Count("borrowing", filter=active),
+        next_expected_return=Min(
+            "borrowing__expected_return_date", filter=active
+        ),
+    ).values_list("pk", "on_loan", "next_expected_return")
+    return {
+        book_id: (on_loan, next_expected_return)
+        for book_id, on_loan, next_expected_return in rows
+    }
+
+
+def _store(batch):
+    current = {
+        book_id: (on_loan, next_expected_return)
+        for book_id, on_loan, next_expected_return
+        in BookAvailability.objects.filter(pk__in=batch).values_list(
+            "pk", "on_loan", "next_expected_return"
+        )
+    }
+    stale = [
+        BookAvailability(
+            book_id=book_id,
+            on_loan=on_loan,
+            next_expected_return=next_expected_return,
+        )
+        for book_id, (on_loan, next_expected_return) in batch.items()
+        if current.get(book_id) != (on_loan, next_expected_return)
+    ]
+    BookAvailability.objects.bulk_create(
+        stale,
+        update_conflicts=True,
+        unique_fields=["book"],
+        update_fields=["on_loan", "next_expected_return", "updated_at"],
+    )
+    return len(stale)
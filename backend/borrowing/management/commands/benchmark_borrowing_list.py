@@ -0,0 +1,109 @@
+import datetime
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from borrowing.models import Borrowing
+from borrowing.serializers import (
+    BorrowingListSerializer,
+    BorrowingListFastSerializer,
+)
+from catalog.models import Book
+from user.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare per-row cost of the model and values() borrowing list "
+        "serializers. Seed rows are written in a transaction that is "
+        "rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1000)
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, rows, repeat, **options):
+        if rows <= 0 or repeat <= 0:
+            raise CommandError("--rows and --repeat must be positive.")
+
+        with transaction.atomic():
+            ids = self.seed(rows)
+            self.run(ids, repeat)
+            transaction.set_rollback(True)
+
+    def seed(self, rows):
+        user = User.objects.create_user(
+            email="benchmark@example.com",
+            password=None,
+            first_name="Bench",
+            last_name="Mark",
+        )
+        books = Book.objects.bulk_create([
+            Book(
+                title=f"Benchmark book {i}",
+                author=f"Benchmark author {i % 10}",
+                cover="SOFT",
+                inventory=10,
+                daily_fee="1.25",
+            )
+            for i in range(min(rows, 100))
+        ])
+        start = datetime.date(2024, 1, 1)
+        borrowings = Borrowing.objects.bulk_create([
+            Borrowing(
+                user=user,
+                book=books[i % len(books)],
+                borrow_date=start,
+                expected_return_date=start + datetime.timedelta(days=14),
+                actual_return_date=start if i % 2 else None,
+            )
+            for i in range(rows)
+        ])
+        return [borrowing.pk for borrowing in borrowings]
+
+    def run(self, ids, repeat):
+        queryset = (
+            Borrowing.objects.filter(pk__in=ids).with_charges().order_by("id")
+        )
+        modes = {
+            "model": (
+                BorrowingListSerializer,
+                queryset.select_related("book", "user"),
+            ),
+            "values": (
+                BorrowingListFastSerializer,
+                queryset.values(*BorrowingListFastSerializer.values_fields()),
+            ),
+        }
+
+        rendered = {}
+        for name, (serializer_class, source) in modes.items():
+            serialize, total = [], []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                fetched = list(source.all())
+                loaded = time.perf_counter()
+                body = JSONRenderer().render(
+                    serializer_class(fetched, many=True).data
+                )
+                finished = time.perf_counter()
+                serialize.append(finished - loaded)
+                total.append(finished - started)
+            rendered[name] = body
+            self.stdout.write(
+                f"{name:>6}: serialize {self.per_row(serialize, ids)} us/row, "
+                f"query + serialize {self.per_row(total, ids)} us/row "
+                f"(median of {repeat}, {len(ids)} rows)"
+            )
+
+        if rendered["model"] != rendered["values"]:
+            raise CommandError("Serializer outputs differ.")
+        self.stdout.write(self.style.SUCCESS("Outputs are byte-identical."))
+
+    @staticmethod
+    def per_row(timings, ids):
+        return f"{statistics.median(timings) / len(ids) * 1e6:.1f}"
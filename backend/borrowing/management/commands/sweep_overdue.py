@@ -0,0 +1,53 @@
+import datetime
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from borrowing.overdue import sweep_overdue
+
+
+class Command(BaseCommand):
+    help = (
+        "Flag overdue active borrowings and queue one overdue notification "
+        "for each. Safe to re-run and to interrupt."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--date",
+            type=datetime.date.fromisoformat,
+            help="Sweep as of this ISO date instead of today.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=settings.BORROWING_OVERDUE_SWEEP_CHUNK_SIZE,
+        )
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0.0,
+            help="Seconds to sleep between chunks.",
+        )
+
+    def handle(self, *args, date, chunk_size, pause, **options):
+        if chunk_size <= 0:
+            raise CommandError("--chunk-size must be positive.")
+        if pause < 0:
+            raise CommandError("--pause cannot be negative.")
+        today = date or timezone.now().date()
+
+        def on_chunk(report):
+            self.stdout.write(
+                f"{report.flagged} flagged in {report.chunks} chunks, "
+                f"{report.rate:.0f} rows/s"
+            )
+
+        report = sweep_overdue(
+            today, chunk_size=chunk_size, pause=pause, on_chunk=on_chunk
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Flagged {report.flagged} overdue borrowings as of {today} "
+            f"in {report.elapsed:.1f}s ({report.rate:.0f} rows/s)."
+        ))
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.7 on 2026-10-18 19:00
+
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ("borrowing", "0002_borrowing_borrowing_date_id_idx_and_more"),
+        ("catalog", "0002_book_book_author_id_idx"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="borrowing",
+            index=models.Index(
+                condition=models.Q(("actual_return_date__isnull", True)),
+                fields=["user", "borrow_date"],
+                name="borrowing_active_user_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="borrowing",
+            index=models.Index(
+                condition=models.Q(("actual_return_date__isnull", True)),
+                fields=["book"],
+                name="borrowing_active_book_idx",
+            ),
+        ),
+    ]
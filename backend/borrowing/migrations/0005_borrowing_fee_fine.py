@@ -0,0 +1,27 @@
+# Generated by Django 5.2.7 on 2026-10-18 19:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("borrowing", "0004_borrowing_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="borrowing",
+            name="fee",
+            field=models.DecimalField(
+                blank=True, decimal_places=2, max_digits=10, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="borrowing",
+            name="fine",
+            field=models.DecimalField(
+                blank=True, decimal_places=2, max_digits=10, null=True
+            ),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.7 on 2026-10-18 19:31
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ("borrowing", "0006_borrowing_overdue_sweep"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="borrowing",
+            index=models.Index(
+                condition=models.Q(
+                    ("actual_return_date__isnull", True),
+                    ("overdue_since__isnull", True),
+                ),
+                fields=["expected_return_date", "id"],
+                name="borrowing_overdue_sweep_idx",
+            ),
+        ),
+    ]
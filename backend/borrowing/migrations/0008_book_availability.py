@@ -0,0 +1,36 @@
+# Generated by Django 5.2.7 on 2026-10-18 20:58
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("borrowing", "0007_borrowing_overdue_sweep_idx"),
+        ("catalog", "0004_book_search_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BookAvailability",
+            fields=[
+                (
+                    "book",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="availability",
+                        serialize=False,
+                        to="catalog.book",
+                    ),
+                ),
+                ("on_loan", models.PositiveIntegerField(default=0)),
+                ("next_expected_return", models.DateField(blank=True, null=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name_plural": "book availability",
+            },
+        ),
+    ]
@@ -0,0 +1,37 @@
+from django.db import migrations
+from django.db.models import Count, Min, Q
+
+
+def backfill(apps, schema_editor):
+    Book = apps.get_model("catalog", "Book")
+    BookAvailability = apps.get_model("borrowing", "BookAvailability")
+    active = Q(borrowing__actual_return_date__isnull=True)
+    rows = Book.objects.order_by().annotate(
+        on_loan=Count("borrowing", filter=active),
+        next_expected_return=Min(
+            "borrowing__expected_return_date", filter=active
+        ),
+    ).values_list("pk", "on_loan", "next_expected_return")
+
+    batch = []
+    for book_id, on_loan, next_expected_return in rows.iterator(chunk_size=2000):
+        batch.append(BookAvailability(
+            book_id=book_id,
+            on_loan=on_loan,
+            next_expected_return=next_expected_return,
+        ))
+        if len(batch) == 2000:
+            BookAvailability.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    BookAvailability.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("borrowing", "0008_book_availability"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
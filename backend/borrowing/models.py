@@ -1,16 +1,103 @@
+from decimal import Decimal
+
+from django.conf import settings
 from django.db import models
-from django.db.models import Q, F
+from django.db.models import (
+    DateField,
+    F,
+    Func,
+    IntegerField,
+    OuterRef,
+    Q,
+    Subquery,
+    Value,
+)
+from django.db.models.functions import Coalesce, Greatest, Round
+from django.utils import timezone
 
 from catalog.models import Book
 from user.models import User
 
 
+class DaysBetween(Func):
+    """Whole days from ``start`` to ``end`` (Postgres date subtraction)."""
+
+    arg_joiner = " - "
+    template = "(%(expressions)s)"
+    output_field = IntegerField()
+
+    def __init__(self, end, start):
+        super().__init__(end, start)
+
+
+def fee_amount(end, daily_fee):
+    """Rent for the days from borrow_date to ``end``, at least one day."""
+    days = Greatest(DaysBetween(end, F("borrow_date")), Value(1))
+    return Round(days * daily_fee, 2)
+
+
+def fine_amount(end, daily_fee):
+    """Penalty for the days past expected_return_date up to ``end``."""
+    multiplier = Value(Decimal(str(settings.BORROWING_OVERDUE_FINE_MULTIPLIER)))
+    return Round(overdue_days(end) * daily_fee * multiplier, 2)
+
+
+def overdue_days(end):
+    return Greatest(DaysBetween(end, F("expected_return_date")), Value(0))
+
+
+class BorrowingQuerySet(models.QuerySet):
+    def with_charges(self, today=None):
+        """
+        Annotate ``accrued_fee``, ``accrued_fine`` and ``overdue_days``.
+
+        Returned loans report the amounts stored at return time, active
+        ones what they would cost if returned ``today``; both are computed
+        by the database.
+        """
+        today = Value(today or timezone.now().date(), output_field=DateField())
+        end = Coalesce(F("actual_return_date"), today)
+        return self.annotate(
+            accrued_fee=Coalesce(F("fee"), fee_amount(end, F("book__daily_fee"))),
+            accrued_fine=Coalesce(F("fine"), fine_amount(end, F("book__daily_fee"))),
+            overdue_days=overdue_days(end),
+        )
+
+    def mark_returned(self, now=None):
+        """
+        Return every active loan in the queryset with one UPDATE, storing
+        its fee and fine, and return the number of loans closed.
+        """
+        now = now or timezone.now()
+        today = Value(now.date(), output_field=DateField())
+        daily_fee = Subquery(
+            Book.objects.filter(pk=OuterRef("book_id")).values("daily_fee")[:1]
+        )
+        return self.filter(actual_return_date__isnull=True).update(
+            actual_return_date=now.date(),
+            updated_at=now,
+            fee=fee_amount(today, daily_fee),
+            fine=fine_amount(today, daily_fee),
+        )
+
+
 class Borrowing(models.Model):
     borrow_date = models.DateField()
     expected_return_date = models.DateField()
     actual_return_date = models.DateField(null=True, blank=True)
     book = models.ForeignKey(Book, on_delete=models.CASCADE)
     user = models.ForeignKey(User, on_delete=models.CASCADE)
+    updated_at = models.DateTimeField(auto_now=True)
+    fee = models.DecimalField(
+        max_digits=10, decimal_places=2, null=True, blank=True
+    )
+    fine = models.DecimalField(
+        max_digits=10, decimal_places=2, null=True, blank=True
+    )
+    # Set by the sweep_overdue command the first time the loan is seen late.
+    overdue_since = models.DateField(null=True, blank=True)
+
+    objects = BorrowingQuerySet.as_manager()
 
     class Meta:
         verbose_name_plural = "borrowings"
@@ -25,6 +112,34 @@ class Borrowing(models.Model):
                 name='actual_after_borrow'
             ),
         ]
+        indexes = [
+            models.Index(
+                fields=["borrow_date", "id"],
+                name="borrowing_date_id_idx"
+            ),
+            models.Index(
+                fields=["user", "borrow_date", "id"],
+                name="borrowing_user_date_id_idx"
+            ),
+            models.Index(
+                fields=["user", "borrow_date"],
+                condition=Q(actual_return_date__isnull=True),
+                name="borrowing_active_user_idx"
+            ),
+            models.Index(
+                fields=["book"],
+                condition=Q(actual_return_date__isnull=True),
+                name="borrowing_active_book_idx"
+            ),
+            models.Index(
+                fields=["expected_return_date", "id"],
+                condition=Q(
+                    actual_return_date__isnull=True,
+                    overdue_since__isnull=True,
+                ),
+                name="borrowing_overdue_sweep_idx"
+            ),
+        ]
 
     def __str__(self):
         returned = self.actual_return_date or "not returned yet"
@@ -33,3 +148,52 @@ class Borrowing(models.Model):
             f"({self.user.email}) borrowed '{self.book.title}' "
             f"on {self.borrow_date}, returned: {returned}"
         )
+
+
+class BookAvailability(models.Model):
+    """
+    Loans currently out per book, kept in step with Borrowing by the
+    helpers in borrowing.inventory; ``reconcile_availability`` rebuilds
+    it. Books without a row have nothing on loan.
+    """
+
+    book = models.OneToOneField(
+        Book,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="availability",
+    )
+    on_loan = models.PositiveIntegerField(default=0)
+    next_expected_return = models.DateField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = "book availability"
+
+    def __str__(self):
+        return f"{self.on_loan} on loan of book {self.book_id}"
+
+
+class OverdueNotification(models.Model):
+    """
+    Outbox row written by the overdue sweep, one per borrowing; a sender
+    picks up rows without ``sent_at`` and stamps them once delivered.
+    """
+
+    borrowing = models.OneToOneField(
+        Borrowing, on_delete=models.CASCADE, related_name="overdue_notification"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["id"],
+                condition=Q(sent_at__isnull=True),
+                name="overdue_notice_unsent_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"Overdue notice for borrowing {self.borrowing_id}"
@@ -0,0 +1,5 @@
+from catalog.pagination import KeysetPagination
+
+
+class BorrowingKeysetPagination(KeysetPagination):
+    ordering = ("-borrow_date", "-id")
@@ -1,6 +1,12 @@
+from collections import Counter
+
+from django.conf import settings
+from django.db import transaction
 from rest_framework import serializers
 
+from .inventory import loans_opened, take_copies
 from .models import Borrowing
+from catalog.mixins import ValuesSerializerMixin
 from catalog.models import Book
 from user.models import User
 
@@ -21,6 +27,14 @@ class BorrowingListSerializer(serializers.ModelSerializer):
     book = BookDetailSerializer(read_only=True)
     user = UserDetailSerializer(read_only=True)
     is_active = serializers.SerializerMethodField()
+    # Filled in by Borrowing.objects.with_charges().
+    fee = serializers.DecimalField(
+        max_digits=10, decimal_places=2, source="accrued_fee", read_only=True
+    )
+    fine = serializers.DecimalField(
+        max_digits=10, decimal_places=2, source="accrued_fine", read_only=True
+    )
+    overdue_days = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Borrowing
@@ -31,13 +45,46 @@ class BorrowingListSerializer(serializers.ModelSerializer):
             "actual_return_date",
             "book",
             "user",
-            "is_active"
+            "is_active",
+            "fee",
+            "fine",
+            "overdue_days",
         ]
 
     def get_is_active(self, obj):
         return obj.actual_return_date is None
 
 
+class BorrowingListFastSerializer(
+    ValuesSerializerMixin, BorrowingListSerializer
+):
+    """
+    BorrowingListSerializer for ``.values()`` rows: same fields, same
+    output, built straight from a flat projection of the three tables.
+    """
+
+    values_methods = {
+        "is_active": ("actual_return_date", lambda value: value is None),
+    }
+
+
+class BorrowingChargesSerializer(serializers.Serializer):
+    borrowings = serializers.IntegerField()
+    overdue = serializers.IntegerField()
+    fees = serializers.DecimalField(max_digits=12, decimal_places=2)
+    fines = serializers.DecimalField(max_digits=12, decimal_places=2)
+
+
+class UserChargesSerializer(BorrowingChargesSerializer):
+    user = serializers.IntegerField()
+    email = serializers.EmailField(source="user__email")
+
+
+class BookChargesSerializer(BorrowingChargesSerializer):
+    book = serializers.IntegerField()
+    title = serializers.CharField(source="book__title")
+
+
 class BorrowingCreateSerializer(serializers.ModelSerializer):
     user = UserDetailSerializer(read_only=True)
 
@@ -60,8 +107,95 @@ class BorrowingCreateSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         book = validated_data['book']
 
-        book.inventory -= 1
-        book.save()
+        with transaction.atomic():
+            # Conditional decrement: the row is only touched while a copy
+            # is still on the shelf, so concurrent checkouts cannot oversell.
+            if not take_copies({book.pk: 1}):
+                raise serializers.ValidationError(
+                    {"book": ["This book is out of stock."]}
+                )
 
-        borrowing = Borrowing.objects.create(**validated_data)
+            borrowing = Borrowing.objects.create(**validated_data)
+            loans_opened([(book.pk, borrowing.expected_return_date)])
         return borrowing
+
+
+class BorrowingBulkItemSerializer(serializers.Serializer):
+    book = serializers.IntegerField(min_value=1)
+    borrow_date = serializers.DateField()
+    expected_return_date = serializers.DateField()
+
+    def validate(self, attrs):
+        if attrs["expected_return_date"] <= attrs["borrow_date"]:
+            raise serializers.ValidationError(
+                {"expected_return_date": [
+                    "Expected return date must be after the borrow date."
+                ]}
+            )
+        return attrs
+
+
+class BorrowingBulkCreateSerializer(serializers.Serializer):
+    items = BorrowingBulkItemSerializer(
+        many=True,
+        allow_empty=False,
+        max_length=settings.BORROWING_BULK_MAX_ITEMS,
+    )
+
+    def validate_items(self, items):
+        """Check stock for every requested copy with a single query."""
+        requested = Counter(item["book"] for item in items)
+        remaining = dict(
+            Book.objects.filter(pk__in=requested).values_list("id", "inventory")
+        )
+
+        errors = []
+        for item in items:
+            book_id = item["book"]
+            if book_id not in remaining:
+                errors.append({"book": [f"Book {book_id} does not exist."]})
+            elif remaining[book_id] <= 0:
+                errors.append({"book": ["This book is out of stock."]})
+            else:
+                remaining[book_id] -= 1
+                errors.append({})
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return items
+
+    def create(self, validated_data):
+        items = validated_data["items"]
+        user = validated_data["user"]
+
+        with transaction.atomic():
+            if not take_copies(Counter(item["book"] for item in items)):
+                raise serializers.ValidationError(
+                    {"items": ["One or more books went out of stock."]}
+                )
+            borrowings = Borrowing.objects.bulk_create([
+                Borrowing(
+                    user=user,
+                    book_id=item["book"],
+                    borrow_date=item["borrow_date"],
+                    expected_return_date=item["expected_return_date"],
+                )
+                for item in items
+            ])
+            loans_opened([
+                (borrowing.book_id, borrowing.expected_return_date)
+                for borrowing in borrowings
+            ])
+        return borrowings
+
+
+class BorrowingBulkReturnSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=settings.BORROWING_BULK_MAX_ITEMS,
+    )
+
+    def validate_ids(self, ids):
+        if len(set(ids)) != len(ids):
+            raise serializers.ValidationError("Duplicate borrowing ids.")
+        return ids
@@ -0,0 +1,13 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from catalog.models import Book
+
+from .models import BookAvailability
+
+
+@receiver(post_save, sender=Book)
+def create_availability(sender, instance, created, raw=False, **kwargs):
+    # Bulk-imported books get theirs on first checkout (inventory._heal).
+    if created and not raw:
+        BookAvailability.objects.get_or_create(book=instance)
@@ -2,11 +2,13 @@ from django.urls import path, include
 from .views import BorrowingViewSet
 from rest_framework import routers
 
+from catalog.routers import async_read_urls
+
 app_name = "borrowing"
 
 router = routers.DefaultRouter()
 router.register("borrowings", BorrowingViewSet)
 
 urlpatterns = [
-    path("", include(router.urls)),
+    path("", include(async_read_urls(router.urls))),
 ]
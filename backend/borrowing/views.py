@@ -1,14 +1,42 @@
+from collections import Counter
+
 from rest_framework import viewsets, mixins, status
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.http import StreamingHttpResponse
 from django.utils import timezone
 
+from . import export
+from .inventory import loans_closed, restock_copies
 from .models import Borrowing
-from .serializers import BorrowingListSerializer, BorrowingCreateSerializer
+from .pagination import BorrowingKeysetPagination
+from .serializers import (
+    BorrowingListSerializer,
+    BorrowingListFastSerializer,
+    BorrowingCreateSerializer,
+    BorrowingBulkCreateSerializer,
+    BorrowingBulkReturnSerializer,
+    UserChargesSerializer,
+    BookChargesSerializer,
+)
+from catalog.mixins import (
+    AsyncReadMixin,
+    ConditionalGetMixin,
+    SerializerTimingMixin,
+)
+from catalog.pagination import KeysetPaginationMixin
+from user.authentication import database_user
 
 
 class BorrowingViewSet(
+    KeysetPaginationMixin,
+    ConditionalGetMixin,
+    SerializerTimingMixin,
+    AsyncReadMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     mixins.RetrieveModelMixin,
@@ -16,18 +44,35 @@ class BorrowingViewSet(
 ):
     queryset = Borrowing.objects.select_related("book", "user").all()
     permission_classes = [IsAuthenticated]
+    keyset_pagination_class = BorrowingKeysetPagination
+    conditional_timestamp_fields = (
+        "updated_at", "book__updated_at", "user__updated_at",
+    )
+    throttle_scopes = {"create": "checkout", "bulk_create": "checkout"}
+    charges_groups = {
+        "user": (("user", "user__email"), UserChargesSerializer),
+        "book": (("book", "book__title"), BookChargesSerializer),
+    }
 
     def get_serializer_class(self):
         if self.action == "create":
             return BorrowingCreateSerializer
+        if self.action == "bulk_create":
+            return BorrowingBulkCreateSerializer
+        if self.action == "bulk_return":
+            return BorrowingBulkReturnSerializer
+        if self.use_fast_list():
+            return BorrowingListFastSerializer
         return BorrowingListSerializer
 
     def get_queryset(self):
         user = self.request.user
-        queryset = Borrowing.objects.select_related("book", "user")
+        queryset = Borrowing.objects.all()
+        if self.action in ("list", "retrieve"):
+            queryset = queryset.select_related("book", "user").with_charges()
 
         if not user.is_staff:
-            queryset = queryset.filter(user=user)
+            queryset = queryset.filter(user_id=user.pk)
         elif user.is_staff:
             user_id = self.request.query_params.get("user_id")
             if user_id:
@@ -40,10 +85,30 @@ class BorrowingViewSet(
             elif is_active_param.lower() == "false":
                 queryset = queryset.filter(actual_return_date__isnull=False)
 
+        if self.use_fast_list():
+            queryset = queryset.values(
+                *BorrowingListFastSerializer.values_fields()
+            )
         return queryset
 
+    def use_fast_list(self):
+        return self.action == "list" and settings.BORROWING_FAST_LIST
+
+    def get_fingerprint(self, queryset):
+        count, stamps = super().get_fingerprint(queryset)
+        return count, [*stamps, self.charges_day()]
+
+    async def aget_fingerprint(self, queryset):
+        count, stamps = await super().aget_fingerprint(queryset)
+        return count, [*stamps, self.charges_day()]
+
+    def charges_day(self):
+        # Fees and fines of active loans grow at midnight without any row
+        # changing, so cached copies must not outlive the day.
+        return timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        serializer.save(user=database_user(self.request.user))
 
     @action(detail=True, methods=["post"], url_path="return")
     def return_borrowing(self, request, pk=None):
@@ -55,12 +120,146 @@ class BorrowingViewSet(
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        borrowing.actual_return_date = timezone.now().date()
-        borrowing.book.inventory += 1
-        borrowing.book.save()
-        borrowing.save()
+        with transaction.atomic():
+            # Only the request that flips actual_return_date from NULL gets
+            # to put the copy back, so a double return cannot inflate stock.
+            returned = Borrowing.objects.filter(pk=borrowing.pk).mark_returned()
+            if not returned:
+                return Response(
+                    {"error": "This borrowing has already been returned."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            restock_copies({borrowing.book_id: 1})
+            loans_closed({borrowing.book_id: 1})
 
         return Response(
             {"message": "Book returned successfully."},
             status=status.HTTP_200_OK,
         )
+
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk_create(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        borrowings = serializer.save(user=database_user(request.user))
+
+        results = self.timed_serializer(
+            BorrowingCreateSerializer(borrowings, many=True)
+        ).data
+        return Response({"results": results}, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=["post"], url_path="bulk-return")
+    def bulk_return(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data["ids"]
+
+        found = {
+            pk: (book_id, returned)
+            for pk, book_id, returned in self.get_queryset().filter(
+                pk__in=ids
+            ).values_list("id", "book_id", "actual_return_date")
+        }
+        errors = []
+        for pk in ids:
+            if pk not in found:
+                errors.append(["Not found."])
+            elif found[pk][1] is not None:
+                errors.append(["This borrowing has already been returned."])
+            else:
+                errors.append([])
+        if any(errors):
+            return Response(
+                {"ids": errors}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        with transaction.atomic():
+            returned = Borrowing.objects.filter(pk__in=ids).mark_returned()
+            if returned != len(ids):
+                transaction.set_rollback(True)
+                return Response(
+                    {"error": "Some borrowings have already been returned."},
+                    status=status.HTTP_409_CONFLICT,
+                )
+            returned_books = Counter(found[pk][0] for pk in ids)
+            restock_copies(returned_books)
+            loans_closed(returned_books)
+
+        return Response(
+            {"results": [
+                {"id": pk, "message": "Book returned successfully."}
+                for pk in ids
+            ]},
+            status=status.HTTP_200_OK,
+        )
+
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="export",
+        url_name="export",
+        permission_classes=[IsAdminUser],
+    )
+    def export_borrowings(self, request):
+        """Stream all matching borrowings as CSV (default) or NDJSON."""
+        export_format = request.query_params.get("export_format", "csv")
+        if export_format not in export.RENDERERS:
+            return Response(
+                {"export_format": [
+                    f"Expected one of: {', '.join(export.RENDERERS)}."
+                ]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        rows = export.export_rows(
+            self.get_queryset(), settings.BORROWING_EXPORT_CHUNK_SIZE
+        )
+        response = StreamingHttpResponse(
+            export.RENDERERS[export_format](rows),
+            content_type=export.CONTENT_TYPES[export_format],
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="borrowings.{export_format}"'
+        )
+        return response
+
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="fees",
+        url_name="fees",
+        permission_classes=[IsAdminUser],
+    )
+    def fees(self, request):
+        """
+        Fee and fine totals per user (default) or per book, honouring the
+        user_id and is_active filters, computed in one grouped query.
+        """
+        group_by = request.query_params.get("group_by", "user")
+        if group_by not in self.charges_groups:
+            return Response(
+                {"group_by": [
+                    f"Expected one of: {', '.join(self.charges_groups)}."
+                ]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        keys, serializer_class = self.charges_groups[group_by]
+        queryset = (
+            self.get_queryset()
+            .with_charges()
+            .values(*keys)
+            .annotate(
+                borrowings=Count("id"),
+                overdue=Count("id", filter=Q(overdue_days__gt=0)),
+                fees=Sum("accrued_fee"),
+                fines=Sum("accrued_fine"),
+            )
+            .order_by(keys[0])
+        )
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.timed_serializer(serializer_class(page, many=True))
+            return self.get_paginated_response(serializer.data)
+        serializer = self.timed_serializer(serializer_class(queryset, many=True))
+        return Response(serializer.data)
@@ -1,10 +1,31 @@
 from django.contrib import admin
+from django.contrib.admin.views.main import ORDER_VAR, ChangeList
 
 from .models import Book
 
 
+class BookChangeList(ChangeList):
+    def get_ordering(self, request, queryset):
+        # Search results come best match first unless a column was sorted;
+        # BookAdmin.get_search_results() keeps whichever order is set here.
+        if self.query and ORDER_VAR not in self.params:
+            return []
+        return super().get_ordering(request, queryset)
+
+
 @admin.register(Book)
 class BookAdmin(admin.ModelAdmin):
     list_display = ["title", "author", "cover", "cover", "inventory", "daily_fee",]
     list_filter = ["author",]
-    search_fields = ["title",]
+    search_fields = ["title", "author"]
+
+    def get_changelist(self, request, **kwargs):
+        return BookChangeList
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term:
+            return queryset, False
+        results = queryset.search(search_term)
+        if queryset.query.order_by:
+            results = results.order_by(*queryset.query.order_by)
+        return results, False
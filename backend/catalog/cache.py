@@ -0,0 +1,99 @@
+"""
+Versioned response cache for the public book catalog.
+
+Every cached list page and book detail is stored under a key that embeds
+the current catalog version. Any change to the catalog bumps the version,
+so all previously cached responses become unreachable at once and simply
+age out of the cache.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+VERSION_KEY = "catalog:version"
+HITS_KEY = "catalog:hits"
+MISSES_KEY = "catalog:misses"
+
+
+def get_cache():
+    return caches[settings.CATALOG_CACHE_ALIAS]
+
+
+def get_version():
+    cache = get_cache()
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        # Start from a timestamp rather than 1, so a version key that was
+        # evicted never resurrects responses cached under an old number.
+        cache.add(VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(VERSION_KEY, 0)
+    return version
+
+
+def bump_version():
+    cache = get_cache()
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.add(VERSION_KEY, time.time_ns(), timeout=None)
+
+
+def response_key(request, action):
+    params = sorted(request.query_params.lists())
+    raw = f"{action}|{request.build_absolute_uri(request.path)}|{params}"
+    digest = hashlib.sha1(raw.encode()).hexdigest()
+    return f"catalog:{get_version()}:{digest}"
+
+
+def lookup_response(request, action):
+    """``(key, data)`` for a response, ``data`` being None on a miss."""
+    key = response_key(request, action)
+    return key, get_response_data(key)
+
+
+def get_response_data(key):
+    data = get_cache().get(key)
+    _count(MISSES_KEY if data is None else HITS_KEY)
+    return data
+
+
+def set_response_data(key, data):
+    get_cache().set(key, _plain(data), timeout=settings.CATALOG_CACHE_TIMEOUT)
+
+
+def memoize(key, compute):
+    cache = get_cache()
+    value = cache.get(key)
+    if value is None:
+        value = compute()
+        cache.set(key, value, timeout=settings.CATALOG_CACHE_TIMEOUT)
+    return value
+
+
+def get_stats():
+    cache = get_cache()
+    return {
+        "version": get_version(),
+        "hits": cache.get(HITS_KEY, 0),
+        "misses": cache.get(MISSES_KEY, 0),
+    }
+
+
+def _count(key):
+    cache = get_cache()
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
+def _plain(data):
+    """Drop DRF's ReturnDict/ReturnList wrappers, which keep the serializer."""
+    if isinstance(data, dict):
+        return {key: _plain(value) for key, value in data.items()}
+    if isinstance(data, list):
+        return [_plain(value) for value in data]
+    return data
@@ -0,0 +1,23 @@
+from rest_framework.filters import BaseFilterBackend
+
+
+class BookSearchFilter(BaseFilterBackend):
+    """Ranked full-text and fuzzy author search via ``?search=``."""
+
+    search_param = "search"
+
+    def filter_queryset(self, request, queryset, view):
+        term = request.query_params.get(self.search_param, "").strip()
+        if not term:
+            return queryset
+        return queryset.search(term)
+
+    def get_schema_operation_parameters(self, view):
+        return [{
+            "name": self.search_param,
+            "required": False,
+            "in": "query",
+            "description": "Search titles and authors; results are ranked "
+                           "and authors are matched fuzzily.",
+            "schema": {"type": "string"},
+        }]
@@ -0,0 +1,175 @@
+"""
+Streaming bulk import of books from CSV or JSON Lines.
+
+Rows are read lazily and handled one batch at a time: each row is checked
+with the BookSerializer field rules, new books are written with a single
+bulk_create and rows carrying an existing ``id`` are upserted with
+INSERT ... ON CONFLICT. Each batch commits on its own and invalidates the
+cached book responses when it does. Memory use depends on the batch size,
+not on the size of the input.
+"""
+import csv
+import json
+from itertools import islice
+
+from django.db import transaction
+from rest_framework import serializers
+
+from . import cache
+from .models import Book
+from .serializers import BookSerializer
+
+FORMATS = ("csv", "jsonl")
+UPDATE_FIELDS = ["title", "author", "cover", "inventory", "daily_fee", "updated_at"]
+
+
+class ImportReport:
+    def __init__(self, max_errors=100):
+        self.created = 0
+        self.updated = 0
+        self.rejected = 0
+        self.errors = []
+        self.max_errors = max_errors
+
+    @property
+    def processed(self):
+        return self.created + self.updated + self.rejected
+
+    def reject(self, line, errors):
+        self.rejected += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"line": line, "errors": errors})
+
+    def as_dict(self):
+        return {
+            "created": self.created,
+            "updated": self.updated,
+            "rejected": self.rejected,
+            "errors": self.errors,
+        }
+
+
+def guess_format(filename):
+    name = (filename or "").lower()
+    if name.endswith(".csv"):
+        return "csv"
+    if name.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    return None
+
+
+def read_rows(stream, file_format):
+    """Yield ``(line, row, error)`` for every record of a text stream."""
+    if file_format == "csv":
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row, None
+        return
+
+    for line, text in enumerate(stream, start=1):
+        if not text.strip():
+            continue
+        try:
+            row = json.loads(text)
+        except ValueError:
+            yield line, None, {"non_field_errors": ["Invalid JSON."]}
+            continue
+        if not isinstance(row, dict):
+            yield line, None, {"non_field_errors": ["Expected a JSON object."]}
+            continue
+        yield line, row, None
+
+
+def import_books(
+    stream,
+    file_format,
+    batch_size=1000,
+    report=None,
+    on_batch=None,
+    on_reject=None,
+):
+    """
+    Import every row of ``stream`` and return an ImportReport.
+
+    ``on_batch(report)`` is called after each committed batch and
+    ``on_reject(line, errors)`` for every rejected row, so callers can
+    stream progress and rejections instead of collecting them.
+    """
+    if file_format not in FORMATS:
+        raise ValueError(f"Unsupported format: {file_format}")
+
+    report = report or ImportReport()
+    rows = read_rows(stream, file_format)
+    while batch := list(islice(rows, batch_size)):
+        _import_batch(batch, report, on_reject)
+        if on_batch:
+            on_batch(report)
+    return report
+
+
+def _import_batch(batch, report, on_reject):
+    def reject(line, error):
+        report.reject(line, error)
+        if on_reject:
+            on_reject(line, error)
+
+    validator = BookSerializer()
+    rows = []
+    seen = {}
+    for line, row, error in batch:
+        if error is None:
+            try:
+                book_id = _parse_id(row.get("id"))
+                data = validator.run_validation(row)
+            except serializers.ValidationError as exc:
+                error = exc.detail
+        # One upsert cannot touch the same row twice, so the first row
+        # with a given id in a batch wins.
+        if error is None and book_id in seen:
+            error = {"id": [
+                f"Book {book_id} already appears on line {seen[book_id]}."
+            ]}
+        if error is not None:
+            reject(line, error)
+            continue
+        if book_id is not None:
+            seen[book_id] = line
+        rows.append((line, Book(id=book_id, **data)))
+
+    wanted = {book.id for _, book in rows if book.id is not None}
+    existing = set(
+        Book.objects.filter(id__in=wanted).values_list("id", flat=True)
+    )
+    new, updates = [], []
+    for line, book in rows:
+        if book.id is None:
+            new.append(book)
+        elif book.id in existing:
+            updates.append(book)
+        else:
+            reject(line, {"id": [f"Book {book.id} does not exist."]})
+
+    with transaction.atomic():
+        Book.objects.bulk_create(new)
+        Book.objects.bulk_create(
+            updates,
+            update_conflicts=True,
+            unique_fields=["id"],
+            update_fields=UPDATE_FIELDS,
+        )
+        if new or updates:
+            transaction.on_commit(cache.bump_version)
+    report.created += len(new)
+    report.updated += len(updates)
+
+
+def _parse_id(value):
+    if value in (None, ""):
+        return None
+    try:
+        book_id = int(value)
+    except (TypeError, ValueError):
+        book_id = 0
+    if book_id <= 0:
+        raise serializers.ValidationError({"id": ["A valid integer is required."]})
+    return book_id
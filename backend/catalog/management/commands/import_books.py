@@ -0,0 +1,81 @@
+import json
+import sys
+import time
+from contextlib import ExitStack
+
+from django.core.management.base import BaseCommand, CommandError
+
+from catalog.importer import FORMATS, guess_format, import_books
+
+
+class Command(BaseCommand):
+    help = "Stream books from a CSV or JSON Lines file into the catalog."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Input file, or '-' for stdin.")
+        parser.add_argument(
+            "--format",
+            dest="file_format",
+            choices=FORMATS,
+            help="Input format; guessed from the file extension by default.",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--rejected",
+            help="Write rejected rows as JSON Lines to this file "
+                 "instead of stderr.",
+        )
+
+    def handle(self, *args, path, file_format, batch_size, rejected, **options):
+        file_format = file_format or guess_format(path)
+        if file_format is None:
+            raise CommandError("Cannot guess the format, pass --format.")
+        if batch_size <= 0:
+            raise CommandError("--batch-size must be positive.")
+
+        with ExitStack() as stack:
+            # stdin belongs to the process; only files opened here are closed.
+            if path == "-":
+                source = sys.stdin
+            else:
+                source = stack.enter_context(
+                    open_file(path, newline="", encoding="utf-8")
+                )
+            if rejected:
+                rejected_out = stack.enter_context(open_file(rejected, "w"))
+            else:
+                rejected_out = self.stderr
+            started = time.monotonic()
+
+            def on_batch(report):
+                elapsed = time.monotonic() - started
+                self.stdout.write(
+                    f"{report.processed} rows "
+                    f"({report.created} created, {report.updated} updated, "
+                    f"{report.rejected} rejected) in {elapsed:.1f}s"
+                )
+
+            def on_reject(line, errors):
+                rejected_out.write(
+                    json.dumps({"line": line, "errors": errors}) + "\n"
+                )
+
+            report = import_books(
+                source,
+                file_format,
+                batch_size=batch_size,
+                on_batch=on_batch,
+                on_reject=on_reject,
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {report.created + report.updated} books, "
+            f"rejected {report.rejected}."
+        ))
+
+
+def open_file(path, mode="r", **kwargs):
+    try:
+        return open(path, mode, **kwargs)
+    except OSError as exc:
+        raise CommandError(f"Cannot open {path}: {exc.strerror}.")
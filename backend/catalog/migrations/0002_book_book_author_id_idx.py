@@ -0,0 +1,20 @@
+# Generated by Django 5.2.7 on 2026-10-18 18:59
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ("catalog", "0001_initial"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="book",
+            index=models.Index(fields=["author", "id"], name="book_author_id_idx"),
+        ),
+    ]
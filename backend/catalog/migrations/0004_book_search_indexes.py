@@ -0,0 +1,38 @@
+# Generated by Django 5.2.7 on 2026-10-18 19:18
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import (
+    AddIndexConcurrently,
+    TrigramExtension,
+)
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ("catalog", "0003_book_updated_at"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        AddIndexConcurrently(
+            model_name="book",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.search.SearchVector(
+                    "title", "author", config="english"
+                ),
+                name="book_search_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="book",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass("author", name="gin_trgm_ops"),
+                name="book_author_trgm_idx",
+            ),
+        ),
+    ]
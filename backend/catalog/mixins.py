@@ -0,0 +1,425 @@
+import hashlib
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ImproperlyConfigured, ValidationError
+from django.db.models import Count, Max
+from django.http import Http404
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework import serializers, status
+from rest_framework.exceptions import APIException
+from rest_framework.renderers import BrowsableAPIRenderer
+from rest_framework.response import Response
+
+from . import cache
+from .pagination import KeysetPagination
+
+
+class ConditionalGetMixin:
+    """
+    Add a weak ETag to list and detail GETs, and Last-Modified to details.
+
+    The validators come from one aggregate over the filtered queryset
+    (row count and the newest value of each timestamp field), so a
+    matching If-None-Match / If-Modified-Since is answered with 304
+    before anything is fetched or serialized. Lists get no Last-Modified:
+    the newest timestamp stays put when a row leaves the set, only the
+    count in the ETag moves. Keyset pages are left alone: a whole-set
+    count is exactly what that mode avoids.
+    """
+
+    conditional_timestamp_fields = ("updated_at",)
+
+    def list(self, request, *args, **kwargs):
+        if isinstance(self.paginator, KeysetPagination):
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        return self.conditional_response(
+            queryset, super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        queryset = self.conditional_object_queryset(kwargs)
+        if queryset is None:
+            return super().retrieve(request, *args, **kwargs)
+        return self.conditional_response(
+            queryset,
+            super().retrieve,
+            request,
+            *args,
+            **kwargs,
+        )
+
+    async def alist(self, request, *args, **kwargs):
+        if isinstance(self.paginator, KeysetPagination):
+            return await super().alist(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        return await self.aconditional_response(
+            queryset, super().alist, request, *args, **kwargs
+        )
+
+    async def aretrieve(self, request, *args, **kwargs):
+        queryset = self.conditional_object_queryset(kwargs)
+        if queryset is None:
+            return await super().aretrieve(request, *args, **kwargs)
+        return await self.aconditional_response(
+            queryset,
+            super().aretrieve,
+            request,
+            *args,
+            **kwargs,
+        )
+
+    def conditional_object_queryset(self, kwargs):
+        """
+        The queryset behind a detail GET, or None when the lookup value
+        cannot match (e.g. a non-numeric pk); get_object() then answers 404.
+        """
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            return self.filter_queryset(self.get_queryset()).filter(
+                **{self.lookup_field: kwargs[lookup_url_kwarg]}
+            )
+        except (TypeError, ValueError, ValidationError):
+            return None
+
+    def fingerprint_aggregates(self):
+        return {
+            "count": Count("pk"),
+            **{
+                f"modified_{i}": Max(field)
+                for i, field in enumerate(self.conditional_timestamp_fields)
+            },
+        }
+
+    def get_fingerprint(self, queryset):
+        stats = queryset.aggregate(**self.fingerprint_aggregates())
+        count = stats.pop("count")
+        return count, list(stats.values())
+
+    async def aget_fingerprint(self, queryset):
+        stats = await queryset.aaggregate(**self.fingerprint_aggregates())
+        count = stats.pop("count")
+        return count, list(stats.values())
+
+    def conditional_response(self, queryset, handler, request, *args, **kwargs):
+        count, stamps = self.get_fingerprint(queryset)
+        if not count and self.action == "retrieve":
+            return handler(request, *args, **kwargs)
+
+        etag, last_modified = self.validators(request, count, stamps)
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        return self.set_validators(response, etag, last_modified)
+
+    async def aconditional_response(
+        self, queryset, handler, request, *args, **kwargs
+    ):
+        count, stamps = await self.aget_fingerprint(queryset)
+        if not count and self.action == "retrieve":
+            return await handler(request, *args, **kwargs)
+
+        etag, last_modified = self.validators(request, count, stamps)
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = await handler(request, *args, **kwargs)
+        return self.set_validators(response, etag, last_modified)
+
+    def validators(self, request, count, stamps):
+        raw = "|".join(str(part) for part in (
+            request.get_full_path(),
+            request.user.pk,
+            request.accepted_renderer.format,
+            count,
+            *stamps,
+        ))
+        etag = f'W/"{hashlib.sha1(raw.encode()).hexdigest()}"'
+        known = [stamp for stamp in stamps if stamp is not None]
+        last_modified = None
+        if known and self.action == "retrieve":
+            last_modified = int(max(known).timestamp())
+        return etag, last_modified
+
+    def set_validators(self, response, etag, last_modified):
+        if response.status_code in (
+            status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED
+        ):
+            response["ETag"] = etag
+            if last_modified is not None:
+                response["Last-Modified"] = http_date(last_modified)
+        return response
+
+
+class SerializerTimingMixin:
+    """
+    Report the serializers of a viewset as the ``serialize`` phase of
+    RequestMetricsMiddleware: every one from get_serializer(), plus those
+    an action builds itself and passes through timed_serializer().
+    Only turning objects into primitives is timed; validating input stays
+    part of the view phase.
+    """
+
+    def get_serializer(self, *args, **kwargs):
+        return self.timed_serializer(super().get_serializer(*args, **kwargs))
+
+    def timed_serializer(self, serializer):
+        timer = getattr(self.request, "_timer", None)
+        if timer is None:
+            return serializer
+        return timer.time_serializer(serializer)
+
+
+class CatalogCacheMixin:
+    """Serve list and detail responses from the versioned catalog cache."""
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
+
+    async def alist(self, request, *args, **kwargs):
+        return await self.acached_response(
+            super().alist, request, *args, **kwargs
+        )
+
+    async def aretrieve(self, request, *args, **kwargs):
+        return await self.acached_response(
+            super().aretrieve, request, *args, **kwargs
+        )
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        key, data = cache.lookup_response(request, self.action)
+        if data is not None:
+            return Response(data)
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set_response_data(key, response.data)
+        return response
+
+    async def acached_response(self, handler, request, *args, **kwargs):
+        key, data = await sync_to_async(cache.lookup_response)(
+            request, self.action
+        )
+        if data is not None:
+            return Response(data)
+
+        response = await handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            await sync_to_async(cache.set_response_data)(key, response.data)
+        return response
+
+
+class AsyncReadMixin:
+    """
+    Async list and retrieve for a viewset, served by ``as_async_view()``.
+
+    Authentication, permissions and throttles run as in ``APIView.initial``
+    and rows come from the async ORM, so a request only leaves the event
+    loop for its queries and cache calls. Serializers and renderers are
+    the viewset's own, so the JSON is the same as from the sync actions.
+    Authenticators without an ``aauthenticate`` method run in a thread.
+    """
+
+    @classmethod
+    def as_async_view(cls, sync_view):
+        """
+        Wrap a router view whose GET maps to list or retrieve; GET and HEAD
+        run async, other methods go to ``sync_view`` in a thread.
+        """
+        actions = sync_view.actions
+        action = actions["get"]
+        fallback = sync_to_async(sync_view)
+
+        async def view(request, *args, **kwargs):
+            if request.method not in ("GET", "HEAD"):
+                return await fallback(request, *args, **kwargs)
+            self = cls(**sync_view.initkwargs)
+            self.action_map = {"get": action, "head": action}
+            return await self.adispatch(request, *args, **kwargs)
+
+        view.cls = cls
+        view.initkwargs = sync_view.initkwargs
+        view.actions = actions
+        view.csrf_exempt = True
+        return view
+
+    async def adispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await self.ainitial(request, *args, **kwargs)
+            handler = getattr(self, f"a{self.action}")
+            response = await handler(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        if isinstance(self.response, Response) and not isinstance(
+            self.response.accepted_renderer, BrowsableAPIRenderer
+        ):
+            # The browsable API builds its forms from the database, so it is
+            # left for Django to render in a thread.
+            self.response.render()
+        return self.response
+
+    async def ainitial(self, request, *args, **kwargs):
+        self.format_kwarg = self.get_format_suffix(**kwargs)
+        neg = self.perform_content_negotiation(request)
+        request.accepted_renderer, request.accepted_media_type = neg
+        version, scheme = self.determine_version(request, *args, **kwargs)
+        request.version, request.versioning_scheme = version, scheme
+
+        await self.aperform_authentication(request)
+        self.check_permissions(request)
+        await self.acheck_throttles(request)
+
+    async def aperform_authentication(self, request):
+        for authenticator in request.authenticators:
+            aauthenticate = getattr(authenticator, "aauthenticate", None)
+            if aauthenticate is None:
+                aauthenticate = sync_to_async(authenticator.authenticate)
+            try:
+                user_auth_tuple = await aauthenticate(request)
+            except APIException:
+                request._not_authenticated()
+                raise
+            if user_auth_tuple is not None:
+                request._authenticator = authenticator
+                request.user, request.auth = user_auth_tuple
+                return
+        request._not_authenticated()
+
+    async def acheck_throttles(self, request):
+        throttle_durations = []
+        for throttle in self.get_throttles():
+            if not await sync_to_async(throttle.allow_request)(request, self):
+                throttle_durations.append(throttle.wait())
+        if throttle_durations:
+            durations = [d for d in throttle_durations if d is not None]
+            self.throttled(request, max(durations, default=None))
+
+    async def alist(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = None
+        if self.paginator is not None:
+            page = await self.paginator.apaginate_queryset(
+                queryset, request, view=self
+            )
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        serializer = self.get_serializer(
+            [row async for row in queryset.aiterator()], many=True
+        )
+        return Response(serializer.data)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        instance = await self.aget_object()
+        serializer = self.get_serializer(instance)
+        return Response(serializer.data)
+
+    async def aget_object(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            obj = await queryset.aget(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            )
+        except queryset.model.DoesNotExist:
+            raise Http404(
+                f"No {queryset.model._meta.object_name} matches the given query."
+            )
+        except (TypeError, ValueError, ValidationError):
+            raise Http404
+        self.check_object_permissions(self.request, obj)
+        return obj
+
+
+class ValuesSerializerMixin:
+    """
+    Read-only fast path that renders ``.values()`` rows instead of models.
+
+    The serializer's own fields are compiled once per class into a flat
+    plan of ``(name, lookup, to_representation)`` steps, nested serializers
+    becoming sub-plans over ``fk__field`` lookups. Each row then costs a
+    few dict lookups and the same field conversions DRF would run, without
+    building nested serializer instances or resolving attributes per row.
+    ``SerializerMethodField``s cannot see a model instance, so each one is
+    declared in ``values_methods`` as ``{name: (lookup, function)}``.
+    """
+
+    values_methods = {}
+
+    @classmethod
+    def values_plan(cls):
+        if "_values_plan" not in cls.__dict__:
+            cls._values_plan = cls._compile_plan(cls(), "")
+        return cls._values_plan
+
+    @classmethod
+    def values_fields(cls):
+        """Lookups to pass to ``QuerySet.values()`` for this serializer."""
+        return list(dict.fromkeys(cls._lookups(cls.values_plan())))
+
+    @classmethod
+    def _compile_plan(cls, serializer, prefix):
+        plan = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            if prefix == "" and name in cls.values_methods:
+                lookup, function = cls.values_methods[name]
+                plan.append((name, lookup, function, False))
+                continue
+            if field.source == "*" or isinstance(
+                field, serializers.SerializerMethodField
+            ):
+                raise ImproperlyConfigured(
+                    f"{cls.__name__}.{name} needs an entry in values_methods."
+                )
+            lookup = prefix + field.source.replace(".", "__")
+            if isinstance(field, serializers.BaseSerializer):
+                if isinstance(field, serializers.ListSerializer):
+                    raise ImproperlyConfigured(
+                        f"{cls.__name__}.{name}: to-many fields are not supported."
+                    )
+                plan.append(
+                    (name, lookup, cls._compile_plan(field, f"{lookup}__"), None)
+                )
+            else:
+                plan.append((name, lookup, field.to_representation, True))
+        return plan
+
+    @classmethod
+    def _lookups(cls, plan):
+        for name, lookup, step, skip_none in plan:
+            yield lookup
+            if skip_none is None:
+                yield from cls._lookups(step)
+
+    @classmethod
+    def _render(cls, plan, row):
+        data = {}
+        for name, lookup, step, skip_none in plan:
+            value = row[lookup]
+            if skip_none is None:
+                data[name] = None if value is None else cls._render(step, row)
+            elif skip_none and value is None:
+                data[name] = None
+            else:
+                data[name] = step(value)
+        return data
+
+    def to_representation(self, row):
+        return self._render(self.values_plan(), row)
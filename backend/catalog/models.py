@@ -1,4 +1,47 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+    TrigramWordSimilarity,
+)
 from django.db import models
+from django.db.models import F, Q
+from django.db.models.functions import Coalesce
+
+
+def book_search_vector():
+    # Must stay identical to the expression of the book_search_idx index.
+    return SearchVector("title", "author", config="english")
+
+
+class BookQuerySet(models.QuerySet):
+    def search(self, term):
+        """
+        Full-text match on title and author, plus fuzzy trigram matching
+        on the author, best matches first. Both conditions are served by
+        GIN indexes.
+        """
+        query = SearchQuery(term, config="english", search_type="websearch")
+        return self.annotate(
+            search=book_search_vector(),
+            rank=SearchRank(book_search_vector(), query),
+            similarity=TrigramWordSimilarity(term, "author"),
+        ).filter(
+            Q(search=query) | Q(author__trigram_word_similar=term)
+        ).order_by("-rank", "-similarity", "id")
+
+    def with_availability(self):
+        """
+        Annotate ``on_loan``, ``total_copies`` and ``next_expected_return``
+        from the book's availability row (borrowing.BookAvailability).
+        """
+        on_loan = Coalesce(F("availability__on_loan"), 0)
+        return self.annotate(
+            on_loan=on_loan,
+            total_copies=F("inventory") + on_loan,
+            next_expected_return=F("availability__next_expected_return"),
+        )
 
 
 class Book(models.Model):
@@ -14,10 +57,21 @@ class Book(models.Model):
     )
     inventory = models.PositiveIntegerField()
     daily_fee = models.DecimalField(max_digits=5, decimal_places=2)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = BookQuerySet.as_manager()
 
     class Meta:
         ordering = ["author"]
         verbose_name_plural = "books"
+        indexes = [
+            models.Index(fields=["author", "id"], name="book_author_id_idx"),
+            GinIndex(book_search_vector(), name="book_search_idx"),
+            GinIndex(
+                OpClass("author", name="gin_trgm_ops"),
+                name="book_author_trgm_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.title} by {self.author}"
@@ -0,0 +1,224 @@
+import base64
+import binascii
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework import pagination
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class LimitOffsetPagination(pagination.LimitOffsetPagination):
+    """DRF's limit/offset pages, with an async variant for async views."""
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+
+        self.count = await queryset.acount()
+        self.offset = self.get_offset(request)
+        if self.count > self.limit and self.template is not None:
+            self.display_page_controls = True
+
+        if self.count == 0 or self.offset > self.count:
+            return []
+        queryset = queryset[self.offset:self.offset + self.limit]
+        return [row async for row in queryset]
+
+
+class KeysetPagination(BasePagination):
+    """
+    Seek-based pagination over a fixed, unique ordering.
+
+    Each page is fetched with a WHERE clause that starts right after the
+    last row of the previous page instead of an OFFSET, and no total count
+    is computed, so deep pages cost the same as the first one.
+    Cursors are opaque base64 tokens holding the ordering values of the
+    boundary row and the paging direction.
+    """
+
+    ordering = ("id",)
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = "limit"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor."
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.page_queryset(queryset, request)
+        return self.set_page(list(queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        queryset = self.page_queryset(queryset, request)
+        return self.set_page([row async for row in queryset])
+
+    def page_queryset(self, queryset, request):
+        """The page's rows plus one, which tells whether another page follows."""
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.position, self.reverse = self.decode_cursor(request)
+        if self.position is not None:
+            self.position = self.clean_position(queryset.model, self.position)
+
+        ordering = self.ordering
+        if self.reverse:
+            ordering = tuple(self._flip(field) for field in ordering)
+
+        queryset = queryset.order_by(*ordering)
+        if self.position is not None:
+            queryset = queryset.filter(self._seek(ordering, self.position))
+        return queryset[:self.page_size + 1]
+
+    def set_page(self, rows):
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if self.reverse:
+            rows.reverse()
+
+        self.page = rows
+        if self.reverse:
+            self.has_next = self.position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.position is not None
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def encode_cursor(self, row, reverse):
+        position = [self._value(row, field.lstrip("-")) for field in self.ordering]
+        payload = json.dumps({"p": position, "r": reverse}, default=str)
+        token = base64.urlsafe_b64encode(payload.encode()).decode()
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token.encode()))
+            position, reverse = payload["p"], bool(payload["r"])
+        except (binascii.Error, ValueError, TypeError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def clean_position(self, model, position):
+        """
+        Convert the cursor's values with their ordering fields; a tampered
+        cursor is answered like a malformed one rather than reaching SQL.
+        """
+        cleaned = []
+        for field, value in zip(self.ordering, position):
+            try:
+                value = model._meta.get_field(field.lstrip("-")).to_python(value)
+            except (TypeError, ValueError, ValidationError):
+                raise NotFound(self.invalid_cursor_message)
+            if value is None:
+                raise NotFound(self.invalid_cursor_message)
+            cleaned.append(value)
+        return cleaned
+
+    @staticmethod
+    def _value(row, name):
+        if isinstance(row, dict):
+            return row[name]
+        return getattr(row, name)
+
+    @staticmethod
+    def _flip(field):
+        return field[1:] if field.startswith("-") else f"-{field}"
+
+    @staticmethod
+    def _seek(ordering, position):
+        """
+        Build ``(f1, f2, ...) > (v1, v2, ...)`` honouring each field's
+        direction. The leading ``f1 >= v1`` bound is redundant but lets the
+        planner start the index scan at the cursor instead of filtering
+        from the top.
+        """
+        first = ordering[0].lstrip("-")
+        bound = "lte" if ordering[0].startswith("-") else "gte"
+        condition = Q()
+        for i, field in enumerate(ordering):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            term = Q(**{f"{name}__{lookup}": position[i]})
+            for previous, value in zip(ordering[:i], position):
+                term &= Q(**{previous.lstrip("-"): value})
+            condition |= term
+        return Q(**{f"{first}__{bound}": position[0]}) & condition
+
+
+class KeysetPaginationMixin:
+    """
+    Let a viewset switch from the default pagination to keyset pages
+    when the client asks for ``?pagination=keyset``. Only the actions in
+    ``keyset_actions`` page over the keyset ordering; the rest, such as
+    grouped reports, keep the default pagination.
+    """
+
+    keyset_pagination_class = None
+    keyset_query_param = "pagination"
+    keyset_actions = ("list",)
+
+    @property
+    def paginator(self):
+        if not hasattr(self, "_paginator"):
+            params = getattr(getattr(self, "request", None), "query_params", {})
+            if (
+                self.keyset_pagination_class is None
+                or getattr(self, "action", None) not in self.keyset_actions
+                or params.get(self.keyset_query_param) != "keyset"
+            ):
+                return super().paginator
+            self._paginator = self.keyset_pagination_class()
+        return self._paginator
+
+
+class BookKeysetPagination(KeysetPagination):
+    ordering = ("author", "id")
@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.urls import URLPattern
+
+from .mixins import AsyncReadMixin
+
+
+def async_read_urls(urls, enabled=None):
+    """
+    Route GET list and retrieve of ``AsyncReadMixin`` viewsets to their
+    async views. ``enabled`` defaults to the ASYNC_READ_VIEWS setting.
+    """
+    if enabled is None:
+        enabled = settings.ASYNC_READ_VIEWS
+    if not enabled:
+        return urls
+    return [_async_route(url) for url in urls]
+
+
+def _async_route(url):
+    view = getattr(url, "callback", None)
+    viewset = getattr(view, "cls", None)
+    actions = getattr(view, "actions", None) or {}
+    if (
+        not isinstance(viewset, type)
+        or not issubclass(viewset, AsyncReadMixin)
+        or actions.get("get") not in ("list", "retrieve")
+    ):
+        return url
+    return URLPattern(
+        url.pattern, viewset.as_async_view(view), url.default_args, url.name
+    )
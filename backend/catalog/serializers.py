@@ -1,8 +1,33 @@
+from django.conf import settings
 from rest_framework import serializers
+from rest_framework.fields import empty
+from rest_framework.utils import html
 
 from .models import Book
 
 
+class IdListField(serializers.ListField):
+    """
+    Positive ids as a JSON list or comma-separated (``?ids=1,2,3``;
+    repeated parameters are joined). Duplicates are dropped, keeping the
+    first occurrence, before ``max_length`` is checked.
+    """
+
+    child = serializers.IntegerField(min_value=1)
+
+    def get_value(self, dictionary):
+        if html.is_html_input(dictionary):
+            if self.field_name not in dictionary:
+                return empty
+            return ",".join(dictionary.getlist(self.field_name))
+        return super().get_value(dictionary)
+
+    def to_internal_value(self, data):
+        if isinstance(data, str):
+            data = [part.strip() for part in data.split(",") if part.strip()]
+        return list(dict.fromkeys(super().to_internal_value(data)))
+
+
 class BookSerializer(serializers.ModelSerializer):
     class Meta:
         model = Book
@@ -13,3 +38,21 @@ class BookListSerializer(serializers.ModelSerializer):
     class Meta:
         model = Book
         fields = ("id", "title", "author")
+
+
+class BookBatchQuerySerializer(serializers.Serializer):
+    ids = IdListField(allow_empty=False, max_length=settings.BOOK_BATCH_MAX_SIZE)
+
+
+class BookAvailabilityQuerySerializer(serializers.Serializer):
+    ids = IdListField(
+        allow_empty=False, max_length=settings.BOOK_AVAILABILITY_BATCH_MAX_SIZE
+    )
+
+
+class BookAvailabilitySerializer(serializers.Serializer):
+    book = serializers.IntegerField(source="id")
+    total_copies = serializers.IntegerField()
+    on_loan = serializers.IntegerField()
+    available = serializers.IntegerField(source="inventory")
+    next_expected_return = serializers.DateField()
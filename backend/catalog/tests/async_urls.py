@@ -0,0 +1,17 @@
+"""The project URLs with async read views switched on."""
+from django.urls import include, path
+
+from borrowing.urls import router as borrowing_router
+from catalog.routers import async_read_urls
+from catalog.urls import router as catalog_router
+from library.urls import urlpatterns as project_urlpatterns
+
+urlpatterns = [
+    path("api/books/", include(
+        (async_read_urls(catalog_router.urls, enabled=True), "catalog")
+    )),
+    path("api/borrowings/", include(
+        (async_read_urls(borrowing_router.urls, enabled=True), "borrowing")
+    )),
+    *project_urlpatterns,
+]
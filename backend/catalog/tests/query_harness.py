@@ -0,0 +1,124 @@
+"""
+Reusable check that list endpoints issue a fixed number of queries.
+
+``QueryCountHarness`` finds every GET collection route of the routers
+included in the root URLconf, grows the seeded data through
+``sizes`` and requests each route at every size. A route whose query count
+changes with the number of rows fails with its view, action and URL and
+the normalized SQL statements that were repeated.
+"""
+import re
+from collections import Counter
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLResolver, get_resolver, reverse
+from rest_framework.viewsets import ViewSetMixin
+
+LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+IN_LISTS = re.compile(r"\bIN \((?:\?, )*\?\)")
+
+
+def normalize_sql(sql):
+    return IN_LISTS.sub("IN (...)", LITERALS.sub("?", sql))
+
+
+def collection_routes(resolver=None, namespace=""):
+    """
+    Yield ``(url_name, view_class, action)`` for every viewset route that
+    answers GET and needs no URL arguments.
+    """
+    resolver = resolver or get_resolver()
+    for pattern in resolver.url_patterns:
+        if isinstance(pattern, URLResolver):
+            inner = namespace
+            if pattern.namespace:
+                inner = f"{namespace}{pattern.namespace}:"
+            yield from collection_routes(pattern, inner)
+            continue
+
+        view_class = getattr(pattern.callback, "cls", None)
+        actions = getattr(pattern.callback, "actions", None) or {}
+        if (
+            view_class is None
+            or not issubclass(view_class, ViewSetMixin)
+            or "get" not in actions
+            or pattern.pattern.regex.groups
+            or not pattern.name
+        ):
+            continue
+        yield f"{namespace}{pattern.name}", view_class, actions["get"]
+
+
+class QueryCountHarness:
+    """
+    Mixin for test cases; subclasses implement ``seed(size)`` to bring the
+    data to ``size`` rows per collection and authenticate ``self.client``.
+    """
+
+    sizes = (1, 10, 100)
+    query_variants = (
+        {"limit": 100},
+        {"limit": 100, "pagination": "keyset"},
+    )
+    skip_routes = ()
+
+    def seed(self, size):
+        raise NotImplementedError
+
+    def capture(self, url, params):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, params)
+            if response.streaming:
+                b"".join(response.streaming_content)
+        self.assertLess(
+            response.status_code, 400, f"GET {url} {params}: {response.status_code}"
+        )
+        return [query["sql"] for query in context.captured_queries]
+
+    def assertQueryCountsConstant(self, routes=None):
+        routes = [
+            route for route in routes or collection_routes()
+            if route[0] not in self.skip_routes
+        ]
+        self.assertTrue(routes, "No collection routes found.")
+
+        captured = {}
+        for size in self.sizes:
+            self.seed(size)
+            for name, _, _ in routes:
+                url = reverse(name)
+                for i, params in enumerate(self.query_variants):
+                    captured.setdefault((name, i), []).append(
+                        self.capture(url, params)
+                    )
+
+        failures = []
+        for name, view_class, action in routes:
+            for i, params in enumerate(self.query_variants):
+                runs = captured[name, i]
+                counts = [len(run) for run in runs]
+                if len(set(counts)) > 1:
+                    failures.append(self.describe(
+                        name, view_class, action, params, counts, runs
+                    ))
+        if failures:
+            self.fail("\n\n".join(failures))
+
+    def describe(self, name, view_class, action, params, counts, runs):
+        first = Counter(normalize_sql(sql) for sql in runs[0])
+        last = Counter(normalize_sql(sql) for sql in runs[-1])
+        repeated = [
+            f"  x{count} (was {first[sql]}): {sql}"
+            for sql, count in last.most_common()
+            if count > first[sql]
+        ]
+        sizes = ", ".join(
+            f"{size} rows: {count}" for size, count in zip(self.sizes, counts)
+        )
+        return "\n".join([
+            f"{view_class.__name__}.{action} (GET {reverse(name)} {params}) "
+            f"query count grows with data ({sizes} queries).",
+            "Repeated SQL:",
+            *repeated,
+        ])
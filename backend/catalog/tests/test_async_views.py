@@ -0,0 +1,160 @@
+import datetime
+
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from borrowing.models import Borrowing
+from catalog.mixins import AsyncReadMixin
+from catalog.models import Book
+from user.models import User
+
+ASYNC_URLCONF = "catalog.tests.async_urls"
+BOOK_URL = reverse("catalog:book-list")
+BORROWING_URL = reverse("borrowing:borrowing-list")
+
+
+def book_url(pk):
+    return reverse("catalog:book-detail", args=[pk])
+
+
+def borrowing_url(pk):
+    return reverse("borrowing:borrowing-detail", args=[pk])
+
+
+class AsyncReadViewTests(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(
+            email="admin@example.com", password="password123"
+        )
+        self.reader = User.objects.create_user(
+            email="reader@example.com", password="password123"
+        )
+        self.books = [
+            Book.objects.create(
+                title=f"Book {i}", author=f"Author {i % 3}", cover="SOFT",
+                inventory=3, daily_fee="1.50",
+            )
+            for i in range(7)
+        ]
+        start = datetime.date.today() - datetime.timedelta(days=20)
+        self.borrowings = [
+            Borrowing.objects.create(
+                book=book,
+                user=self.reader if i % 2 else self.admin,
+                borrow_date=start,
+                expected_return_date=start + datetime.timedelta(days=7),
+                actual_return_date=start + datetime.timedelta(days=3) if i % 3 else None,
+            )
+            for i, book in enumerate(self.books)
+        ]
+
+    def token(self, user):
+        return f"Bearer {AccessToken.for_user(user)}"
+
+    def fetch(self, url, user=None, **headers):
+        if user is not None:
+            headers["HTTP_AUTHORIZE"] = self.token(user)
+        response = self.client.get(url, **headers)
+        with override_settings(ROOT_URLCONF=ASYNC_URLCONF):
+            async_response = self.client.get(url, **headers)
+        return response, async_response
+
+    def assertSameResponse(self, url, user=None, **headers):
+        response, async_response = self.fetch(url, user, **headers)
+        self.assertEqual(async_response.status_code, response.status_code, url)
+        self.assertEqual(async_response.content, response.content, url)
+        for header in ("ETag", "Last-Modified", "Content-Type"):
+            self.assertEqual(
+                async_response.get(header), response.get(header), (url, header)
+            )
+        return async_response
+
+    def test_routes_are_async_views(self):
+        with override_settings(ROOT_URLCONF=ASYNC_URLCONF):
+            for url in (BOOK_URL, book_url(1), BORROWING_URL, borrowing_url(1)):
+                match = self.client.get(url).resolver_match
+                self.assertTrue(issubclass(match.func.cls, AsyncReadMixin))
+                self.assertIn("as_async_view", match.func.__qualname__)
+
+    def test_book_reads_match_the_sync_views(self):
+        for url in (
+            BOOK_URL,
+            f"{BOOK_URL}?limit=3&offset=2",
+            f"{BOOK_URL}?pagination=keyset&limit=2",
+            f"{BOOK_URL}?search=Author",
+            book_url(self.books[0].pk),
+            book_url(0),
+        ):
+            self.assertSameResponse(url)
+
+        response = self.assertSameResponse(f"{BOOK_URL}?pagination=keyset&limit=2")
+        self.assertSameResponse(response.json()["next"])
+
+    def test_borrowing_reads_match_the_sync_views(self):
+        for user in (self.admin, self.reader):
+            for url in (
+                BORROWING_URL,
+                f"{BORROWING_URL}?is_active=true",
+                f"{BORROWING_URL}?user_id={self.reader.pk}",
+                f"{BORROWING_URL}?pagination=keyset&limit=2",
+                borrowing_url(self.borrowings[0].pk),
+                borrowing_url(self.borrowings[1].pk),
+            ):
+                self.assertSameResponse(url, user)
+
+    @override_settings(BORROWING_FAST_LIST=False, JWT_STATELESS=True)
+    def test_model_serializer_and_stateless_tokens(self):
+        self.assertSameResponse(BORROWING_URL, self.reader)
+        self.assertSameResponse(f"{BORROWING_URL}?is_active=false", self.admin)
+
+    def test_errors_match_the_sync_views(self):
+        self.assertSameResponse(BORROWING_URL)
+        self.assertSameResponse(BORROWING_URL, HTTP_AUTHORIZE="Bearer nope")
+        for url in (book_url("abc"), borrowing_url("abc")):
+            response = self.assertSameResponse(url, self.admin)
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        token = self.token(self.reader)
+        self.reader.is_active = False
+        self.reader.save()
+        self.assertSameResponse(BORROWING_URL, HTTP_AUTHORIZE=token)
+
+    def test_conditional_requests(self):
+        _, response = self.fetch(BOOK_URL)
+        with override_settings(ROOT_URLCONF=ASYNC_URLCONF):
+            response = self.client.get(BOOK_URL, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_force_authenticated_clients_are_supported(self):
+        self.client.force_authenticate(self.reader)
+        with override_settings(ROOT_URLCONF=ASYNC_URLCONF):
+            response = self.client.get(BORROWING_URL)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 3)
+
+    def test_writes_still_use_the_sync_actions(self):
+        self.client.force_authenticate(self.admin)
+        with override_settings(ROOT_URLCONF=ASYNC_URLCONF):
+            response = self.client.post(BOOK_URL, {
+                "title": "Emma", "author": "Jane Austen", "cover": "HARD",
+                "inventory": 1, "daily_fee": "1.00",
+            })
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            response = self.client.delete(book_url(response.data["id"]))
+            self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+    @override_settings(ROOT_URLCONF=ASYNC_URLCONF)
+    async def test_served_from_the_event_loop(self):
+        headers = {"Authorize": await self.atoken(self.reader)}
+        response = await self.async_client.get(BORROWING_URL, headers=headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["count"], 3)
+        self.assertRegex(response["Server-Timing"], r'desc="[1-9]\d* queries"')
+
+        response = await self.async_client.get(book_url(self.books[0].pk))
+        self.assertEqual(response.json()["title"], "Book 0")
+
+    async def atoken(self, user):
+        return self.token(user)
@@ -0,0 +1,83 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import CommandError, call_command
+from django.test import LiveServerTestCase, SimpleTestCase
+
+from benchmarks import dataset
+from benchmarks.stats import percentile
+from borrowing.models import Borrowing
+
+
+class BenchmarkStatsTests(SimpleTestCase):
+    def test_nearest_rank_percentiles(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 0.50), 50)
+        self.assertEqual(percentile(values, 0.95), 95)
+        self.assertEqual(percentile(values, 0.99), 99)
+        self.assertEqual(percentile([7], 0.99), 7)
+        self.assertIsNone(percentile([], 0.5))
+
+
+class BenchmarkRunTests(LiveServerTestCase):
+    def setUp(self):
+        self.out = StringIO()
+        call_command(
+            "bench_seed", books=20, users=3, borrowings=30, stdout=self.out
+        )
+        self.tmp = Path(tempfile.mkdtemp())
+
+    def run_bench(self, name, *scenarios):
+        path = self.tmp / name
+        args = [f"--scenario={scenario}" for scenario in scenarios]
+        call_command(
+            "bench_run", *args, url=self.live_server_url, concurrency=2,
+            duration=0.3, warmup=0, output=str(path), stderr=StringIO(),
+        )
+        return path
+
+    def test_seed_creates_the_dataset_once(self):
+        self.assertEqual(dataset.bench_books().count(), 20)
+        self.assertEqual(dataset.bench_users().count(), 3)
+        self.assertEqual(
+            Borrowing.objects.filter(user__in=dataset.bench_users()).count(), 30
+        )
+        with self.assertRaises(CommandError):
+            call_command("bench_seed", books=1, users=1, borrowings=1, stdout=self.out)
+
+        call_command(
+            "bench_seed", books=5, users=2, borrowings=3, reset=True, stdout=self.out
+        )
+        self.assertEqual(dataset.bench_books().count(), 5)
+
+    def test_run_reports_latency_throughput_and_queries(self):
+        path = self.run_bench("base.json", "book_detail", "checkout_return")
+        report = json.loads(path.read_text())
+
+        self.assertEqual(report["meta"]["concurrency"], 2)
+        self.assertEqual(
+            set(report["scenarios"]), {"book_detail", "checkout", "return"}
+        )
+        for summary in report["scenarios"].values():
+            self.assertGreater(summary["requests"], 0)
+            self.assertEqual(summary["errors"], 0)
+            self.assertGreater(summary["throughput_rps"], 0)
+            self.assertLessEqual(
+                summary["latency_ms"]["p50"], summary["latency_ms"]["p99"]
+            )
+            self.assertGreaterEqual(summary["queries_per_request"]["max"], 1)
+
+    def test_compare_flags_query_regressions(self):
+        base = self.run_bench("base.json", "token_refresh")
+        report = json.loads(base.read_text())
+        report["scenarios"]["token_refresh"]["queries_per_request"]["mean"] += 1
+        head = self.tmp / "head.json"
+        head.write_text(json.dumps(report))
+
+        out = StringIO()
+        call_command("bench_compare", str(base), str(base), fail=True, stdout=out)
+        self.assertNotIn("REGRESSION", out.getvalue())
+        with self.assertRaisesMessage(CommandError, "queries_per_request.mean"):
+            call_command("bench_compare", str(base), str(head), fail=True, stdout=out)
@@ -0,0 +1,175 @@
+import datetime
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from borrowing.inventory import rebuild_availability
+from borrowing.models import BookAvailability, Borrowing
+from catalog.models import Book
+from catalog.serializers import IdListField
+from catalog.tests.test_borrowings_api import BaseBorrowingTestCase
+
+AVAILABILITY_URL = reverse("catalog:book-availability")
+BULK_URL = reverse("borrowing:borrowing-bulk-create")
+BULK_RETURN_URL = reverse("borrowing:borrowing-bulk-return")
+
+
+def return_url(borrowing_id):
+    return reverse("borrowing:borrowing-return-borrowing", args=[borrowing_id])
+
+
+class AvailabilityCountersTests(BaseBorrowingTestCase):
+    def setUp(self):
+        super().setUp()
+        self.authenticate(self.user)
+        self.today = datetime.date.today()
+
+    def checkout(self, book, days):
+        res = self.client.post(self.url, {
+            "book": book.id,
+            "borrow_date": self.today.isoformat(),
+            "expected_return_date": str(self.today + datetime.timedelta(days=days)),
+        })
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        return res.data["id"]
+
+    def availability(self, book):
+        row = BookAvailability.objects.get(book=book)
+        return row.on_loan, row.next_expected_return
+
+    def due(self, days):
+        return self.today + datetime.timedelta(days=days)
+
+    def test_new_books_start_with_nothing_on_loan(self):
+        self.assertEqual(self.availability(self.book1), (0, None))
+
+    def test_checkout_and_return_update_the_counters(self):
+        first = self.checkout(self.book1, 10)
+        self.checkout(self.book1, 5)
+        self.assertEqual(self.availability(self.book1), (2, self.due(5)))
+
+        self.client.post(return_url(first))
+        self.assertEqual(self.availability(self.book1), (1, self.due(5)))
+
+    def test_return_recomputes_the_next_expected_return(self):
+        soonest = self.checkout(self.book1, 5)
+        self.checkout(self.book1, 10)
+        self.client.post(return_url(soonest))
+        self.assertEqual(self.availability(self.book1), (1, self.due(10)))
+
+    def test_bulk_checkout_and_return(self):
+        items = [
+            {"book": book.id, "borrow_date": str(self.today),
+             "expected_return_date": str(self.due(days))}
+            for book, days in ((self.book1, 7), (self.book1, 3), (self.book2, 4))
+        ]
+        res = self.client.post(BULK_URL, {"items": items}, format="json")
+        self.assertEqual(self.availability(self.book1), (2, self.due(3)))
+        self.assertEqual(self.availability(self.book2), (1, self.due(4)))
+
+        ids = [row["id"] for row in res.data["results"]]
+        self.client.post(BULK_RETURN_URL, {"ids": ids}, format="json")
+        self.assertEqual(self.availability(self.book1), (0, None))
+        self.assertEqual(self.availability(self.book2), (0, None))
+
+    def test_missing_row_is_rebuilt_on_checkout(self):
+        Borrowing.objects.create(
+            user=self.other_user, book=self.book1,
+            borrow_date=self.today, expected_return_date=self.due(2),
+        )
+        BookAvailability.objects.filter(book=self.book1).delete()
+
+        self.checkout(self.book1, 9)
+        self.assertEqual(self.availability(self.book1), (2, self.due(2)))
+
+    def test_reconcile_fixes_drift(self):
+        self.checkout(self.book1, 4)
+        Borrowing.objects.create(
+            user=self.other_user, book=self.book2,
+            borrow_date=self.today, expected_return_date=self.due(6),
+        )
+        BookAvailability.objects.filter(book=self.book1).update(on_loan=7)
+
+        out = StringIO()
+        call_command("reconcile_availability", stdout=out)
+        self.assertIn("Checked 3 books, fixed availability of 2.", out.getvalue())
+        self.assertEqual(self.availability(self.book1), (1, self.due(4)))
+        self.assertEqual(self.availability(self.book2), (1, self.due(6)))
+
+        out = StringIO()
+        call_command("reconcile_availability", stdout=out)
+        self.assertIn("fixed availability of 0.", out.getvalue())
+
+    def test_reconcile_locks_each_batch_of_books(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(rebuild_availability(batch_size=2), (3, 0))
+        locks = [
+            query["sql"] for query in queries.captured_queries
+            if query["sql"].endswith("FOR UPDATE")
+        ]
+        self.assertEqual(len(locks), 2)
+        self.assertTrue(all(Book._meta.db_table in sql for sql in locks))
+
+
+class AvailabilityEndpointTests(BaseBorrowingTestCase):
+    def setUp(self):
+        super().setUp()
+        Borrowing.objects.create(
+            user=self.user, book=self.book1,
+            borrow_date="2025-10-01", expected_return_date="2025-10-10",
+        )
+        call_command("reconcile_availability", stdout=StringIO())
+
+    def test_results_follow_the_requested_order(self):
+        ids = f"{self.book2.id},999999,{self.book1.id},{self.book2.id}"
+        with self.assertNumQueries(1):
+            res = self.client.get(AVAILABILITY_URL, {"ids": ids})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["missing"], [999999])
+        self.assertEqual(res.data["results"], [
+            {"book": self.book2.id, "total_copies": 2, "on_loan": 0,
+             "available": 2, "next_expected_return": None},
+            {"book": self.book1.id, "total_copies": 4, "on_loan": 1,
+             "available": 3, "next_expected_return": "2025-10-10"},
+        ])
+
+    def test_ids_can_be_posted(self):
+        res = self.client.post(
+            AVAILABILITY_URL, {"ids": [self.book1.id, 999999]}, format="json"
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["results"][0]["on_loan"], 1)
+        self.assertEqual(res.data["missing"], [999999])
+
+    def test_books_without_a_row_report_nothing_on_loan(self):
+        book = Book.objects.bulk_create([Book(
+            title="Imported", author="Someone", inventory=4, daily_fee=1
+        )])[0]
+        res = self.client.get(AVAILABILITY_URL, {"ids": book.id})
+        self.assertEqual(res.data["results"][0]["on_loan"], 0)
+        self.assertEqual(res.data["results"][0]["total_copies"], 4)
+
+    def test_rejects_invalid_ids(self):
+        for params in ({}, {"ids": ""}, {"ids": "1,x"}, {"ids": "0"}):
+            with self.subTest(params):
+                res = self.client.get(AVAILABILITY_URL, params)
+                self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_batch_size_is_capped(self):
+        ids = ",".join(str(i) for i in range(1, 1002))
+        res = self.client.get(AVAILABILITY_URL, {"ids": ids})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("ids", res.data)
+
+
+class IdListFieldTests(SimpleTestCase):
+    def test_accepts_lists_and_comma_separated_strings(self):
+        field = IdListField()
+        self.assertEqual(field.run_validation("3, 1,3,,2"), [3, 1, 2])
+        self.assertEqual(field.run_validation([5, "4", 5]), [5, 4])
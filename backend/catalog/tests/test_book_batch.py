@@ -0,0 +1,56 @@
+from django.conf import settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from catalog.models import Book
+
+BATCH_URL = reverse("catalog:book-batch")
+
+
+class BookBatchTests(APITestCase):
+    def setUp(self):
+        self.books = [
+            Book.objects.create(
+                title=f"Book {i}", author=f"Author {i}", cover="SOFT",
+                inventory=i, daily_fee=1,
+            )
+            for i in range(3)
+        ]
+
+    def test_returns_books_in_the_requested_order(self):
+        first, second, third = self.books
+        ids = f"{third.id},999999,{first.id},{third.id}"
+        with self.assertNumQueries(1):
+            res = self.client.get(BATCH_URL, {"ids": ids})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [book["id"] for book in res.data["results"]], [third.id, first.id]
+        )
+        self.assertEqual(res.data["results"][0]["inventory"], 2)
+        self.assertEqual(res.data["missing"], [999999])
+
+    def test_ids_can_be_posted(self):
+        res = self.client.post(
+            BATCH_URL, {"ids": [self.books[1].id, self.books[0].id]}, format="json"
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [book["title"] for book in res.data["results"]], ["Book 1", "Book 0"]
+        )
+        self.assertEqual(res.data["missing"], [])
+
+    def test_rejects_invalid_ids(self):
+        for params in ({}, {"ids": ""}, {"ids": "1,abc"}, {"ids": "-1"}):
+            with self.subTest(params):
+                res = self.client.get(BATCH_URL, params)
+                self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_batch_size_is_capped(self):
+        ids = list(range(1, settings.BOOK_BATCH_MAX_SIZE + 2))
+        res = self.client.post(BATCH_URL, {"ids": ids}, format="json")
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+        res = self.client.post(BATCH_URL, {"ids": ids[:-1]}, format="json")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
@@ -0,0 +1,168 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from catalog import cache
+from catalog.importer import import_books
+from catalog.models import Book
+
+User = get_user_model()
+IMPORT_URL = reverse("catalog:book-import-books")
+
+CSV = (
+    "title,author,cover,inventory,daily_fee\n"
+    "Dune,Frank Herbert,HARD,3,1.50\n"
+    "Emma,Jane Austen,SOFT,2,0.99\n"
+    "Broken,,SOFT,-1,abc\n"
+)
+
+
+class BookImportApiTests(APITestCase):
+    def setUp(self):
+        self.admin_user = User.objects.create_superuser(
+            email="admin@example.com",
+            password="adminpass"
+        )
+        self.client.force_authenticate(user=self.admin_user)
+
+    def upload(self, name, content, **extra):
+        return self.client.post(
+            IMPORT_URL,
+            {"file": SimpleUploadedFile(name, content.encode()), **extra},
+            format="multipart",
+        )
+
+    def test_csv_import_reports_rejected_rows(self):
+        res = self.upload("books.csv", CSV)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["created"], 2)
+        self.assertEqual(res.data["rejected"], 1)
+        error = res.data["errors"][0]
+        self.assertEqual(error["line"], 4)
+        self.assertEqual(
+            set(error["errors"]), {"author", "inventory", "daily_fee"}
+        )
+        self.assertEqual(
+            sorted(Book.objects.values_list("title", flat=True)),
+            ["Dune", "Emma"],
+        )
+
+    def test_jsonl_rows_with_id_update_existing_books(self):
+        book = Book.objects.create(
+            title="Old", author="Someone", cover="SOFT", inventory=1, daily_fee=1
+        )
+        lines = [
+            {"id": book.id, "title": "New", "author": "Someone",
+             "cover": "HARD", "inventory": 7, "daily_fee": "2.00"},
+            {"id": 999999, "title": "Ghost", "author": "Nobody",
+             "cover": "SOFT", "inventory": 1, "daily_fee": "1.00"},
+            "not an object",
+        ]
+        content = "\n".join(json.dumps(line) for line in lines) + "\n{broken\n"
+        res = self.upload("books.jsonl", content)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["updated"], 1)
+        self.assertEqual(res.data["rejected"], 3)
+        self.assertEqual([e["line"] for e in res.data["errors"]], [3, 4, 2])
+        book.refresh_from_db()
+        self.assertEqual((book.title, book.inventory), ("New", 7))
+        self.assertEqual(Book.objects.count(), 1)
+
+    def test_repeated_ids_in_one_batch_are_rejected(self):
+        book = Book.objects.create(
+            title="Old", author="Someone", cover="SOFT", inventory=1, daily_fee=1
+        )
+        lines = [
+            {"id": book.id, "title": title, "author": "Someone",
+             "cover": "HARD", "inventory": 7, "daily_fee": "2.00"}
+            for title in ("First", "Second")
+        ]
+        content = "\n".join(json.dumps(line) for line in lines)
+        res = self.upload("books.jsonl", content)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual((res.data["updated"], res.data["rejected"]), (1, 1))
+        self.assertEqual(res.data["errors"][0]["line"], 2)
+        book.refresh_from_db()
+        self.assertEqual(book.title, "First")
+
+    def test_unknown_format_is_rejected(self):
+        res = self.upload("books.txt", CSV)
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+        res = self.upload("books.txt", CSV, file_format="csv")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_import_is_admin_only(self):
+        user = User.objects.create_user(
+            email="user@example.com",
+            password="userpass"
+        )
+        self.client.force_authenticate(user=user)
+        res = self.upload("books.csv", CSV)
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class ImportBooksCommandTests(APITestCase):
+    def test_command_imports_in_batches_and_lists_rejections(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            source = Path(tmp) / "books.csv"
+            source.write_text(CSV)
+            rejected = Path(tmp) / "rejected.jsonl"
+            out = StringIO()
+
+            call_command(
+                "import_books", str(source),
+                "--batch-size", "2", "--rejected", str(rejected),
+                stdout=out,
+            )
+
+            rows = [json.loads(line) for line in rejected.read_text().splitlines()]
+
+        self.assertEqual(Book.objects.count(), 2)
+        self.assertEqual([row["line"] for row in rows], [4])
+        progress = out.getvalue().splitlines()
+        self.assertEqual(progress[0].split(" ")[0], "2")
+        self.assertIn("Imported 2 books, rejected 1.", progress[-1])
+
+    def test_stdin_is_read_but_left_open(self):
+        stdin = StringIO(CSV)
+        with mock.patch("sys.stdin", stdin):
+            call_command(
+                "import_books", "-", "--format", "csv",
+                stdout=StringIO(), stderr=StringIO(),
+            )
+        self.assertFalse(stdin.closed)
+        self.assertEqual(Book.objects.count(), 2)
+
+    def test_unreadable_paths_raise_command_error(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            missing = str(Path(tmp) / "missing.csv")
+            with self.assertRaisesMessage(CommandError, "Cannot open"):
+                call_command("import_books", missing, stdout=StringIO())
+
+            source = Path(tmp) / "books.csv"
+            source.write_text(CSV)
+            with self.assertRaisesMessage(CommandError, "Cannot open"):
+                call_command(
+                    "import_books", str(source), "--rejected", tmp,
+                    stdout=StringIO(),
+                )
+        self.assertFalse(Book.objects.exists())
+
+    def test_cache_is_invalidated_by_each_committed_batch(self):
+        stream = StringIO(CSV + "Ulysses,James Joyce,HARD,1,2.00\n")
+        with self.captureOnCommitCallbacks() as callbacks:
+            import_books(stream, "csv", batch_size=2)
+        self.assertEqual(callbacks, [cache.bump_version] * 2)
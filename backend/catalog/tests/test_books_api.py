@@ -1,4 +1,8 @@
+import base64
+import json
+
 from django.contrib.auth import get_user_model
+from django.db import connection
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
@@ -61,3 +65,187 @@ class BookApiTests(APITestCase):
         response = self.client.delete(url)
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
         self.assertEqual(Book.objects.count(), 0)
+
+
+class BookKeysetPaginationTests(APITestCase):
+    def setUp(self):
+        for i in range(12):
+            Book.objects.create(
+                title=f"Book {i}",
+                author=f"Author {i % 3}",
+                cover="SOFT",
+                inventory=1,
+                daily_fee=1,
+            )
+        self.expected = list(
+            Book.objects.order_by("author", "id").values_list("id", flat=True)
+        )
+
+    def test_walks_every_book_once_in_author_order(self):
+        seen = []
+        url = f"{BOOK_URL}?pagination=keyset"
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn("count", response.data)
+            seen += [book["id"] for book in response.data["results"]]
+            url = response.data["next"]
+        self.assertEqual(seen, self.expected)
+
+    def test_previous_link_returns_the_preceding_page(self):
+        first = self.client.get(BOOK_URL, {"pagination": "keyset"})
+        second = self.client.get(first.data["next"])
+        back = self.client.get(second.data["previous"])
+        self.assertEqual(back.data["results"], first.data["results"])
+        self.assertIsNone(back.data["previous"])
+
+    def test_deep_page_is_a_single_query(self):
+        url = f"{BOOK_URL}?pagination=keyset"
+        for _ in range(2):
+            url = self.client.get(url).data["next"]
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEqual(
+            [book["id"] for book in response.data["results"]],
+            self.expected[10:12],
+        )
+
+    def test_invalid_cursor_returns_404(self):
+        response = self.client.get(
+            BOOK_URL, {"pagination": "keyset", "cursor": "garbage"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_tampered_cursor_returns_404(self):
+        admin = User.objects.create_superuser(
+            email="admin@example.com", password="password123"
+        )
+        self.client.force_authenticate(admin)
+        for url, position in (
+            (BOOK_URL, ["A", "x"]),
+            (BOOK_URL, [None, 1]),
+            (BOOK_URL, [["A"], {"id": 1}]),
+            (reverse("borrowing:borrowing-list"), ["notadate", 1]),
+        ):
+            payload = json.dumps({"p": position, "r": False}).encode()
+            cursor = base64.urlsafe_b64encode(payload).decode()
+            response = self.client.get(url, {"pagination": "keyset", "cursor": cursor})
+            self.assertEqual(
+                response.status_code, status.HTTP_404_NOT_FOUND, position
+            )
+
+
+class BookConditionalGetTests(APITestCase):
+    def setUp(self):
+        self.book = Book.objects.create(
+            title="Test Book",
+            author="John Doe",
+            cover="HARD",
+            inventory=3,
+            daily_fee=1.99,
+        )
+        self.detail_url = reverse("catalog:book-detail", args=[self.book.id])
+
+    def test_list_and_detail_send_validators(self):
+        for url in (BOOK_URL, self.detail_url):
+            response = self.client.get(url)
+            self.assertTrue(response["ETag"].startswith('W/"'))
+        self.assertNotIn("Last-Modified", self.client.get(BOOK_URL))
+        self.assertIn("Last-Modified", self.client.get(self.detail_url))
+
+    def test_matching_etag_returns_304_without_fetching_rows(self):
+        etag = self.client.get(BOOK_URL)["ETag"]
+        with self.assertNumQueries(1):
+            response = self.client.get(BOOK_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_update_changes_etag(self):
+        etag = self.client.get(self.detail_url)["ETag"]
+        self.book.inventory = 1
+        self.book.save()
+
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["inventory"], 1)
+
+    def test_malformed_ids_return_404(self):
+        admin = User.objects.create_superuser(
+            email="admin@example.com", password="password123"
+        )
+        self.client.force_authenticate(admin)
+        for url in (
+            reverse("catalog:book-detail", args=["abc"]),
+            reverse("borrowing:borrowing-detail", args=["abc"]),
+        ):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND, url)
+
+    def test_etag_differs_per_page(self):
+        first = self.client.get(BOOK_URL, {"offset": 0})
+        second = self.client.get(BOOK_URL, {"offset": 5})
+        self.assertNotEqual(first["ETag"], second["ETag"])
+
+
+class BookSearchTests(APITestCase):
+    def setUp(self):
+        for title, author in (
+            ("Dune", "Frank Herbert"),
+            ("Children of Dune", "Frank Herbert"),
+            ("Emma", "Jane Austen"),
+            ("Persuasion", "Jane Austen"),
+        ):
+            Book.objects.create(
+                title=title, author=author, cover="SOFT", inventory=1, daily_fee=1
+            )
+
+    def search(self, term):
+        response = self.client.get(BOOK_URL, {"search": term})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [book["title"] for book in response.data["results"]]
+
+    def test_search_matches_title_words_best_first(self):
+        self.assertEqual(self.search("dune"), ["Dune", "Children of Dune"])
+
+    def test_search_matches_author(self):
+        self.assertEqual(self.search("austen"), ["Emma", "Persuasion"])
+
+    def test_search_tolerates_typos_in_author(self):
+        self.assertEqual(set(self.search("Frank Herbrt")), {"Dune", "Children of Dune"})
+
+    def test_admin_search_keeps_rank_order(self):
+        admin = User.objects.create_superuser(
+            email="admin@example.com", password="password123"
+        )
+        self.client.force_login(admin)
+        url = reverse("admin:catalog_book_changelist")
+
+        response = self.client.get(url, {"q": "dune"})
+        self.assertEqual(
+            [book.title for book in response.context["cl"].result_list],
+            ["Dune", "Children of Dune"],
+        )
+        response = self.client.get(url, {"q": "dune", "o": "1"})
+        self.assertEqual(
+            [book.title for book in response.context["cl"].result_list],
+            ["Children of Dune", "Dune"],
+        )
+
+    def test_search_is_served_by_gin_indexes(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        plan = Book.objects.search("herbert").explain()
+        self.assertIn("book_search_idx", plan)
+        self.assertIn("book_author_trgm_idx", plan)
+
+    def test_admin_search_uses_full_text_search(self):
+        admin_user = User.objects.create_superuser(
+            email="admin@example.com",
+            password="adminpass"
+        )
+        self.client.force_login(admin_user)
+        response = self.client.get(
+            reverse("admin:catalog_book_changelist"), {"q": "Frank Herbrt"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.context["cl"].result_count, 2)
@@ -0,0 +1,108 @@
+from django.db import connection
+from django.test import tag
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from borrowing.models import Borrowing
+from catalog.models import Book
+from user.models import User
+
+BORROWING_URL = reverse("borrowing:borrowing-list")
+
+USERS = 10_000
+BOOKS = 100
+BORROWINGS = 1_000_000
+SEQ_SCAN = f"Seq Scan on {Borrowing._meta.db_table}"
+
+
+@tag("slow")
+class ActiveBorrowingIndexTests(APITestCase):
+    """
+    Seed a realistically sized borrowing table (2% of loans still active)
+    and check that the active-loan queries issued by the API are planned
+    on the partial indexes rather than a sequential scan.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {User._meta.db_table} (
+                    password, is_superuser, first_name, last_name,
+                    is_staff, is_active, date_joined, email, updated_at
+                )
+                SELECT '', false, '', '', false, true, now(),
+                       'seed' || g || '@example.com', now()
+                FROM generate_series(1, %s) AS g
+                """,
+                [USERS],
+            )
+            cursor.execute(
+                f"""
+                INSERT INTO {Book._meta.db_table} (
+                    title, author, cover, inventory, daily_fee, updated_at
+                )
+                SELECT 'Book ' || g, 'Author ' || g, 'SOFT', 10, 1, now()
+                FROM generate_series(1, %s) AS g
+                """,
+                [BOOKS],
+            )
+            cursor.execute(
+                f"""
+                INSERT INTO {Borrowing._meta.db_table} (
+                    borrow_date, expected_return_date, actual_return_date,
+                    book_id, user_id, updated_at
+                )
+                SELECT d, d + 14,
+                       CASE WHEN g %% 47 = 0 THEN NULL ELSE d + 7 END,
+                       (SELECT min(id) FROM {Book._meta.db_table}) + g %% %s,
+                       (SELECT min(id) FROM {User._meta.db_table}) + g %% %s,
+                       now()
+                FROM generate_series(1, %s) AS g,
+                     LATERAL (SELECT date '2020-01-01' + g %% 1500 AS d) AS dates
+                """,
+                [BOOKS, USERS, BORROWINGS],
+            )
+            for model in (User, Book, Borrowing):
+                cursor.execute(f"ANALYZE {model._meta.db_table}")
+
+        cls.user = User.objects.get(email="seed1@example.com")
+        cls.book = Book.objects.order_by("id").first()
+
+    def assertNoSequentialScan(self, sql):
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN {sql}")
+            plan = "\n".join(row[0] for row in cursor.fetchall())
+        self.assertNotIn(SEQ_SCAN, plan, f"{sql}\n\n{plan}")
+
+    def assertListAvoidsSequentialScan(self, params):
+        self.client.force_authenticate(user=self.user)
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(BORROWING_URL, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res.data["results"])
+
+        selects = [
+            query["sql"] for query in queries.captured_queries
+            if query["sql"].startswith("SELECT")
+        ]
+        self.assertTrue(selects)
+        for sql in selects:
+            self.assertNoSequentialScan(sql)
+
+    def test_active_borrowings_list_uses_index(self):
+        self.assertListAvoidsSequentialScan({"is_active": "true"})
+
+    def test_active_borrowings_keyset_page_uses_index(self):
+        self.assertListAvoidsSequentialScan(
+            {"is_active": "true", "pagination": "keyset"}
+        )
+
+    def test_active_borrowings_of_a_book_use_index(self):
+        queryset = Borrowing.objects.filter(
+            book=self.book, actual_return_date__isnull=True
+        )
+        self.assertNotIn(SEQ_SCAN, queryset.explain())
@@ -100,6 +100,72 @@ class BorrowingReadOnlyTests(BaseBorrowingTestCase):
         results = res.data["results"]
         self.assertTrue(all(b["actual_return_date"] is None for b in results))
 
+    def test_keyset_pagination_orders_by_latest_borrow_date(self):
+        self.authenticate(self.admin_user)
+        res = self.client.get(self.url, {"pagination": "keyset", "limit": 1})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotIn("count", res.data)
+        self.assertEqual(res.data["results"][0]["id"], self.borrowing2.id)
+
+        res = self.client.get(res.data["next"])
+        self.assertEqual(res.data["results"][0]["id"], self.borrowing1.id)
+        self.assertIsNone(res.data["next"])
+
+    def test_list_answers_matching_etag_with_304(self):
+        self.authenticate(self.user)
+        etag = self.client.get(self.url)["ETag"]
+        res = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_etag_is_per_user(self):
+        self.authenticate(self.user)
+        etag = self.client.get(self.url)["ETag"]
+        self.authenticate(self.other_user)
+        res = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_list_is_not_revalidated_by_date_after_a_loan_leaves(self):
+        self.authenticate(self.admin_user)
+        Borrowing.objects.create(
+            user=self.other_user, book=self.book2,
+            borrow_date="2025-10-06", expected_return_date="2025-10-16",
+        )
+        res = self.client.get(self.url, {"is_active": "true"})
+        self.assertEqual(res.data["count"], 2)
+        self.assertNotIn("Last-Modified", res)
+
+        self.client.post(
+            reverse("borrowing:borrowing-return-borrowing", args=[self.borrowing1.id])
+        )
+        res = self.client.get(
+            self.url, {"is_active": "true"},
+            HTTP_IF_MODIFIED_SINCE="Fri, 01 Jan 2100 00:00:00 GMT",
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["count"], 1)
+
+    def test_borrower_changes_change_the_etags(self):
+        self.authenticate(self.user)
+        url = reverse("borrowing:borrowing-detail", args=[self.borrowing1.id])
+        etags = {u: self.client.get(u)["ETag"] for u in (self.url, url)}
+        self.user.first_name = "Renamed"
+        self.user.save()
+
+        for u, etag in etags.items():
+            res = self.client.get(u, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(res.status_code, status.HTTP_200_OK, u)
+
+    def test_return_changes_detail_etag(self):
+        self.authenticate(self.user)
+        url = reverse("borrowing:borrowing-detail", args=[self.borrowing1.id])
+        etag = self.client.get(url)["ETag"]
+        self.client.post(
+            reverse("borrowing:borrowing-return-borrowing", args=[self.borrowing1.id])
+        )
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIsNotNone(res.data["actual_return_date"])
+
 
 class BorrowingCreateTests(BaseBorrowingTestCase):
     def test_create_borrowing_success(self):
@@ -177,6 +243,13 @@ class BorrowingReturnTests(BaseBorrowingTestCase):
         self.assertIn("error", res.data)
         self.assertEqual(res.data["error"], "This borrowing has already been returned.")
 
+    def test_return_runs_a_fixed_number_of_queries(self):
+        """Lookup, savepoint, two conditional updates, availability, release"""
+        self.authenticate(self.user)
+        with self.assertNumQueries(6):
+            res = self.client.post(self.url_return)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
     def test_unauthenticated_user_cannot_return(self):
         """Non-authenticated users cannot return a borrowing"""
         res = self.client.post(self.url_return)
@@ -0,0 +1,151 @@
+from django.conf import settings
+from django.urls import reverse
+from rest_framework import status
+
+from borrowing.models import Borrowing
+from catalog.tests.test_borrowings_api import BaseBorrowingTestCase
+
+BULK_URL = reverse("borrowing:borrowing-bulk-create")
+BULK_RETURN_URL = reverse("borrowing:borrowing-bulk-return")
+
+
+def item(book, borrow_date="2025-10-20", expected_return_date="2025-10-25"):
+    return {
+        "book": book.id,
+        "borrow_date": borrow_date,
+        "expected_return_date": expected_return_date,
+    }
+
+
+class BulkCheckoutTests(BaseBorrowingTestCase):
+    def test_bulk_checkout_creates_all_borrowings(self):
+        self.authenticate(self.user)
+        payload = {"items": [item(self.book1), item(self.book1), item(self.book2)]}
+        res = self.client.post(BULK_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(res.data["results"]), 3)
+        self.assertTrue(all(r["id"] for r in res.data["results"]))
+        self.book1.refresh_from_db()
+        self.book2.refresh_from_db()
+        self.assertEqual(self.book1.inventory, 1)
+        self.assertEqual(self.book2.inventory, 1)
+        self.assertEqual(Borrowing.objects.filter(user=self.user).count(), 3)
+
+    def test_query_count_does_not_grow_with_items(self):
+        self.authenticate(self.user)
+        # stock check, savepoint, inventory update, insert, availability,
+        # release
+        with self.assertNumQueries(6):
+            self.client.post(
+                BULK_URL,
+                {"items": [item(self.book1)] * 3 + [item(self.book2)] * 2},
+                format="json",
+            )
+
+    def test_one_bad_item_rejects_the_whole_batch(self):
+        self.authenticate(self.user)
+        payload = {"items": [item(self.book1), item(self.book_out_of_stock)]}
+        res = self.client.post(BULK_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data["items"][0], {})
+        self.assertEqual(
+            res.data["items"][1]["book"][0], "This book is out of stock."
+        )
+        self.book1.refresh_from_db()
+        self.assertEqual(self.book1.inventory, 3)
+        self.assertFalse(Borrowing.objects.exists())
+
+    def test_invalid_dates_are_reported_per_item(self):
+        self.authenticate(self.user)
+        payload = {"items": [
+            item(self.book1),
+            item(self.book2, expected_return_date="2025-10-01"),
+        ]}
+        res = self.client.post(BULK_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data["items"][0], {})
+        self.assertIn("expected_return_date", res.data["items"][1])
+
+    def test_requesting_more_copies_than_in_stock_fails(self):
+        self.authenticate(self.user)
+        res = self.client.post(
+            BULK_URL, {"items": [item(self.book2)] * 3}, format="json"
+        )
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data["items"][:2], [{}, {}])
+        self.assertIn("book", res.data["items"][2])
+
+    def test_batch_size_is_limited(self):
+        self.authenticate(self.user)
+        res = self.client.post(
+            BULK_URL,
+            {"items": [item(self.book1)] * (settings.BORROWING_BULK_MAX_ITEMS + 1)},
+            format="json",
+        )
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class BulkReturnTests(BaseBorrowingTestCase):
+    def setUp(self):
+        super().setUp()
+        self.borrowings = [
+            Borrowing.objects.create(
+                user=self.user,
+                book=book,
+                borrow_date="2025-10-10",
+                expected_return_date="2025-10-20"
+            )
+            for book in (self.book1, self.book1, self.book2)
+        ]
+        self.ids = [b.id for b in self.borrowings]
+
+    def test_bulk_return_restocks_every_book(self):
+        self.authenticate(self.user)
+        # lookup, savepoint, borrowing update, inventory update,
+        # availability, release
+        with self.assertNumQueries(6):
+            res = self.client.post(BULK_RETURN_URL, {"ids": self.ids}, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([r["id"] for r in res.data["results"]], self.ids)
+        self.book1.refresh_from_db()
+        self.book2.refresh_from_db()
+        self.assertEqual(self.book1.inventory, 5)
+        self.assertEqual(self.book2.inventory, 3)
+        self.assertFalse(
+            Borrowing.objects.filter(actual_return_date__isnull=True).exists()
+        )
+
+    def test_errors_are_reported_per_item(self):
+        foreign = Borrowing.objects.create(
+            user=self.other_user,
+            book=self.book2,
+            borrow_date="2025-10-10",
+            expected_return_date="2025-10-20"
+        )
+        self.authenticate(self.user)
+        self.client.post(BULK_RETURN_URL, {"ids": self.ids[:1]}, format="json")
+
+        res = self.client.post(
+            BULK_RETURN_URL, {"ids": [self.ids[0], self.ids[1], foreign.id]},
+            format="json",
+        )
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data["ids"], [
+            ["This borrowing has already been returned."],
+            [],
+            ["Not found."],
+        ])
+        self.assertFalse(
+            Borrowing.objects.get(pk=self.ids[1]).actual_return_date
+        )
+
+    def test_duplicate_ids_are_rejected(self):
+        self.authenticate(self.user)
+        res = self.client.post(
+            BULK_RETURN_URL, {"ids": [self.ids[0], self.ids[0]]}, format="json"
+        )
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,84 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connection
+from django.test import TransactionTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from borrowing.models import Borrowing
+from catalog.models import Book
+from user.models import User
+
+BORROWING_URL = reverse("borrowing:borrowing-list")
+
+CHECKOUTS = 200
+WORKERS = 20
+INVENTORY = 50
+
+
+class ConcurrentInventoryTests(TransactionTestCase):
+    """Checkouts and returns run on separate connections and really commit."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="user@example.com",
+            password="password123"
+        )
+        self.book = Book.objects.create(
+            title="Popular Book",
+            author="Author",
+            cover="HARD",
+            inventory=INVENTORY,
+            daily_fee=1
+        )
+
+    def post(self, url, data=None):
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        try:
+            return client.post(url, data, format="json").status_code
+        finally:
+            connection.close()
+
+    def checkout(self, _):
+        return self.post(
+            BORROWING_URL,
+            {
+                "borrow_date": "2025-10-20",
+                "expected_return_date": "2025-10-25",
+                "book": self.book.id,
+            },
+        )
+
+    def test_parallel_checkouts_do_not_oversell(self):
+        with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+            codes = list(pool.map(self.checkout, range(CHECKOUTS)))
+
+        self.book.refresh_from_db()
+        self.assertEqual(codes.count(status.HTTP_201_CREATED), INVENTORY)
+        self.assertEqual(
+            codes.count(status.HTTP_400_BAD_REQUEST), CHECKOUTS - INVENTORY
+        )
+        self.assertEqual(self.book.inventory, 0)
+        self.assertEqual(
+            Borrowing.objects.filter(book=self.book).count(), INVENTORY
+        )
+
+    def test_parallel_returns_restock_exactly_once(self):
+        borrowing = Borrowing.objects.create(
+            user=self.user,
+            book=self.book,
+            borrow_date="2025-10-10",
+            expected_return_date="2025-10-20"
+        )
+        url = reverse(
+            "borrowing:borrowing-return-borrowing", args=[borrowing.id]
+        )
+
+        with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+            codes = list(pool.map(lambda _: self.post(url), range(WORKERS)))
+
+        self.book.refresh_from_db()
+        self.assertEqual(codes.count(status.HTTP_200_OK), 1)
+        self.assertEqual(self.book.inventory, INVENTORY + 1)
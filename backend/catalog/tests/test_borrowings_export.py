@@ -0,0 +1,66 @@
+import csv
+import io
+import json
+
+from django.urls import reverse
+from rest_framework import status
+
+from borrowing.models import Borrowing
+from catalog.tests.test_borrowings_api import BaseBorrowingTestCase
+
+EXPORT_URL = reverse("borrowing:borrowing-export")
+
+
+class BorrowingExportTests(BaseBorrowingTestCase):
+    def setUp(self):
+        super().setUp()
+        self.active = Borrowing.objects.create(
+            user=self.user,
+            book=self.book1,
+            borrow_date="2025-10-01",
+            expected_return_date="2025-10-10"
+        )
+        self.returned = Borrowing.objects.create(
+            user=self.other_user,
+            book=self.book2,
+            borrow_date="2025-10-05",
+            expected_return_date="2025-10-15",
+            actual_return_date="2025-10-12"
+        )
+
+    def export(self, **params):
+        res = self.client.get(EXPORT_URL, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return b"".join(res.streaming_content).decode()
+
+    def test_csv_export_contains_all_rows(self):
+        self.authenticate(self.admin_user)
+        rows = list(csv.DictReader(io.StringIO(self.export())))
+
+        self.assertEqual([int(r["id"]) for r in rows], [self.active.id, self.returned.id])
+        self.assertEqual(rows[0]["book_title"], "Book 1")
+        self.assertEqual(rows[0]["user_email"], self.user.email)
+        self.assertEqual(rows[0]["actual_return_date"], "")
+        self.assertEqual(rows[1]["actual_return_date"], "2025-10-12")
+
+    def test_ndjson_export_honours_filters(self):
+        self.authenticate(self.admin_user)
+        content = self.export(
+            export_format="ndjson", user_id=self.user.id, is_active="true"
+        )
+        rows = [json.loads(line) for line in content.splitlines()]
+
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["id"], self.active.id)
+        self.assertIsNone(rows[0]["actual_return_date"])
+        self.assertEqual(rows[0]["borrow_date"], "2025-10-01")
+
+    def test_unknown_format_is_rejected(self):
+        self.authenticate(self.admin_user)
+        res = self.client.get(EXPORT_URL, {"export_format": "xml"})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_is_staff_only(self):
+        self.authenticate(self.user)
+        res = self.client.get(EXPORT_URL)
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
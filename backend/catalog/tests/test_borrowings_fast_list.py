@@ -0,0 +1,113 @@
+import datetime
+from decimal import Decimal
+from io import StringIO
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from borrowing.models import Borrowing
+from borrowing.serializers import (
+    BorrowingListSerializer,
+    BorrowingListFastSerializer,
+)
+from catalog.mixins import ValuesSerializerMixin
+from catalog.models import Book
+from user.models import User
+
+
+class BorrowingFastListTests(APITestCase):
+    def setUp(self):
+        self.admin_user = User.objects.create_superuser(
+            email="admin@example.com", password="admin123"
+        )
+        users = [
+            User.objects.create_user(
+                email=f"user{i}@example.com",
+                password="password123",
+                first_name=f"First {i}",
+                last_name="" if i % 2 else f"Last {i}",
+            )
+            for i in range(3)
+        ]
+        books = [
+            Book.objects.create(
+                title=f"Book {i} été",
+                author=f"Author {i}",
+                cover="HARD" if i % 2 else "SOFT",
+                inventory=i,
+                daily_fee=Decimal("0.50") * (i + 1),
+            )
+            for i in range(4)
+        ]
+        start = datetime.date(2024, 1, 1)
+        for i in range(12):
+            borrow_date = start + datetime.timedelta(days=i % 5)
+            Borrowing.objects.create(
+                user=users[i % 3],
+                book=books[i % 4],
+                borrow_date=borrow_date,
+                expected_return_date=borrow_date + datetime.timedelta(days=7),
+                actual_return_date=(
+                    borrow_date + datetime.timedelta(days=3) if i % 3 == 0 else None
+                ),
+            )
+        self.url = reverse("borrowing:borrowing-list")
+        self.client.force_authenticate(self.admin_user)
+
+    def fetch(self, params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return response.content
+
+    def test_fast_rows_render_like_model_instances(self):
+        queryset = Borrowing.objects.select_related(
+            "book", "user"
+        ).with_charges().order_by("id")
+        rows = queryset.values(*BorrowingListFastSerializer.values_fields())
+
+        slow = BorrowingListSerializer(queryset, many=True).data
+        fast = BorrowingListFastSerializer(rows, many=True).data
+
+        self.assertEqual(JSONRenderer().render(fast), JSONRenderer().render(slow))
+
+    def test_list_responses_are_byte_identical(self):
+        for params in (
+            {"limit": 100},
+            {"limit": 4, "offset": 4},
+            {"is_active": "true"},
+            {"pagination": "keyset", "limit": 5},
+        ):
+            with self.subTest(params=params):
+                fast = self.fetch(params)
+                with override_settings(BORROWING_FAST_LIST=False):
+                    slow = self.fetch(params)
+                self.assertEqual(fast, slow)
+
+    def test_fast_list_runs_no_extra_queries(self):
+        with self.assertNumQueries(3):
+            self.fetch({"limit": 100})
+
+    def test_method_fields_must_be_declared(self):
+        class UndeclaredSerializer(
+            ValuesSerializerMixin, BorrowingListSerializer
+        ):
+            pass
+
+        with self.assertRaises(ImproperlyConfigured):
+            UndeclaredSerializer.values_fields()
+
+    def test_plan_is_compiled_once_per_class(self):
+        plan = BorrowingListFastSerializer.values_plan()
+        self.assertIs(BorrowingListFastSerializer.values_plan(), plan)
+        self.assertNotIn("_values_plan", vars(ValuesSerializerMixin))
+        self.assertIsInstance(BorrowingListFastSerializer(), serializers.Serializer)
+
+    def test_benchmark_command_runs_both_serializers(self):
+        out = StringIO()
+        call_command("benchmark_borrowing_list", rows=5, repeat=1, stdout=out)
+        self.assertIn("Outputs are byte-identical.", out.getvalue())
@@ -0,0 +1,156 @@
+import datetime
+from decimal import Decimal
+
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from borrowing.models import Borrowing
+from catalog.models import Book
+from user.models import User
+
+
+def days_ago(days):
+    return timezone.now().date() - datetime.timedelta(days=days)
+
+
+class BaseFeesTestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="user@example.com", password="password123"
+        )
+        self.other_user = User.objects.create_user(
+            email="other@example.com", password="password123"
+        )
+        self.admin_user = User.objects.create_superuser(
+            email="admin@example.com", password="admin123"
+        )
+        self.book = Book.objects.create(
+            title="Book 1", author="Author 1", cover="HARD",
+            inventory=5, daily_fee=Decimal("1.50"),
+        )
+        self.other_book = Book.objects.create(
+            title="Book 2", author="Author 2", cover="SOFT",
+            inventory=5, daily_fee=Decimal("2.00"),
+        )
+        # Borrowed 8 days ago, due 3 days ago.
+        self.overdue = Borrowing.objects.create(
+            user=self.user, book=self.book,
+            borrow_date=days_ago(8), expected_return_date=days_ago(3),
+        )
+        # Borrowed today, due next week.
+        self.fresh = Borrowing.objects.create(
+            user=self.user, book=self.other_book,
+            borrow_date=days_ago(0), expected_return_date=days_ago(-7),
+        )
+        self.returned = Borrowing.objects.create(
+            user=self.other_user, book=self.other_book,
+            borrow_date=days_ago(20), expected_return_date=days_ago(15),
+            actual_return_date=days_ago(10), fee=Decimal("20.00"),
+            fine=Decimal("20.00"),
+        )
+
+    def detail(self, borrowing):
+        self.client.force_authenticate(self.admin_user)
+        url = reverse("borrowing:borrowing-detail", args=[borrowing.id])
+        return self.client.get(url).data
+
+
+class BorrowingFeesTests(BaseFeesTestCase):
+    def test_active_loans_report_accrued_charges(self):
+        data = self.detail(self.overdue)
+        self.assertEqual(data["fee"], "12.00")
+        self.assertEqual(data["fine"], "9.00")
+        self.assertEqual(data["overdue_days"], 3)
+
+        data = self.detail(self.fresh)
+        self.assertEqual(data["fee"], "2.00")
+        self.assertEqual(data["fine"], "0.00")
+        self.assertEqual(data["overdue_days"], 0)
+
+    def test_returned_loans_report_stored_charges(self):
+        Book.objects.filter(pk=self.other_book.pk).update(daily_fee=100)
+        data = self.detail(self.returned)
+        self.assertEqual(data["fee"], "20.00")
+        self.assertEqual(data["fine"], "20.00")
+
+    def test_list_exposes_charges(self):
+        self.client.force_authenticate(self.user)
+        res = self.client.get(reverse("borrowing:borrowing-list"))
+        charges = {row["id"]: row["fine"] for row in res.data["results"]}
+        self.assertEqual(charges, {self.overdue.id: "9.00", self.fresh.id: "0.00"})
+
+    def test_return_stores_fee_and_fine(self):
+        self.client.force_authenticate(self.user)
+        self.client.post(
+            reverse("borrowing:borrowing-return-borrowing", args=[self.overdue.id])
+        )
+        self.overdue.refresh_from_db()
+        self.assertEqual(self.overdue.fee, Decimal("12.00"))
+        self.assertEqual(self.overdue.fine, Decimal("9.00"))
+
+    @override_settings(BORROWING_OVERDUE_FINE_MULTIPLIER=Decimal("0.5"))
+    def test_bulk_return_stores_fee_and_fine(self):
+        self.client.force_authenticate(self.user)
+        res = self.client.post(
+            reverse("borrowing:borrowing-bulk-return"),
+            {"ids": [self.overdue.id, self.fresh.id]},
+            format="json",
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.overdue.refresh_from_db()
+        self.fresh.refresh_from_db()
+        self.assertEqual(self.overdue.fine, Decimal("2.25"))
+        self.assertEqual(self.fresh.fee, Decimal("2.00"))
+        self.assertEqual(self.fresh.fine, Decimal("0.00"))
+
+
+class BorrowingFeesReportTests(BaseFeesTestCase):
+    url = reverse("borrowing:borrowing-fees")
+
+    def test_totals_per_user_in_one_grouped_query(self):
+        self.client.force_authenticate(self.admin_user)
+        with self.assertNumQueries(2):
+            res = self.client.get(self.url, {"limit": 10})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["results"], [
+            {
+                "borrowings": 2, "overdue": 1, "fees": "14.00",
+                "fines": "9.00", "user": self.user.id,
+                "email": self.user.email,
+            },
+            {
+                "borrowings": 1, "overdue": 1, "fees": "20.00",
+                "fines": "20.00", "user": self.other_user.id,
+                "email": self.other_user.email,
+            },
+        ])
+
+    def test_totals_per_book(self):
+        self.client.force_authenticate(self.admin_user)
+        res = self.client.get(self.url, {"group_by": "book", "is_active": "true"})
+        self.assertEqual(
+            [(row["title"], row["fees"], row["fines"]) for row in res.data["results"]],
+            [("Book 1", "12.00", "9.00"), ("Book 2", "2.00", "0.00")],
+        )
+
+    def test_keyset_request_keeps_limit_offset_pages(self):
+        self.client.force_authenticate(self.admin_user)
+        res = self.client.get(self.url, {"pagination": "keyset", "limit": 1})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["count"], 2)
+        self.assertEqual(
+            [row["user"] for row in res.data["results"]], [self.user.id]
+        )
+
+    def test_unknown_group_is_rejected(self):
+        self.client.force_authenticate(self.admin_user)
+        res = self.client.get(self.url, {"group_by": "cover"})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_staff_only(self):
+        self.client.force_authenticate(self.user)
+        res = self.client.get(self.url)
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,93 @@
+import datetime
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+
+from borrowing.models import Borrowing, OverdueNotification
+from borrowing.overdue import overdue_candidates, sweep_overdue
+from catalog.models import Book
+from user.models import User
+
+TODAY = datetime.date(2025, 6, 1)
+
+
+class OverdueSweepTests(TestCase):
+    def setUp(self):
+        user = User.objects.create_user(
+            email="user@example.com", password="password123"
+        )
+        book = Book.objects.create(
+            title="Book", author="Author", cover="SOFT", inventory=10, daily_fee=1
+        )
+
+        def loan(due, returned=None):
+            return Borrowing.objects.create(
+                user=user,
+                book=book,
+                borrow_date=datetime.date(2025, 5, 1),
+                expected_return_date=due,
+                actual_return_date=returned,
+            )
+
+        self.overdue = [loan(datetime.date(2025, 5, day)) for day in (20, 10, 10, 31)]
+        self.due_today = loan(TODAY)
+        self.returned_late = loan(
+            datetime.date(2025, 5, 10), returned=datetime.date(2025, 5, 15)
+        )
+
+    def test_flags_overdue_loans_and_queues_notifications(self):
+        report = sweep_overdue(TODAY, chunk_size=3)
+
+        self.assertEqual(report.flagged, 4)
+        self.assertEqual(report.chunks, 2)
+        flagged = Borrowing.objects.filter(overdue_since=TODAY)
+        self.assertCountEqual(flagged, self.overdue)
+        self.assertCountEqual(
+            OverdueNotification.objects.values_list("borrowing_id", flat=True),
+            [borrowing.id for borrowing in self.overdue],
+        )
+
+    def test_rerun_only_flags_newly_overdue_loans(self):
+        sweep_overdue(TODAY)
+        self.assertEqual(sweep_overdue(TODAY).flagged, 0)
+
+        tomorrow = TODAY + datetime.timedelta(days=1)
+        report = sweep_overdue(tomorrow)
+
+        self.assertEqual(report.flagged, 1)
+        self.assertEqual(OverdueNotification.objects.count(), 5)
+        self.assertEqual(
+            list(Borrowing.objects.filter(overdue_since=tomorrow)), [self.due_today]
+        )
+
+    def test_interrupted_sweep_resumes(self):
+        # A run that stopped after one chunk already committed it.
+        Borrowing.objects.filter(pk=self.overdue[1].pk).update(overdue_since=TODAY)
+        OverdueNotification.objects.create(borrowing=self.overdue[1])
+
+        report = sweep_overdue(TODAY, chunk_size=2)
+
+        self.assertEqual(report.flagged, 3)
+        self.assertEqual(OverdueNotification.objects.count(), 4)
+
+    def test_each_chunk_costs_a_fixed_number_of_queries(self):
+        # SAVEPOINT, select, update, insert and RELEASE per chunk, then a
+        # last select that finds nothing left after the full second chunk.
+        with self.assertNumQueries(5 * 2 + 3):
+            sweep_overdue(TODAY, chunk_size=2)
+
+    def test_candidates_are_read_from_the_partial_index(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        plan = overdue_candidates(TODAY).order_by(
+            "expected_return_date", "id"
+        ).explain()
+        self.assertIn("borrowing_overdue_sweep_idx", plan)
+
+    def test_command_reports_throughput(self):
+        out = StringIO()
+        call_command("sweep_overdue", "--date", "2025-06-01", stdout=out)
+        self.assertIn("Flagged 4 overdue borrowings as of 2025-06-01", out.getvalue())
+        self.assertIn("rows/s", out.getvalue())
@@ -0,0 +1,108 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from borrowing.models import Borrowing
+from catalog.models import Book
+
+User = get_user_model()
+BOOK_URL = reverse("catalog:book-list")
+BORROWING_URL = reverse("borrowing:borrowing-list")
+CACHE_STATS_URL = reverse("catalog:book-cache-stats")
+
+LOCMEM_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "catalog": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "catalog-tests",
+    },
+}
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class CatalogCacheTests(APITestCase):
+    def setUp(self):
+        caches["catalog"].clear()
+        self.admin_user = User.objects.create_superuser(
+            email="admin@example.com",
+            password="adminpass"
+        )
+        self.user = User.objects.create_user(
+            email="user@example.com",
+            password="userpass"
+        )
+        self.book = Book.objects.create(
+            title="Test Book",
+            author="John Doe",
+            cover="HARD",
+            inventory=3,
+            daily_fee=1.99,
+        )
+        self.detail_url = reverse("catalog:book-detail", args=[self.book.id])
+
+    def test_repeated_list_is_served_from_cache(self):
+        first = self.client.get(BOOK_URL)
+        with self.assertNumQueries(0):
+            second = self.client.get(BOOK_URL)
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.data, first.data)
+
+    def test_query_params_are_part_of_the_key(self):
+        self.client.get(BOOK_URL, {"limit": 1})
+        # fingerprint, count and page are all computed afresh
+        with self.assertNumQueries(3):
+            self.client.get(BOOK_URL, {"limit": 2})
+
+    def test_book_changes_invalidate_cached_list(self):
+        self.client.get(BOOK_URL)
+        self.client.force_authenticate(user=self.admin_user)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(BOOK_URL, {
+                "title": "New Book",
+                "author": "Jane Smith",
+                "cover": "SOFT",
+                "inventory": 5,
+                "daily_fee": "2.50",
+            })
+        response = self.client.get(BOOK_URL)
+        self.assertEqual(response.data["count"], 2)
+
+    def test_checkout_and_return_invalidate_cached_detail(self):
+        self.client.get(self.detail_url)
+        self.client.force_authenticate(user=self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            res = self.client.post(BORROWING_URL, {
+                "borrow_date": "2025-10-20",
+                "expected_return_date": "2025-10-25",
+                "book": self.book.id,
+            })
+        self.assertEqual(self.client.get(self.detail_url).data["inventory"], 2)
+
+        borrowing = Borrowing.objects.get(pk=res.data["id"])
+        return_url = reverse(
+            "borrowing:borrowing-return-borrowing", args=[borrowing.id]
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(return_url)
+        self.assertEqual(self.client.get(self.detail_url).data["inventory"], 3)
+
+    def test_stats_count_hits_and_misses(self):
+        self.client.get(BOOK_URL)
+        self.client.get(BOOK_URL)
+        self.client.get(self.detail_url)
+
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.get(CACHE_STATS_URL)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["hits"], 1)
+        self.assertEqual(response.data["misses"], 2)
+
+    def test_stats_are_admin_only(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(CACHE_STATS_URL)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -1,12 +1,25 @@
+import datetime
+
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APIClient, APITestCase
 from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
 from django.urls import reverse
 
+from borrowing.models import Borrowing
+from catalog.models import Book
+
 BOOK_URL = reverse("catalog:book-list")
 TOKEN_URL = reverse("user:token_obtain_pair")
 TOKEN_REFRESH_URL = reverse("user:token_refresh")
 TOKEN_VERIFY_URL = reverse("user:token_verify")
+BORROWING_URL = reverse("borrowing:borrowing-list")
+ME_URL = reverse("user:manage_user")
 
 
 class JWTAuthTests(APITestCase):
@@ -65,3 +78,150 @@ class JWTAuthTests(APITestCase):
 
         res = self.client.post(TOKEN_VERIFY_URL, {"token": access_token})
         self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+
+@override_settings(JWT_STATELESS=True)
+class StatelessJWTTests(APITestCase):
+    def setUp(self):
+        caches[settings.AUTH_CACHE_ALIAS].clear()
+        self.user = get_user_model().objects.create_user(
+            email="reader@test.com", password="testpassword"
+        )
+        self.other = get_user_model().objects.create_user(
+            email="other@test.com", password="testpassword"
+        )
+        self.admin = get_user_model().objects.create_superuser(
+            email="admin@test.com", password="testpassword"
+        )
+        self.book = Book.objects.create(
+            title="Dune", author="Frank Herbert", cover="SOFT",
+            inventory=5, daily_fee=1,
+        )
+        today = datetime.date.today()
+        for user in (self.user, self.other):
+            Borrowing.objects.create(
+                book=self.book, user=user, borrow_date=today,
+                expected_return_date=today + datetime.timedelta(days=7),
+            )
+
+    def login(self, user):
+        res = self.client.post(
+            TOKEN_URL, {"email": user.email, "password": "testpassword"}
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return res.data
+
+    def authorize(self, access):
+        self.client.credentials(HTTP_AUTHORIZE=f"Bearer {access}")
+
+    def user_queries(self, method, url, data=None):
+        with CaptureQueriesContext(connection) as queries:
+            res = getattr(self.client, method)(url, data, format="json")
+        return res, [
+            query["sql"] for query in queries
+            if 'FROM "user_user" WHERE "user_user"."id" =' in query["sql"]
+        ]
+
+    def test_tokens_carry_claims(self):
+        tokens = self.login(self.admin)
+        for token in (AccessToken(tokens["access"]), RefreshToken(tokens["refresh"])):
+            self.assertIs(token["is_staff"], True)
+            self.assertIs(token["is_superuser"], True)
+            self.assertIs(token["is_active"], True)
+
+    def test_admin_writes_without_loading_the_user(self):
+        self.authorize(self.login(self.admin)["access"])
+        res, lookups = self.user_queries("post", BOOK_URL, {
+            "title": "Emma", "author": "Jane Austen", "cover": "HARD",
+            "inventory": 1, "daily_fee": "1.00",
+        })
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(lookups, [])
+
+        with override_settings(JWT_STATELESS=False):
+            _, lookups = self.user_queries("get", BOOK_URL)
+        self.assertEqual(len(lookups), 1)
+
+    def test_readers_only_see_their_borrowings(self):
+        self.authorize(self.login(self.user)["access"])
+        res, lookups = self.user_queries("get", BORROWING_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(lookups, [])
+        self.assertEqual(
+            [row["user"]["id"] for row in res.data["results"]], [self.user.id]
+        )
+
+        res = self.client.post(BOOK_URL, {"title": "Emma"})
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_writes_and_profile_use_the_user_row(self):
+        self.authorize(self.login(self.user)["access"])
+        today = datetime.date.today()
+        res = self.client.post(BORROWING_URL, {
+            "book": self.book.id,
+            "borrow_date": today.isoformat(),
+            "expected_return_date": str(today + datetime.timedelta(days=3)),
+        }, format="json")
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res.data["user"]["email"], self.user.email)
+
+        res = self.client.patch(ME_URL, {"password": "newpassword"}, format="json")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["email"], self.user.email)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password("newpassword"))
+
+    def test_deactivation_revokes_live_tokens(self):
+        access = self.login(self.user)["access"]
+        self.authorize(access)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.first_name = "Ann"
+            self.user.save()
+        self.assertEqual(self.client.get(BORROWING_URL).status_code, 200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+        res = self.client.get(BORROWING_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = True
+            self.user.save()
+        self.assertEqual(self.client.get(BORROWING_URL).status_code, 200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.delete()
+        res = self.client.get(BORROWING_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_demotion_applies_to_live_tokens_and_refresh(self):
+        tokens = self.login(self.admin)
+        self.authorize(tokens["access"])
+        admin = get_user_model().objects.get(pk=self.admin.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            admin.is_staff = False
+            admin.save()
+
+        res = self.client.post(BOOK_URL, {"title": "Emma"})
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+        res = self.client.post(TOKEN_REFRESH_URL, {"refresh": tokens["refresh"]})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIs(AccessToken(res.data["access"])["is_staff"], False)
+
+    def test_refresh_rejects_inactive_users(self):
+        refresh = self.login(self.user)["refresh"]
+        self.user.is_active = False
+        self.user.save()
+        res = self.client.post(TOKEN_REFRESH_URL, {"refresh": refresh})
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_tokens_without_claims_fall_back_to_the_database(self):
+        access = AccessToken()
+        access["user_id"] = str(self.admin.id)
+        self.authorize(str(access))
+        res, lookups = self.user_queries("get", BORROWING_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(lookups), 1)
+        self.assertEqual(res.data["count"], 2)
@@ -0,0 +1,107 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import check_password, make_password
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from user import hashers
+
+TOKEN_URL = reverse("user:token_obtain_pair")
+
+PBKDF2 = "user.hashers.PBKDF2PasswordHasher"
+ARGON2 = "user.hashers.Argon2PasswordHasher"
+BCRYPT = "user.hashers.BCryptSHA256PasswordHasher"
+
+# Cheap costs; the tests only care which parameters end up in the hash.
+FAST_COSTS = {
+    "PASSWORD_ARGON2_TIME_COST": 1,
+    "PASSWORD_ARGON2_MEMORY_COST": 1024,
+    "PASSWORD_ARGON2_PARALLELISM": 1,
+    "PASSWORD_BCRYPT_ROUNDS": 4,
+}
+
+
+@override_settings(**FAST_COSTS)
+class RehashOnLoginTests(APITestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email="reader@example.com", password="password123"
+        )
+
+    def login(self, password="password123"):
+        return self.client.post(
+            TOKEN_URL, {"email": "reader@example.com", "password": password}
+        )
+
+    def stored_password(self):
+        self.user.refresh_from_db()
+        return self.user.password
+
+    def test_login_upgrades_the_algorithm(self):
+        self.assertTrue(self.stored_password().startswith("pbkdf2_sha256$"))
+
+        with self.settings(PASSWORD_HASHERS=[ARGON2, PBKDF2, BCRYPT]):
+            response = self.login()
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertTrue(self.stored_password().startswith("argon2$"))
+            self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+
+    def test_login_upgrades_the_cost(self):
+        with self.settings(PASSWORD_HASHERS=[BCRYPT, PBKDF2]):
+            self.login()
+            self.assertIn("$04$", self.stored_password())
+
+            with self.settings(PASSWORD_BCRYPT_ROUNDS=5):
+                self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+                self.assertIn("$05$", self.stored_password())
+
+    def test_failed_login_keeps_the_old_hash(self):
+        old = self.stored_password()
+        with self.settings(PASSWORD_HASHERS=[ARGON2, PBKDF2]):
+            response = self.login("wrong-password")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(self.stored_password(), old)
+
+    def test_iterations_come_from_settings(self):
+        with self.settings(PASSWORD_PBKDF2_ITERATIONS=1500):
+            self.assertTrue(
+                make_password("password123").startswith("pbkdf2_sha256$1500$")
+            )
+
+
+@override_settings(
+    PASSWORD_HASHERS=[ARGON2, PBKDF2], PASSWORD_HASHING_WORKERS=1, **FAST_COSTS
+)
+class HashingPoolTests(SimpleTestCase):
+    def setUp(self):
+        self.addCleanup(hashers.shutdown_pool)
+
+    def test_hashes_match_inline_hashing(self):
+        for hasher in (hashers.Argon2PasswordHasher(),
+                       hashers.PBKDF2PasswordHasher()):
+            with self.subTest(hasher.algorithm):
+                pooled = hasher.encode("password123", "saltsaltsalt")
+                self.assertIsNotNone(hashers.get_pool())
+                with self.settings(PASSWORD_HASHING_WORKERS=0):
+                    inline = hasher.encode("password123", "saltsaltsalt")
+                    self.assertIsNone(hashers.get_pool())
+                self.assertEqual(pooled, inline)
+
+    def test_passwords_verify_in_the_pool(self):
+        encoded = make_password("password123")
+        self.assertTrue(encoded.startswith("argon2$"))
+        self.assertTrue(check_password("password123", encoded))
+        self.assertFalse(check_password("wrong-password", encoded))
+
+        legacy = make_password("password123", hasher="pbkdf2_sha256")
+        self.assertTrue(check_password("password123", legacy))
+
+    def test_pool_processes_hash_inline_without_settings(self):
+        with (
+            mock.patch.object(hashers, "_in_pool", True),
+            mock.patch.object(hashers, "settings", object()),
+        ):
+            self.assertIsNone(hashers.get_pool())
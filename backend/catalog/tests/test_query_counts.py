@@ -0,0 +1,91 @@
+import datetime
+from unittest import mock
+
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from borrowing.models import Borrowing
+from borrowing.views import BorrowingViewSet
+from catalog.models import Book
+from catalog.tests.query_harness import QueryCountHarness, collection_routes
+from user.models import User
+
+
+class QueryCountTests(QueryCountHarness, APITestCase):
+    # Requires a multipart upload; GET only renders the browsable form.
+    # Batch reads need ?ids=; test_book_batch and test_book_availability
+    # cover them.
+    skip_routes = (
+        "catalog:book-import-books",
+        "catalog:book-batch",
+        "catalog:book-availability",
+    )
+
+    def setUp(self):
+        self.admin_user = User.objects.create_superuser(
+            email="admin@example.com", password="admin123"
+        )
+        self.client.force_authenticate(self.admin_user)
+        self.seeded = 0
+
+    def seed(self, size):
+        new = range(self.seeded, size)
+        books = Book.objects.bulk_create([
+            Book(
+                title=f"Book {i}", author=f"Author {i}", cover="SOFT",
+                inventory=5, daily_fee=1,
+            )
+            for i in new
+        ])
+        users = User.objects.bulk_create([
+            User(email=f"reader{i}@example.com", password="!") for i in new
+        ])
+        start = datetime.date(2025, 1, 1)
+        Borrowing.objects.bulk_create([
+            Borrowing(
+                book=book,
+                user=user,
+                borrow_date=start,
+                expected_return_date=start + datetime.timedelta(days=7),
+                actual_return_date=start if i % 2 else None,
+            )
+            for i, book, user in zip(new, books, users)
+        ])
+        self.seeded = size
+
+    def test_routes_are_discovered(self):
+        names = {name for name, _, _ in collection_routes()}
+        self.assertTrue({
+            "catalog:book-list",
+            "borrowing:borrowing-list",
+            "borrowing:borrowing-export",
+            "borrowing:borrowing-fees",
+        } <= names)
+
+    def test_list_endpoints_issue_a_fixed_number_of_queries(self):
+        self.assertQueryCountsConstant()
+
+    @override_settings(BORROWING_FAST_LIST=False)
+    def test_model_serializer_list_issues_a_fixed_number_of_queries(self):
+        self.assertQueryCountsConstant([
+            route for route in collection_routes()
+            if route[0] == "borrowing:borrowing-list"
+        ])
+
+    @override_settings(BORROWING_FAST_LIST=False)
+    def test_harness_reports_a_dropped_select_related(self):
+        routes = [
+            route for route in collection_routes()
+            if route[0] == "borrowing:borrowing-list"
+        ]
+        with mock.patch.object(
+            BorrowingViewSet,
+            "get_queryset",
+            lambda view: Borrowing.objects.with_charges(),
+        ):
+            with self.assertRaises(AssertionError) as failure:
+                self.assertQueryCountsConstant(routes)
+
+        message = str(failure.exception)
+        self.assertIn("BorrowingViewSet.list (GET /api/borrowings/borrowings/", message)
+        self.assertIn('FROM "user_user" WHERE "user_user"."id" = ?', message)
@@ -0,0 +1,154 @@
+import re
+from unittest import mock
+
+from django.db import connection
+from django.db.backends.postgresql.base import DatabaseWrapper
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from catalog.models import Book
+from library.metrics import registry
+from user.models import User
+
+BOOK_URL = reverse("catalog:book-list")
+METRICS_URL = reverse("metrics")
+
+
+class RequestMetricsTests(APITestCase):
+    def setUp(self):
+        registry.reset()
+        Book.objects.create(
+            title="Dune", author="Frank Herbert", cover="SOFT",
+            inventory=1, daily_fee=1,
+        )
+
+    def metrics(self, **headers):
+        response = self.client.get(METRICS_URL, **headers)
+        return response, response.content.decode()
+
+    def test_server_timing_reports_each_phase(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(BOOK_URL)
+
+        timing = response["Server-Timing"]
+        for phase in ("db", "view", "serialize", "render", "total"):
+            self.assertRegex(timing, rf"\b{phase};dur=\d+\.\d\d")
+        self.assertIn(f'desc="{len(queries)} queries"', timing)
+
+    def test_serialization_is_timed_apart_from_the_view(self):
+        response = self.client.get(BOOK_URL)
+        timing = response["Server-Timing"]
+        serialize = re.search(r"\bserialize;dur=(\d+\.\d\d)", timing)
+        self.assertGreater(float(serialize.group(1)), 0)
+
+        _, body = self.metrics()
+        seconds = re.search(
+            r'library_request_serialize_seconds_total\{view="BookViewSet",'
+            r'action="list",method="GET"\} (\S+)',
+            body,
+        )
+        self.assertGreater(float(seconds.group(1)), 0)
+
+    @override_settings(SERVER_TIMING_HEADER=False)
+    def test_server_timing_can_be_disabled(self):
+        response = self.client.get(BOOK_URL)
+        self.assertFalse(response.has_header("Server-Timing"))
+
+    def test_metrics_are_labelled_by_view_and_action(self):
+        self.client.get(BOOK_URL)
+        self.client.get(BOOK_URL)
+        self.client.post(
+            reverse("user:token_obtain_pair"),
+            {"email": "nobody@example.com", "password": "wrong"},
+        )
+
+        response, body = self.metrics()
+        self.assertEqual(response["Content-Type"].split(";")[0], "text/plain")
+        self.assertIn(
+            'library_requests_total{view="BookViewSet",action="list",'
+            'method="GET",status="200"} 2',
+            body,
+        )
+        self.assertIn(
+            'library_requests_total{view="TokenObtainPairView",action="post",'
+            'method="POST",status="401"} 1',
+            body,
+        )
+        queries = re.search(
+            r'library_request_queries_total\{view="BookViewSet",'
+            r'action="list",method="GET"\} (\d+)',
+            body,
+        )
+        self.assertGreater(int(queries.group(1)), 0)
+        self.assertIn(
+            'library_request_duration_seconds_count{view="BookViewSet",'
+            'action="list",method="GET"} 2',
+            body,
+        )
+
+    def test_extra_actions_and_plain_views_are_labelled(self):
+        user = User.objects.create_user(
+            email="user@example.com", password="password123"
+        )
+        self.client.force_authenticate(user)
+        self.client.get(reverse("borrowing:borrowing-fees"))
+        self.client.get(reverse("user:manage_user"))
+
+        _, body = self.metrics()
+        self.assertIn(
+            'view="BorrowingViewSet",action="fees",method="GET",status="403"',
+            body,
+        )
+        self.assertIn('view="ManageUserView",action="get"', body)
+
+    def test_unknown_methods_share_one_series(self):
+        for method in ("PURGE", "BREW", "X-ANYTHING"):
+            self.client.generic(method, BOOK_URL)
+
+        _, body = self.metrics()
+        self.assertRegex(
+            body,
+            r'library_requests_total\{view="BookViewSet",action="",'
+            r'method="other",status="\d+"\} 3',
+        )
+        for method in ("PURGE", "BREW", "X-ANYTHING"):
+            self.assertNotIn(method, body)
+
+    @override_settings(METRICS_TOKEN="s3cret")
+    def test_metrics_token(self):
+        response, _ = self.metrics()
+        self.assertEqual(response.status_code, 403)
+        response, _ = self.metrics(HTTP_AUTHORIZATION="Bearer s3cret")
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(METRICS_TOKEN="", PRODUCTION=True)
+    def test_metrics_need_a_token_in_production(self):
+        response, _ = self.metrics()
+        self.assertEqual(response.status_code, 403)
+
+    def pool_metrics(self, pool):
+        with mock.patch.object(
+            DatabaseWrapper, "pool", new_callable=mock.PropertyMock,
+            return_value=pool,
+        ):
+            return self.metrics()[1]
+
+    def test_pool_stats_are_exported_when_pooling(self):
+        self.assertNotIn("library_db_pool", self.pool_metrics(None))
+
+        pool = mock.Mock()
+        pool.get_stats.return_value = {
+            "pool_max": 10,
+            "pool_size": 4,
+            "pool_available": 1,
+            "requests_num": 42,
+            "requests_wait_ms": 1500,
+        }
+        body = self.pool_metrics(pool)
+        self.assertIn('library_db_pool_max_connections{alias="default"} 10', body)
+        self.assertIn('library_db_pool_connections_in_use{alias="default"} 3', body)
+        self.assertIn('library_db_pool_requests_total{alias="default"} 42', body)
+        self.assertIn('library_db_pool_wait_seconds_total{alias="default"} 1.5', body)
+        self.assertIn('library_db_pool_request_errors_total{alias="default"} 0', body)
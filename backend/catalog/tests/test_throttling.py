@@ -0,0 +1,128 @@
+import datetime
+import threading
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import caches
+from django.test import SimpleTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, APITestCase
+from rest_framework.views import APIView
+
+from catalog.models import Book
+from library.throttling import FixedWindowRateThrottle
+from user.models import User
+
+BOOK_URL = reverse("catalog:book-list")
+BORROWING_URL = reverse("borrowing:borrowing-list")
+ME_URL = reverse("user:manage_user")
+
+RATES = {"anon": "2/min", "user": "3/min", "catalog": "4/min", "checkout": "2/min"}
+
+
+class ThrottleTestMixin:
+    def setUp(self):
+        super().setUp()
+        caches[settings.THROTTLE_CACHE_ALIAS].clear()
+        for patcher in (
+            mock.patch.object(
+                APIView, "throttle_classes", [FixedWindowRateThrottle]
+            ),
+            mock.patch.object(FixedWindowRateThrottle, "THROTTLE_RATES", RATES),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+
+class FixedWindowThrottleTests(ThrottleTestMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.book = Book.objects.create(
+            title="Dune", author="Frank Herbert", cover="SOFT",
+            inventory=10, daily_fee=1,
+        )
+        self.user = User.objects.create_user(
+            email="reader@example.com", password="password123"
+        )
+
+    def checkout(self):
+        today = datetime.date.today()
+        return self.client.post(BORROWING_URL, {
+            "book": self.book.id,
+            "borrow_date": today.isoformat(),
+            "expected_return_date": str(today + datetime.timedelta(days=7)),
+        }, format="json")
+
+    def test_catalog_reads_have_their_own_scope(self):
+        statuses = [self.client.get(BOOK_URL).status_code for _ in range(5)]
+        self.assertEqual(statuses, [200] * 4 + [429])
+
+        # The anonymous budget for other endpoints is untouched.
+        response = self.client.post(
+            reverse("user:token_obtain_pair"),
+            {"email": "reader@example.com", "password": "password123"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_checkout_is_limited_separately_from_reads(self):
+        self.client.force_authenticate(self.user)
+        statuses = [self.checkout().status_code for _ in range(3)]
+        self.assertEqual(statuses, [201, 201, 429])
+
+        response = self.client.get(BORROWING_URL)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.get(BOOK_URL)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_limits_are_per_user(self):
+        other = User.objects.create_user(
+            email="other@example.com", password="password123"
+        )
+        self.client.force_authenticate(self.user)
+        for _ in range(3):
+            self.client.get(ME_URL)
+        self.assertEqual(self.client.get(ME_URL).status_code, 429)
+
+        self.client.force_authenticate(other)
+        self.assertEqual(self.client.get(ME_URL).status_code, 200)
+
+    def test_throttled_response_says_when_the_window_ends(self):
+        with mock.patch.object(
+            FixedWindowRateThrottle, "timer", return_value=6015.0
+        ):
+            for _ in range(4):
+                self.client.get(BOOK_URL)
+            response = self.client.get(BOOK_URL)
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(response["Retry-After"], "45")
+
+        with mock.patch.object(
+            FixedWindowRateThrottle, "timer", return_value=6060.0
+        ):
+            response = self.client.get(BOOK_URL)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class FixedWindowCounterTests(ThrottleTestMixin, SimpleTestCase):
+    def test_concurrent_requests_share_one_counter(self):
+        request = APIRequestFactory().get(BOOK_URL, REMOTE_ADDR="10.0.0.1")
+        request.user = mock.Mock(is_authenticated=False)
+        view = mock.Mock(action="list", throttle_scopes={"list": "catalog"})
+        allowed = []
+        start = threading.Barrier(8)
+
+        def client():
+            start.wait()
+            for _ in range(5):
+                # A fresh instance per request, as in separate workers.
+                allowed.append(
+                    FixedWindowRateThrottle().allow_request(request, view)
+                )
+
+        threads = [threading.Thread(target=client) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(allowed.count(True), 4)
@@ -0,0 +1,115 @@
+from datetime import datetime, timedelta, timezone
+from io import StringIO
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from user import revocation
+from user.models import RevokedRefreshToken
+
+TOKEN_URL = reverse("user:token_obtain_pair")
+TOKEN_REFRESH_URL = reverse("user:token_refresh")
+TOKEN_VERIFY_URL = reverse("user:token_verify")
+TOKEN_REVOKE_URL = reverse("user:token_revoke")
+
+
+class RefreshRotationTests(APITestCase):
+    def setUp(self):
+        caches[settings.AUTH_CACHE_ALIAS].clear()
+        self.user = get_user_model().objects.create_user(
+            email="reader@example.com", password="password123"
+        )
+        self.refresh = self.client.post(
+            TOKEN_URL, {"email": "reader@example.com", "password": "password123"}
+        ).data["refresh"]
+
+    def refresh_with(self, refresh):
+        return self.client.post(TOKEN_REFRESH_URL, {"refresh": refresh})
+
+    def test_refresh_rotates_the_token(self):
+        res = self.refresh_with(self.refresh)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn("access", res.data)
+        self.assertNotEqual(res.data["refresh"], self.refresh)
+
+        res = self.refresh_with(res.data["refresh"])
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_rotated_token_cannot_be_reused(self):
+        self.refresh_with(self.refresh)
+        res = self.refresh_with(self.refresh)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        # Also when the cache lost the revocation, e.g. on another worker.
+        caches[settings.AUTH_CACHE_ALIAS].clear()
+        res = self.refresh_with(self.refresh)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_revoked_token_is_rejected(self):
+        res = self.client.post(TOKEN_REVOKE_URL, {"refresh": self.refresh})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        res = self.refresh_with(self.refresh)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+        res = self.client.post(TOKEN_VERIFY_URL, {"token": self.refresh})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_store_keeps_only_a_hash_of_the_jti(self):
+        self.refresh_with(self.refresh)
+        jti = RefreshToken(self.refresh)["jti"]
+        row = RevokedRefreshToken.objects.get()
+        self.assertNotEqual(row.jti_hash, jti)
+        self.assertEqual(len(row.jti_hash), 64)
+
+    def test_refresh_cost_does_not_grow_with_history(self):
+        expires = datetime.now(tz=timezone.utc) + timedelta(days=1)
+        RevokedRefreshToken.objects.bulk_create(
+            RevokedRefreshToken(jti_hash=f"{i:064x}", expires_at=expires)
+            for i in range(2000)
+        )
+        with CaptureQueriesContext(connection) as queries:
+            res = self.refresh_with(self.refresh)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        # The user lookup and one primary-key insert; no scan of the store.
+        self.assertEqual(
+            [q["sql"].split()[0] for q in queries.captured_queries
+             if "revokedrefreshtoken" in q["sql"]],
+            ["INSERT"],
+        )
+
+    def test_unrevoked_tokens_are_cached(self):
+        token = RefreshToken(self.refresh)
+        self.assertFalse(revocation.is_revoked(token))
+        with self.assertNumQueries(0):
+            self.assertFalse(revocation.is_revoked(token))
+
+        self.assertTrue(revocation.revoke(token))
+        self.assertFalse(revocation.revoke(token))
+        with self.assertNumQueries(0):
+            self.assertTrue(revocation.is_revoked(token))
+
+
+class PruneRevokedTokensTests(APITestCase):
+    def test_prune_deletes_only_expired_tokens(self):
+        now = datetime.now(tz=timezone.utc)
+        RevokedRefreshToken.objects.bulk_create(
+            RevokedRefreshToken(
+                jti_hash=f"{i:064x}", expires_at=now + timedelta(hours=i - 5, minutes=30)
+            )
+            for i in range(10)
+        )
+        out = StringIO()
+        call_command("prune_revoked_tokens", chunk_size=2, stdout=out)
+        self.assertIn("Deleted 5", out.getvalue())
+        self.assertFalse(
+            RevokedRefreshToken.objects.filter(expires_at__lt=now).exists()
+        )
+        self.assertEqual(RevokedRefreshToken.objects.count(), 5)
@@ -2,11 +2,13 @@ from django.urls import path, include
 from .views import BookViewSet
 from rest_framework import routers
 
+from catalog.routers import async_read_urls
+
 app_name = "catalog"
 
 router = routers.DefaultRouter()
 router.register("books", BookViewSet)
 
 urlpatterns = [
-    path("", include(router.urls)),
+    path("", include(async_read_urls(router.urls))),
 ]
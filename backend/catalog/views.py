@@ -1,11 +1,40 @@
-from rest_framework import viewsets, mixins
+import io
 
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from rest_framework import viewsets, mixins, status
+from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import AllowAny, IsAdminUser
+from rest_framework.response import Response
+
+from . import cache
+from .filters import BookSearchFilter
+from .importer import FORMATS, guess_format, import_books
+from .mixins import (
+    AsyncReadMixin,
+    CatalogCacheMixin,
+    ConditionalGetMixin,
+    SerializerTimingMixin,
+)
 from .models import Book
-from .serializers import BookSerializer, BookListSerializer
+from .serializers import (
+    BookAvailabilityQuerySerializer,
+    BookAvailabilitySerializer,
+    BookBatchQuerySerializer,
+    BookSerializer,
+    BookListSerializer,
+)
+from .pagination import BookKeysetPagination, KeysetPaginationMixin
 from .permissions import IsAdminOrReadOnly
 
 
 class BookViewSet(
+    KeysetPaginationMixin,
+    ConditionalGetMixin,
+    CatalogCacheMixin,
+    SerializerTimingMixin,
+    AsyncReadMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     mixins.UpdateModelMixin,
@@ -15,8 +44,116 @@ class BookViewSet(
 ):
     queryset = Book.objects.all()
     permission_classes = [IsAdminOrReadOnly]
+    keyset_pagination_class = BookKeysetPagination
+    filter_backends = [BookSearchFilter]
+    throttle_scopes = {
+        "list": "catalog",
+        "retrieve": "catalog",
+        "batch": "catalog",
+        "availability": "catalog",
+    }
 
     def get_serializer_class(self):
         if self.action == "list":
             return BookListSerializer
+        if self.action == "batch":
+            return BookBatchQuerySerializer
+        if self.action == "availability":
+            return BookAvailabilityQuerySerializer
         return BookSerializer
+
+    def get_fingerprint(self, queryset):
+        # Memoized under the catalog version, so cached reads skip the DB.
+        key = cache.response_key(self.request, f"{self.action}:fingerprint")
+        compute = super().get_fingerprint
+        return cache.memoize(key, lambda: compute(queryset))
+
+    async def aget_fingerprint(self, queryset):
+        return await sync_to_async(self.get_fingerprint)(queryset)
+
+    def requested_ids(self, request):
+        """Validated ids from ``?ids=`` or, for POST, the request body."""
+        data = request.data if request.method == "POST" else request.query_params
+        serializer = self.get_serializer(data=data)
+        serializer.is_valid(raise_exception=True)
+        return serializer.validated_data["ids"]
+
+    def batch_response(self, ids, rows, serializer_class):
+        """Serialize ``rows`` (keyed by id) in the order of ``ids``."""
+        serializer = self.timed_serializer(serializer_class(
+            [rows[pk] for pk in ids if pk in rows], many=True
+        ))
+        return Response({
+            "results": serializer.data,
+            "missing": [pk for pk in ids if pk not in rows],
+        })
+
+    @action(
+        detail=False,
+        methods=["get", "post"],
+        # POST only reads; it takes lists too long for a query string.
+        permission_classes=[AllowAny],
+    )
+    def batch(self, request):
+        """Several books by id, in one query instead of one request each."""
+        ids = self.requested_ids(request)
+        books = Book.objects.in_bulk(ids)
+        return self.batch_response(ids, books, BookSerializer)
+
+    @action(
+        detail=False,
+        methods=["get", "post"],
+        permission_classes=[AllowAny],
+    )
+    def availability(self, request):
+        """Copies on loan and on the shelf for a batch of book ids."""
+        ids = self.requested_ids(request)
+        books = {
+            book["id"]: book
+            for book in Book.objects.filter(pk__in=ids).with_availability().values(
+                "id", "inventory", "on_loan", "total_copies", "next_expected_return"
+            )
+        }
+        return self.batch_response(ids, books, BookAvailabilitySerializer)
+
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="cache-stats",
+        permission_classes=[IsAdminUser],
+    )
+    def cache_stats(self, request):
+        return Response(cache.get_stats())
+
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="import",
+        permission_classes=[IsAdminUser],
+        parser_classes=[MultiPartParser],
+    )
+    def import_books(self, request):
+        upload = request.FILES.get("file")
+        if upload is None:
+            return Response(
+                {"file": ["No file was submitted."]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        file_format = request.data.get("file_format") or guess_format(upload.name)
+        if file_format not in FORMATS:
+            return Response(
+                {"file_format": [f"Expected one of: {', '.join(FORMATS)}."]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        stream = io.TextIOWrapper(upload.file, encoding="utf-8", newline="")
+        try:
+            report = import_books(
+                stream, file_format, batch_size=settings.BOOK_IMPORT_BATCH_SIZE
+            )
+        except UnicodeDecodeError:
+            return Response(
+                {"file": ["The file must be UTF-8 encoded."]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response(report.as_dict(), status=status.HTTP_200_OK)
@@ -0,0 +1,33 @@
+"""
+Gunicorn settings for the production profile.
+
+WSGI:  gunicorn library.wsgi:application -c gunicorn.conf.py
+ASGI:  GUNICORN_WORKER_CLASS=uvicorn_worker.UvicornWorker \
+       gunicorn library.asgi:application -c gunicorn.conf.py
+"""
+import multiprocessing
+import os
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+
+# Requests spend much of their time waiting on Postgres, so a couple of
+# processes per core keeps the CPUs busy; override with WEB_CONCURRENCY.
+workers = int(
+    os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1)
+)
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "sync")
+threads = int(os.environ.get("GUNICORN_THREADS", 1))
+
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 30))
+graceful_timeout = 30
+keepalive = 5
+# Gunicorn's maximum; batch reads such as ?ids= for 1000 books need it.
+limit_request_line = 8190
+
+# Recycle workers now and then so slow leaks cannot pile up.
+max_requests = 2000
+max_requests_jitter = 200
+
+accesslog = "-"
+errorlog = "-"
+loglevel = os.environ.get("GUNICORN_LOG_LEVEL", "info")
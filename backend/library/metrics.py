@@ -0,0 +1,195 @@
+"""
+Per-view request metrics kept in process memory and served to Prometheus.
+
+Every worker process keeps its own counters; a scraper sums them across
+the targets it is pointed at. Recording a request is a dictionary lookup
+and a handful of additions under a lock, cheap enough to stay enabled.
+"""
+import bisect
+import threading
+
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+SERIES = (
+    ("queries", "library_request_queries_total", "SQL queries executed."),
+    ("db", "library_request_db_seconds_total", "Time spent in the database."),
+    (
+        "view",
+        "library_request_view_seconds_total",
+        "Time spent in view code outside the database and serialization.",
+    ),
+    (
+        "serialize",
+        "library_request_serialize_seconds_total",
+        "Time spent serializing response data outside the database.",
+    ),
+    ("render", "library_request_render_seconds_total", "Time spent rendering."),
+)
+
+# psycopg_pool.ConnectionPool.get_stats() keys: (key, name, type, help, scale)
+POOL_SERIES = (
+    ("pool_max", "library_db_pool_max_connections", "gauge",
+     "Configured pool size limit.", 1),
+    ("pool_size", "library_db_pool_connections", "gauge",
+     "Connections currently open, idle or in use.", 1),
+    ("in_use", "library_db_pool_connections_in_use", "gauge",
+     "Connections handed out to requests.", 1),
+    ("requests_waiting", "library_db_pool_requests_waiting", "gauge",
+     "Requests queued for a connection right now.", 1),
+    ("requests_num", "library_db_pool_requests_total", "counter",
+     "Connections requested from the pool.", 1),
+    ("requests_queued", "library_db_pool_requests_queued_total", "counter",
+     "Requests that had to wait for a connection.", 1),
+    ("requests_wait_ms", "library_db_pool_wait_seconds_total", "counter",
+     "Time requests spent waiting for a connection.", 0.001),
+    ("requests_errors", "library_db_pool_request_errors_total", "counter",
+     "Requests that timed out or failed waiting for a connection.", 1),
+    ("connections_num", "library_db_pool_connects_total", "counter",
+     "Connections opened to the server.", 1),
+    ("connections_lost", "library_db_pool_connections_lost_total", "counter",
+     "Connections found broken by the health check.", 1),
+)
+
+
+class ViewStats:
+    __slots__ = (
+        "statuses", "queries", "db", "view", "serialize", "render",
+        "buckets", "total",
+    )
+
+    def __init__(self):
+        self.statuses = {}
+        self.queries = 0
+        self.db = 0.0
+        self.view = 0.0
+        self.serialize = 0.0
+        self.render = 0.0
+        self.buckets = [0] * (len(DURATION_BUCKETS) + 1)
+        self.total = 0.0
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._views = {}
+
+    def record(self, labels, status, queries, db, view, serialize, render, total):
+        with self._lock:
+            stats = self._views.get(labels)
+            if stats is None:
+                stats = self._views[labels] = ViewStats()
+            stats.statuses[status] = stats.statuses.get(status, 0) + 1
+            stats.queries += queries
+            stats.db += db
+            stats.view += view
+            stats.serialize += serialize
+            stats.render += render
+            stats.buckets[bisect.bisect_left(DURATION_BUCKETS, total)] += 1
+            stats.total += total
+
+    def reset(self):
+        with self._lock:
+            self._views.clear()
+
+    def render(self):
+        """Return all series in the Prometheus text exposition format."""
+        with self._lock:
+            views = sorted(self._views.items())
+            lines = [
+                "# HELP library_requests_total Requests handled.",
+                "# TYPE library_requests_total counter",
+            ]
+            for labels, stats in views:
+                for status, count in sorted(stats.statuses.items()):
+                    lines.append(
+                        f"library_requests_total"
+                        f"{_labels(labels, status=status)} {count}"
+                    )
+
+            for attr, name, help_text in SERIES:
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+                for labels, stats in views:
+                    lines.append(f"{name}{_labels(labels)} {getattr(stats, attr)}")
+
+            name = "library_request_duration_seconds"
+            lines += [
+                f"# HELP {name} Time from the first middleware to the response.",
+                f"# TYPE {name} histogram",
+            ]
+            for labels, stats in views:
+                cumulative = 0
+                for bound, count in zip(
+                    (*DURATION_BUCKETS, "+Inf"), stats.buckets
+                ):
+                    cumulative += count
+                    lines.append(
+                        f"{name}_bucket{_labels(labels, le=bound)} {cumulative}"
+                    )
+                lines.append(f"{name}_sum{_labels(labels)} {stats.total}")
+                lines.append(f"{name}_count{_labels(labels)} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+
+def render_pool_stats():
+    """Pool gauges and counters for every database configured with a pool."""
+    pools = {}
+    for alias in settings.DATABASES:
+        pool = connections[alias].pool
+        if pool is not None:
+            stats = pool.get_stats()
+            stats["in_use"] = (
+                stats.get("pool_size", 0) - stats.get("pool_available", 0)
+            )
+            pools[alias] = stats
+
+    lines = []
+    if not pools:
+        return lines
+    for key, name, kind, help_text, scale in POOL_SERIES:
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+        for alias, stats in pools.items():
+            value = stats.get(key, 0) * scale
+            lines.append(f'{name}{{alias="{_escape(alias)}"}} {value}')
+    return lines
+
+
+def _labels(labels, **extra):
+    view, action, method = labels
+    pairs = {"view": view, "action": action, "method": method, **extra}
+    body = ",".join(
+        f'{key}="{_escape(str(value))}"' for key, value in pairs.items()
+    )
+    return "{" + body + "}"
+
+
+def _escape(value):
+    return value.replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+
+
+def metrics_view(request):
+    """
+    Prometheus scrape endpoint, guarded by METRICS_TOKEN when it is set.
+    The production profile never serves it without a token.
+    """
+    token = settings.METRICS_TOKEN
+    if not token:
+        if settings.PRODUCTION:
+            return HttpResponseForbidden()
+    elif not constant_time_compare(
+        request.headers.get("Authorization", ""), f"Bearer {token}"
+    ):
+        return HttpResponseForbidden()
+    body = registry.render() + "".join(
+        line + "\n" for line in render_pool_stats()
+    )
+    return HttpResponse(
+        body, content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -0,0 +1,212 @@
+import time
+
+from asgiref.sync import (
+    iscoroutinefunction,
+    markcoroutinefunction,
+    sync_to_async,
+)
+from django.conf import settings
+from django.db import connections
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from .metrics import registry
+
+
+class RequestTimer:
+    __slots__ = (
+        "started", "labels", "queries", "db", "serialize",
+        "view_started", "view_db", "view_finished", "render_finished",
+    )
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.labels = ("<unmatched>", "", "")
+        self.queries = 0
+        self.db = 0.0
+        self.serialize = 0.0
+        self.view_started = None
+        self.view_db = 0.0
+        self.view_finished = None
+        self.render_finished = None
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db += time.perf_counter() - started
+            self.queries += 1
+
+    def time_serializer(self, serializer):
+        """
+        Count ``serializer.to_representation`` as the serialize phase,
+        minus the queries it runs, which stay in the db phase.
+        """
+        to_representation = serializer.to_representation
+
+        def timed(instance):
+            started, db = time.perf_counter(), self.db
+            try:
+                return to_representation(instance)
+            finally:
+                self.serialize += time.perf_counter() - started - (self.db - db)
+
+        serializer.to_representation = timed
+        return serializer
+
+    def start_view(self):
+        self.view_started = time.perf_counter()
+        self.view_db = -self.db
+
+    def finish_view(self, now=None):
+        self.view_finished = now or time.perf_counter()
+        self.view_db += self.db
+
+    def rendered(self, response):
+        self.render_finished = time.perf_counter()
+
+
+class RequestMetricsMiddleware:
+    """
+    Count SQL queries and time the database, view, serialize and render
+    phases of every request, label them with the DRF view class and action,
+    and report them in a ``Server-Timing`` header and the /metrics registry.
+
+    Serializers run inside DRF views; the ones a view hands to
+    ``RequestTimer.time_serializer`` (see catalog.mixins.SerializerTimingMixin)
+    are reported as the serialize phase and left out of the view phase.
+    The render phase is the renderer turning ``response.data`` into bytes.
+    Queries issued while a streaming response is consumed happen after the
+    middleware returns and are not counted.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timer = request._timer = RequestTimer()
+        self.install(timer)
+        try:
+            response = self.get_response(request)
+        finally:
+            self.uninstall(timer)
+        return self.record(timer, response)
+
+    async def __acall__(self, request):
+        timer = request._timer = RequestTimer()
+        # Connections are per thread and async ORM calls run on the
+        # request's sync_to_async thread, so the timer is installed there.
+        await sync_to_async(self.install)(timer)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(self.uninstall)(timer)
+        return self.record(timer, response)
+
+    def install(self, timer):
+        # Same as connection.execute_wrapper(), minus the context manager
+        # overhead on every request.
+        for alias in settings.DATABASES:
+            connections[alias].execute_wrappers.append(timer)
+
+    def uninstall(self, timer):
+        for alias in settings.DATABASES:
+            connections[alias].execute_wrappers.remove(timer)
+
+    def record(self, timer, response):
+        finished = time.perf_counter()
+        view = render = 0.0
+        serialize = timer.serialize
+        if timer.view_started is not None:
+            if timer.view_finished is None:
+                timer.finish_view(finished)
+            view_finished = timer.view_finished
+            view = max(
+                view_finished - timer.view_started - timer.view_db - serialize,
+                0.0,
+            )
+            if timer.render_finished is not None:
+                render = timer.render_finished - view_finished
+        total = finished - timer.started
+
+        registry.record(
+            timer.labels, response.status_code, timer.queries,
+            timer.db, view, serialize, render, total,
+        )
+        if settings.SERVER_TIMING_HEADER:
+            response["Server-Timing"] = ", ".join((
+                f'db;dur={timer.db * 1000:.2f};desc="{timer.queries} queries"',
+                f"view;dur={view * 1000:.2f}",
+                f"serialize;dur={serialize * 1000:.2f}",
+                f"render;dur={render * 1000:.2f}",
+                f"total;dur={total * 1000:.2f}",
+            ))
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        timer = request._timer
+        timer.labels = view_labels(request, view_func)
+        timer.start_view()
+
+    def process_template_response(self, request, response):
+        timer = request._timer
+        timer.finish_view()
+        response.add_post_render_callback(timer.rendered)
+        return response
+
+
+# Label values for request methods; anything else is reported as "other",
+# so clients cannot grow the number of series with made-up methods.
+METHODS = frozenset(("GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"))
+
+
+def view_labels(request, view_func):
+    """``(view, action, method)`` for a resolved view function."""
+    method = request.method if request.method in METHODS else "other"
+    view_class = getattr(view_func, "cls", None) or getattr(
+        view_func, "view_class", None
+    )
+    if view_class is None:
+        return view_func.__qualname__, "", method
+    actions = getattr(view_func, "actions", None)
+    if actions:
+        action = actions.get(method.lower(), "")
+    else:
+        action = method.lower()
+    return view_class.__name__, action, method
+
+
+class StaticFilesMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoise that also runs as async middleware, so requests to async
+    views under ASGI are not handed to a thread just to pass through it.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, settings=settings):
+        super().__init__(get_response, settings)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = self.find_file(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return self.serve(static_file, request)
+        return await self.get_response(request)
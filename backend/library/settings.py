@@ -15,6 +15,8 @@ import sys
 from pathlib import Path
 from datetime import timedelta
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -25,10 +27,30 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 # SECURITY WARNING: keep the secret key used in production secret!
 SECRET_KEY = os.environ.get("SECRET_KEY", "fallback-secret")
 
+# "development" (default) or "production"; production turns DEBUG off,
+# serves collected static files and expects real ALLOWED_HOSTS.
+PROFILE = os.environ.get("DJANGO_PROFILE") or "development"
+if PROFILE not in ("development", "production"):
+    raise ImproperlyConfigured(f"Unknown DJANGO_PROFILE: {PROFILE}")
+PRODUCTION = PROFILE == "production"
+
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+# DEBUG also keeps every executed SQL query in memory.
+DEBUG = os.environ.get("DEBUG", "0" if PRODUCTION else "1") == "1"
 
-ALLOWED_HOSTS = []
+ALLOWED_HOSTS = [
+    host.strip()
+    for host in os.environ.get("ALLOWED_HOSTS", "").split(",")
+    if host.strip()
+]
+CSRF_TRUSTED_ORIGINS = [
+    origin.strip()
+    for origin in os.environ.get("CSRF_TRUSTED_ORIGINS", "").split(",")
+    if origin.strip()
+]
+
+if PRODUCTION and SECRET_KEY == "fallback-secret":
+    raise ImproperlyConfigured("Set SECRET_KEY for the production profile.")
 
 
 # Application definition
@@ -40,17 +62,21 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "rest_framework",
     "drf_spectacular",
     "catalog",
     "user",
     "borrowing",
+    "benchmarks",
 ]
 
 AUTH_USER_MODEL = "user.User"
 
 MIDDLEWARE = [
+    "library.middleware.RequestMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "library.middleware.StaticFilesMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -90,9 +116,82 @@ DATABASES = {
         "PASSWORD": os.environ["POSTGRES_PASSWORD"],
         "HOST": os.environ["POSTGRES_HOST"],
         "PORT": os.environ["POSTGRES_PORT"],
+        # Keep connections open between requests for this many seconds;
+        # 0 closes them at the end of every request.
+        "CONN_MAX_AGE": int(os.environ.get("DB_CONN_MAX_AGE") or 60),
+        # Ping a reused connection before the first query of a request.
+        "CONN_HEALTH_CHECKS": (os.environ.get("DB_CONN_HEALTH_CHECKS") or "1") == "1",
+        "OPTIONS": {},
     }
 }
 
+# DB_POOL=1 hands connections out of a psycopg_pool.ConnectionPool instead.
+# Each worker process owns a pool, so workers x DB_POOL_MAX_SIZE must stay
+# below the server's max_connections. With CONN_HEALTH_CHECKS on, Django
+# has the pool check each connection before handing it out.
+if os.environ.get("DB_POOL") == "1":
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+    DATABASES["default"]["OPTIONS"]["pool"] = {
+        "min_size": int(os.environ.get("DB_POOL_MIN_SIZE") or 2),
+        "max_size": int(os.environ.get("DB_POOL_MAX_SIZE") or 10),
+        # Seconds a request waits for a free connection before failing.
+        "timeout": float(os.environ.get("DB_POOL_TIMEOUT") or 10),
+        "max_idle": float(os.environ.get("DB_POOL_MAX_IDLE") or 600),
+        "max_lifetime": float(os.environ.get("DB_POOL_MAX_LIFETIME") or 3600),
+    }
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+REDIS_URL = os.environ.get("REDIS_URL")
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "catalog": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "catalog",
+        "OPTIONS": {"MAX_ENTRIES": 10000},
+    },
+    "auth": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "auth",
+    },
+    "throttle": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "throttle",
+    },
+}
+
+if REDIS_URL:
+    CACHES["catalog"] = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": REDIS_URL,
+        "KEY_PREFIX": "library",
+    }
+    CACHES["auth"] = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": REDIS_URL,
+        "KEY_PREFIX": "library",
+    }
+    CACHES["throttle"] = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": REDIS_URL,
+        "KEY_PREFIX": "library",
+    }
+
+CATALOG_CACHE_ALIAS = "catalog"
+# Keys are versioned, so this only bounds how long dead versions linger.
+CATALOG_CACHE_TIMEOUT = 60 * 60
+
+# Claims published for users whose tokens went stale (see user.claims).
+AUTH_CACHE_ALIAS = "auth"
+
+# Request counters for library.throttling; shared by workers via REDIS_URL.
+THROTTLE_CACHE_ALIAS = "throttle"
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -113,6 +212,29 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Hasher for new and upgraded passwords: "pbkdf2", "argon2" or "bcrypt".
+# The others stay listed so existing hashes verify and get rehashed on login.
+PASSWORD_HASHER = os.environ.get("PASSWORD_HASHER") or "pbkdf2"
+PASSWORD_HASHERS = {
+    "pbkdf2": "user.hashers.PBKDF2PasswordHasher",
+    "argon2": "user.hashers.Argon2PasswordHasher",
+    "bcrypt": "user.hashers.BCryptSHA256PasswordHasher",
+}
+if PASSWORD_HASHER not in PASSWORD_HASHERS:
+    raise ImproperlyConfigured(f"Unknown PASSWORD_HASHER: {PASSWORD_HASHER}")
+PASSWORD_HASHERS = [PASSWORD_HASHERS.pop(PASSWORD_HASHER), *PASSWORD_HASHERS.values()]
+
+# Hashing cost; raising it rehashes each password at its next login.
+PASSWORD_PBKDF2_ITERATIONS = int(os.environ.get("PASSWORD_PBKDF2_ITERATIONS") or 1_000_000)
+PASSWORD_ARGON2_TIME_COST = int(os.environ.get("PASSWORD_ARGON2_TIME_COST") or 2)
+PASSWORD_ARGON2_MEMORY_COST = int(os.environ.get("PASSWORD_ARGON2_MEMORY_COST") or 102400)
+PASSWORD_ARGON2_PARALLELISM = int(os.environ.get("PASSWORD_ARGON2_PARALLELISM") or 8)
+PASSWORD_BCRYPT_ROUNDS = int(os.environ.get("PASSWORD_BCRYPT_ROUNDS") or 12)
+
+# Processes per server worker that hash passwords; 0 hashes in the request.
+PASSWORD_HASHING_WORKERS = int(os.environ.get("PASSWORD_HASHING_WORKERS") or 0)
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
 
@@ -129,6 +251,25 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/5.2/howto/static-files/
 
 STATIC_URL = "static/"
+STATIC_ROOT = os.environ.get("STATIC_ROOT", BASE_DIR / "staticfiles")
+
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        # Hashed, pre-compressed files served by WhiteNoise with far-future
+        # cache headers; run collectstatic before starting production.
+        "BACKEND": (
+            "whitenoise.storage.CompressedManifestStaticFilesStorage"
+            if PRODUCTION
+            else "django.contrib.staticfiles.storage.StaticFilesStorage"
+        ),
+    },
+}
+# Outside production WhiteNoise serves straight from the app directories.
+WHITENOISE_USE_FINDERS = not PRODUCTION
+WHITENOISE_AUTOREFRESH = not PRODUCTION
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
@@ -136,7 +277,7 @@ STATIC_URL = "static/"
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.LimitOffsetPagination",
+    "DEFAULT_PAGINATION_CLASS": "catalog.pagination.LimitOffsetPagination",
     "PAGE_SIZE": 5,
     "DEFAULT_PERMISSION_CLASSES": [
         "catalog.permissions.IsAdminOrReadOnly",
@@ -146,14 +287,71 @@ REST_FRAMEWORK = {
     ],
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
+        "library.throttling.FixedWindowRateThrottle",
     ],
-    "DEFAULT_THROTTLE_RATES": {"anon": "10/min", "user": "30/min"},
+    # Views pick a scope with throttle_scope or per-action throttle_scopes;
+    # the rest count against "anon" or "user".
+    "DEFAULT_THROTTLE_RATES": {
+        "anon": "10/min",
+        "user": "30/min",
+        "catalog": "60/min",
+        "checkout": "10/min",
+    },
 }
 
 if "test" in sys.argv:
     REST_FRAMEWORK["DEFAULT_THROTTLE_CLASSES"] = []
+    CACHES["catalog"] = {
+        "BACKEND": "django.core.cache.backends.dummy.DummyCache",
+    }
+    # Tests create many users; full-cost hashing only slows them down.
+    PASSWORD_PBKDF2_ITERATIONS = 1000
+
+# Benchmark runs drive far more traffic than the public rates allow.
+if os.environ.get("DISABLE_THROTTLING") == "1":
+    if PRODUCTION:
+        raise ImproperlyConfigured(
+            "DISABLE_THROTTLING is not allowed in the production profile."
+        )
+    REST_FRAMEWORK["DEFAULT_THROTTLE_CLASSES"] = []
+
+# Upper bound for borrowings/bulk/ and borrowings/bulk-return/ payloads.
+BORROWING_BULK_MAX_ITEMS = 50
+
+# Rows fetched per server-side cursor round trip by borrowings/export/.
+BORROWING_EXPORT_CHUNK_SIZE = 2000
+
+# Rows validated and written per batch by the book import pipeline.
+BOOK_IMPORT_BATCH_SIZE = 1000
+
+# Upper bound for the ids of one books/batch/ request.
+BOOK_BATCH_MAX_SIZE = 100
+
+# Upper bound for the ids of one books/availability/ request.
+BOOK_AVAILABILITY_BATCH_MAX_SIZE = 1000
+
+# Rows written per batch by the reconcile_availability command.
+BOOK_AVAILABILITY_RECONCILE_BATCH_SIZE = 1000
+
+# Render borrowing list pages from a .values() projection instead of models
+BORROWING_FAST_LIST = True
+
+# Serve GET list/retrieve of books and borrowings from async views. Only
+# pays off under ASGI (gunicorn with uvicorn_worker.UvicornWorker).
+ASYNC_READ_VIEWS = os.environ.get("ASYNC_READ_VIEWS") == "1"
+
+# Send per-request db/view/serialize/render timings in a Server-Timing header.
+SERVER_TIMING_HEADER = True
+
+# Bearer token required by /metrics; when empty the endpoint is open in
+# development and forbidden in production.
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+
+# Overdue days are charged at the book's daily_fee times this factor.
+BORROWING_OVERDUE_FINE_MULTIPLIER = 2
+
+# Loans flagged per transaction by the sweep_overdue command.
+BORROWING_OVERDUE_SWEEP_CHUNK_SIZE = 1000
 
 SPECTACULAR_SETTINGS = {
     "TITLE": "Library API",
@@ -171,5 +369,26 @@ SPECTACULAR_SETTINGS = {
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=10),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=3),
-    "ROTATE_REFRESH_TOKENS": False,
+    # Each refresh returns a new refresh token and revokes the one used.
+    "ROTATE_REFRESH_TOKENS": True,
+    "BLACKLIST_AFTER_ROTATION": True,
+    "TOKEN_OBTAIN_SERIALIZER": "user.serializers.TokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "user.serializers.TokenRefreshSerializer",
+    "TOKEN_VERIFY_SERIALIZER": "user.serializers.TokenVerifySerializer",
+    "TOKEN_BLACKLIST_SERIALIZER": "user.serializers.TokenRevokeSerializer",
 }
+
+# Seconds a refresh token found unrevoked is trusted without a lookup
+# (see user.revocation); bounds revocation lag without a shared cache.
+REFRESH_TOKEN_NEGATIVE_CACHE_TIMEOUT = 60
+
+# Rows deleted per statement by the prune_revoked_tokens command.
+REVOKED_TOKEN_PRUNE_CHUNK_SIZE = 1000
+
+# Authenticate API requests from the access token's claims alone, without
+# loading the user. Deactivations reach live tokens through AUTH_CACHE_ALIAS,
+# which must be shared by all workers (set REDIS_URL) in production.
+JWT_STATELESS = os.environ.get("JWT_STATELESS") == "1"
+
+if JWT_STATELESS and PRODUCTION and not REDIS_URL:
+    raise ImproperlyConfigured("JWT_STATELESS requires REDIS_URL in production.")
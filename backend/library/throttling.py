@@ -0,0 +1,69 @@
+"""
+Fixed-window request throttling on atomic cache counters.
+
+Each client gets one counter per scope and window, created with ``add``
+and bumped with ``incr``; both are atomic in Redis and in the local-memory
+cache, so every worker sharing THROTTLE_CACHE_ALIAS enforces the same
+limit and a request costs two cache calls however busy the client is.
+A client can burst up to twice its rate across a window boundary.
+"""
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class FixedWindowRateThrottle(SimpleRateThrottle):
+    """
+    Limits requests per client and scope. The scope is the view's
+    ``throttle_scopes[action]`` or ``throttle_scope``; requests to views
+    without one count against the "user" or "anon" rate.
+    """
+
+    cache_format = "throttle:%(scope)s:%(ident)s"
+
+    def __init__(self):
+        # The scope depends on the view, so the rate is read per request.
+        self.cache = caches[settings.THROTTLE_CACHE_ALIAS]
+
+    def get_scope(self, request, view):
+        action = getattr(view, "action", None)
+        scope = getattr(view, "throttle_scopes", {}).get(action)
+        if scope is None:
+            scope = getattr(view, "throttle_scope", None)
+        if scope is None:
+            scope = "user" if request.user.is_authenticated else "anon"
+        return scope
+
+    def get_cache_key(self, request, view):
+        if request.user.is_authenticated:
+            ident = request.user.pk
+        else:
+            ident = self.get_ident(request)
+        return self.cache_format % {"scope": self.scope, "ident": ident}
+
+    def allow_request(self, request, view):
+        self.scope = self.get_scope(request, view)
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        if self.rate is None:
+            return True
+
+        self.now = self.timer()
+        window = int(self.now // self.duration)
+        self.key = f"{self.get_cache_key(request, view)}:{window}"
+        self.window_end = (window + 1) * self.duration
+        return self.hit(self.key) <= self.num_requests
+
+    def hit(self, key):
+        # add() leaves an existing counter alone, so concurrent first
+        # requests cannot reset each other's counts.
+        self.cache.add(key, 0, timeout=self.duration)
+        try:
+            return self.cache.incr(key)
+        except ValueError:
+            # Expired between add() and incr(): this is the first hit.
+            self.cache.set(key, 1, timeout=self.duration)
+            return 1
+
+    def wait(self):
+        return max(self.window_end - self.now, 0)
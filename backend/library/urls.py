@@ -22,8 +22,11 @@ from drf_spectacular.views import (
     SpectacularRedocView,
 )
 
+from library.metrics import metrics_view
+
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path("metrics", metrics_view, name="metrics"),
     path("api/books/", include("catalog.urls", namespace="catalog")),
     path("api/borrowings/", include("borrowing.urls", namespace="borrowing")),
     path("api/users/", include("user.urls", namespace="user")),
@@ -1,7 +1,87 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt import models as jwt_models
 from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from . import claims
+
+
+class TokenUser(jwt_models.TokenUser):
+    """Request user built from access token claims instead of a User row."""
+
+    def __init__(self, token, user_claims):
+        super().__init__(token)
+        self.is_active = user_claims["is_active"]
+        self.is_staff = user_claims["is_staff"]
+        self.is_superuser = user_claims["is_superuser"]
+
+    @cached_property
+    def id(self):
+        return int(self.token[api_settings.USER_ID_CLAIM])
 
 
 class CustomHeaderJWTAuthentication(JWTAuthentication):
     def get_header(self, request):
         header = request.META.get('HTTP_AUTHORIZE')
         return header.encode() if header else None
+
+    def get_user(self, validated_token):
+        user_id = self.stateless_user_id(validated_token)
+        if user_id is None:
+            return super().get_user(validated_token)
+        return self.token_user(validated_token, claims.current(user_id))
+
+    async def aauthenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        user_id = self.stateless_user_id(validated_token)
+        if user_id is None:
+            return await sync_to_async(super().get_user)(validated_token)
+        published = await claims.acurrent(user_id)
+        return self.token_user(validated_token, published)
+
+    def stateless_user_id(self, validated_token):
+        """The token's user id, or None when the User row must be loaded."""
+        # Tokens issued before claims were embedded still need the row.
+        if not settings.JWT_STATELESS or any(
+            claim not in validated_token for claim in claims.CLAIMS
+        ):
+            return None
+        try:
+            return int(validated_token[api_settings.USER_ID_CLAIM])
+        except (KeyError, TypeError, ValueError):
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            )
+
+    def token_user(self, validated_token, published):
+        user_claims = published or {
+            claim: validated_token[claim] for claim in claims.CLAIMS
+        }
+        if not user_claims["is_active"]:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return TokenUser(validated_token, user_claims)
+
+
+def database_user(user):
+    """The User row behind ``request.user``, loaded for token users."""
+    if not isinstance(user, TokenUser):
+        return user
+    try:
+        return get_user_model().objects.get(pk=user.pk)
+    except get_user_model().DoesNotExist:
+        raise AuthenticationFailed(_("User not found"), code="user_not_found")
@@ -0,0 +1,51 @@
+"""
+User claims carried in JWTs, and the cache that overrides them.
+
+Access tokens embed ``is_active``, ``is_staff`` and ``is_superuser`` so
+stateless authentication can check permissions without loading the user.
+When those fields change, the new values are published to a shared cache
+for as long as an access token issued before the change can still be
+valid; authentication prefers the cached values over the token's own.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework_simplejwt.settings import api_settings
+
+CLAIMS = ("is_active", "is_staff", "is_superuser")
+KEY = "user:claims:{}"
+
+
+def get_cache():
+    return caches[settings.AUTH_CACHE_ALIAS]
+
+
+def user_claims(user):
+    return {claim: getattr(user, claim) for claim in CLAIMS}
+
+
+def add_claims(token, user):
+    for claim, value in user_claims(user).items():
+        token[claim] = value
+    return token
+
+
+def publish(user_id, claims):
+    """Override the claims of every live token issued to ``user_id``."""
+    leeway = api_settings.LEEWAY
+    if not isinstance(leeway, timedelta):
+        leeway = timedelta(seconds=leeway)
+    lifetime = api_settings.ACCESS_TOKEN_LIFETIME + leeway
+    get_cache().set(
+        KEY.format(user_id), claims, timeout=int(lifetime.total_seconds()) + 1
+    )
+
+
+def current(user_id):
+    """Published claims for ``user_id``, or None when nothing changed."""
+    return get_cache().get(KEY.format(user_id))
+
+
+async def acurrent(user_id):
+    return await get_cache().aget(KEY.format(user_id))
@@ -0,0 +1,125 @@
+"""
+Password hashers with settings-driven cost, run in a process pool.
+
+Each hasher keeps Django's algorithm name, so stored hashes stay valid,
+and reads its cost from settings (PASSWORD_PBKDF2_ITERATIONS,
+PASSWORD_ARGON2_*, PASSWORD_BCRYPT_ROUNDS). A stored hash made with
+another algorithm or cost fails ``must_update`` and is rehashed the next
+time its user logs in.
+
+With PASSWORD_HASHING_WORKERS > 0, encode and verify run in a process
+pool of that size instead of the request's thread, so hashing uses other
+cores and no longer holds the GIL, or the thread Django runs sync views
+in under ASGI. At most that many hashes are in flight per process;
+further callers wait for a slot.
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+COST_SETTINGS = {
+    "PASSWORD_PBKDF2_ITERATIONS",
+    "PASSWORD_ARGON2_TIME_COST",
+    "PASSWORD_ARGON2_MEMORY_COST",
+    "PASSWORD_ARGON2_PARALLELISM",
+    "PASSWORD_BCRYPT_ROUNDS",
+}
+
+_lock = threading.Lock()
+_pool = None
+_in_pool = False
+
+
+class OffloadedHasherMixin:
+    """Runs ``encode`` and ``verify`` through :func:`offload`."""
+
+    def encode(self, password, salt, *args):
+        return offload(self, "encode", password, salt, *args)
+
+    def verify(self, password, encoded):
+        return offload(self, "verify", password, encoded)
+
+
+class PBKDF2PasswordHasher(OffloadedHasherMixin, hashers.PBKDF2PasswordHasher):
+    def __init__(self):
+        self.iterations = settings.PASSWORD_PBKDF2_ITERATIONS
+
+
+class Argon2PasswordHasher(OffloadedHasherMixin, hashers.Argon2PasswordHasher):
+    def __init__(self):
+        self.time_cost = settings.PASSWORD_ARGON2_TIME_COST
+        self.memory_cost = settings.PASSWORD_ARGON2_MEMORY_COST
+        self.parallelism = settings.PASSWORD_ARGON2_PARALLELISM
+
+
+class BCryptSHA256PasswordHasher(
+    OffloadedHasherMixin, hashers.BCryptSHA256PasswordHasher
+):
+    def __init__(self):
+        self.rounds = settings.PASSWORD_BCRYPT_ROUNDS
+
+
+def offload(hasher, method, *args):
+    """Call Django's ``method`` of ``hasher``, in the pool when enabled."""
+    pool = get_pool()
+    if pool is None:
+        return _call(hasher, method, args)
+    executor, slots = pool
+    with slots:
+        return executor.submit(_call, hasher, method, args).result()
+
+
+def _call(hasher, method, args):
+    # Module level so the pool can pickle it; the hasher travels with its
+    # cost attributes, so the pool processes never read settings.
+    return getattr(super(OffloadedHasherMixin, hasher), method)(*args)
+
+
+def _init_pool_process():
+    global _in_pool
+    # PBKDF2 verify calls encode; it must not queue behind itself.
+    _in_pool = True
+
+
+def get_pool():
+    """``(executor, slots)`` for this process, or None to hash inline."""
+    global _pool
+    # Checked first: pool processes hash inline and never read settings.
+    if _in_pool:
+        return None
+    workers = settings.PASSWORD_HASHING_WORKERS
+    if workers <= 0:
+        return None
+    with _lock:
+        # A forked server worker must not share its parent's pool.
+        if _pool is None or _pool[0] != os.getpid():
+            executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_pool_process,
+            )
+            _pool = (os.getpid(), executor, threading.BoundedSemaphore(workers))
+        return _pool[1:]
+
+
+def shutdown_pool():
+    global _pool
+    with _lock:
+        pool, _pool = _pool, None
+    if pool is not None and pool[0] == os.getpid():
+        pool[1].shutdown()
+
+
+@receiver(setting_changed)
+def reset_hashers(*, setting, **kwargs):
+    if setting in COST_SETTINGS:
+        hashers.get_hashers.cache_clear()
+        hashers.get_hashers_by_algorithm.cache_clear()
+    elif setting == "PASSWORD_HASHING_WORKERS":
+        shutdown_pool()
@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from user.revocation import prune
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete revoked refresh tokens that have expired; they are rejected "
+        "as expired anyway. Safe to run on a schedule."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=settings.REVOKED_TOKEN_PRUNE_CHUNK_SIZE,
+        )
+
+    def handle(self, *args, chunk_size, **options):
+        if chunk_size <= 0:
+            raise CommandError("--chunk-size must be positive.")
+        deleted = prune(chunk_size=chunk_size)
+        self.stdout.write(self.style.SUCCESS(
+            f"Deleted {deleted} expired revoked refresh tokens."
+        ))
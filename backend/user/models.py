@@ -5,6 +5,8 @@ from django.contrib.auth.models import (
     UserManager as DjangoUserManager,
 )
 
+from . import claims
+
 
 class UserManager(DjangoUserManager):
     """Define a model manager for User model with no username field."""
@@ -44,8 +46,28 @@ class User(AbstractUser):
 
     username = None
     email = models.EmailField(_("email address"), unique=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = []
 
     objects = UserManager()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        user = super().from_db(db, field_names, values)
+        # Kept so a save can tell whether claims in issued tokens went stale.
+        user._loaded_claims = {
+            claim: user.__dict__.get(claim) for claim in claims.CLAIMS
+        }
+        return user
+
+
+class RevokedRefreshToken(models.Model):
+    """A refresh token that can no longer be used, keyed by its jti's SHA-256."""
+
+    jti_hash = models.CharField(max_length=64, primary_key=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return self.jti_hash
@@ -0,0 +1,90 @@
+"""
+Revoked refresh tokens.
+
+A refresh token is revoked by inserting the SHA-256 of its jti, with the
+token's expiry, into RevokedRefreshToken. The jti is the primary key, so a
+concurrent second use of a rotated token loses the insert, and a lookup
+costs one index probe however long the history grows; prune_revoked_tokens
+deletes rows whose token has expired anyway.
+
+Answers are written through to AUTH_CACHE_ALIAS: revoked jtis until their
+token expires, unknown ones for REFRESH_TOKEN_NEGATIVE_CACHE_TIMEOUT
+seconds, so repeated refreshes of a live token skip the table. A token
+revoked through another worker is seen at once when that cache is shared
+(REDIS_URL) and after the negative timeout otherwise.
+"""
+import hashlib
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from rest_framework_simplejwt.settings import api_settings
+
+from . import claims
+from .models import RevokedRefreshToken
+
+KEY = "user:revoked:{}"
+
+
+def digest(token):
+    jti = str(token[api_settings.JTI_CLAIM])
+    return hashlib.sha256(jti.encode()).hexdigest()
+
+
+def expires_at(token):
+    return datetime.fromtimestamp(token["exp"], tz=timezone.utc)
+
+
+def _ttl(token):
+    seconds = (expires_at(token) - datetime.now(tz=timezone.utc)).total_seconds()
+    return max(int(seconds) + 1, 1)
+
+
+def revoke(token):
+    """Revoke ``token``; False when it had already been revoked."""
+    jti_hash = digest(token)
+    try:
+        with transaction.atomic():
+            RevokedRefreshToken.objects.create(
+                jti_hash=jti_hash, expires_at=expires_at(token)
+            )
+    except IntegrityError:
+        revoked = False
+    else:
+        revoked = True
+    claims.get_cache().set(KEY.format(jti_hash), True, timeout=_ttl(token))
+    return revoked
+
+
+def is_revoked(token, database=True):
+    """
+    Whether ``token`` was revoked. With ``database=False`` only the cache
+    is asked, for callers about to settle it with :func:`revoke`.
+    """
+    jti_hash = digest(token)
+    cache = claims.get_cache()
+    revoked = cache.get(KEY.format(jti_hash))
+    if revoked is None and not database:
+        return False
+    if revoked is None:
+        revoked = RevokedRefreshToken.objects.filter(jti_hash=jti_hash).exists()
+        timeout = (
+            _ttl(token) if revoked
+            else settings.REFRESH_TOKEN_NEGATIVE_CACHE_TIMEOUT
+        )
+        cache.set(KEY.format(jti_hash), revoked, timeout=timeout)
+    return revoked
+
+
+def prune(now=None, chunk_size=1000):
+    """Delete revocations of expired tokens; returns the number deleted."""
+    now = now or datetime.now(tz=timezone.utc)
+    deleted = 0
+    while True:
+        chunk = RevokedRefreshToken.objects.filter(
+            expires_at__lt=now
+        ).values_list("pk", flat=True)[:chunk_size]
+        count, _ = RevokedRefreshToken.objects.filter(pk__in=list(chunk)).delete()
+        deleted += count
+        if count < chunk_size:
+            return deleted
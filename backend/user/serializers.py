@@ -1,7 +1,14 @@
 from django.contrib.auth import get_user_model, authenticate
 from rest_framework import serializers
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt import serializers as jwt_serializers
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken, UntypedToken
 from django.utils.translation import gettext as _
 
+from user import claims, revocation
+
 
 class UserSerializer(serializers.ModelSerializer):
 
@@ -61,3 +68,67 @@ class AuthTokenSerializer(serializers.Serializer):
 
         attrs["user"] = user
         return attrs
+
+
+class TokenObtainPairSerializer(jwt_serializers.TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user):
+        return claims.add_claims(super().get_token(user), user)
+
+
+class TokenRefreshSerializer(jwt_serializers.TokenRefreshSerializer):
+    """
+    Re-reads the user, so refreshed access tokens carry current claims.
+    With ROTATE_REFRESH_TOKENS a new refresh token is issued and, with
+    BLACKLIST_AFTER_ROTATION, the presented one is revoked; a second use
+    of a rotated token is rejected.
+    """
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+        rotate = (
+            api_settings.ROTATE_REFRESH_TOKENS
+            and api_settings.BLACKLIST_AFTER_ROTATION
+        )
+        # When rotating, revoke() below is the authoritative check.
+        if revocation.is_revoked(refresh, database=not rotate):
+            raise TokenError(_("Token is blacklisted"))
+
+        user = get_user_model().objects.filter(
+            **{api_settings.USER_ID_FIELD: refresh.get(api_settings.USER_ID_CLAIM)}
+        ).first()
+        if user is None or not api_settings.USER_AUTHENTICATION_RULE(user):
+            raise AuthenticationFailed(
+                self.error_messages["no_active_account"], "no_active_account"
+            )
+        data = {"access": str(claims.add_claims(refresh.access_token, user))}
+
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if rotate and not revocation.revoke(refresh):
+                raise TokenError(_("Token is blacklisted"))
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            data["refresh"] = str(refresh)
+        return data
+
+
+class TokenRevokeSerializer(jwt_serializers.TokenBlacklistSerializer):
+    """Revokes a refresh token, e.g. on logout."""
+
+    def validate(self, attrs):
+        revocation.revoke(self.token_class(attrs["refresh"]))
+        return {}
+
+
+class TokenVerifySerializer(jwt_serializers.TokenVerifySerializer):
+    """Also rejects refresh tokens that were revoked."""
+
+    def validate(self, attrs):
+        token = UntypedToken(attrs["token"])
+        if (
+            token.get(api_settings.TOKEN_TYPE_CLAIM) == RefreshToken.token_type
+            and revocation.is_revoked(token)
+        ):
+            raise serializers.ValidationError(_("Token is blacklisted"))
+        return {}
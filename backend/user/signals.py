@@ -0,0 +1,26 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import claims
+from .models import User
+
+
+@receiver(post_save, sender=User)
+def publish_changed_claims(sender, instance, created, **kwargs):
+    # QuerySet.update() bypasses this; save users one by one to revoke.
+    current = claims.user_claims(instance)
+    if not created and current != getattr(instance, "_loaded_claims", None):
+        transaction.on_commit(partial(claims.publish, instance.pk, current))
+    instance._loaded_claims = current
+
+
+@receiver(post_delete, sender=User)
+def revoke_deleted_user(sender, instance, **kwargs):
+    transaction.on_commit(partial(
+        claims.publish,
+        instance.pk,
+        {**claims.user_claims(instance), "is_active": False},
+    ))
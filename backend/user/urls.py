@@ -2,6 +2,7 @@ from django.urls import path
 
 from user.views import CreateUserView, ManageUserView
 from rest_framework_simplejwt.views import (
+    TokenBlacklistView,
     TokenObtainPairView,
     TokenRefreshView,
     TokenVerifyView,
@@ -14,5 +15,6 @@ urlpatterns = [
     path("token/", TokenObtainPairView.as_view(), name="token_obtain_pair"),
     path("token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
     path("token/verify/", TokenVerifyView.as_view(), name="token_verify"),
+    path("token/revoke/", TokenBlacklistView.as_view(), name="token_revoke"),
     path("me/", ManageUserView.as_view(), name="manage_user"),
 ]